@@ -0,0 +1,123 @@
+"""create session, session_events and session_messages tables
+
+Revision ID: 3f9c2a7d1b04
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+from core.config import get_settings
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2a7d1b04"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp";')
+
+    # 1.会话表, 会话列表按更新时间倒序查询
+    op.create_table(
+        "sessions",
+        sa.Column(
+            "id",
+            sa.String(255),
+            server_default=sa.text("uuid_generate_v4()"),
+            nullable=False,
+        ),
+        sa.Column("task_id", sa.String(255), nullable=True),
+        sa.Column("title", sa.String(255), server_default=sa.text("''")),
+        sa.Column("latest_message", sa.Text(), server_default=sa.text("''")),
+        sa.Column("status", sa.String(20), server_default=sa.text("'pending'")),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP(0)")
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP(0)")
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_sessions_id"),
+    )
+    op.create_index("ix_sessions_updated_at", "sessions", [sa.text("updated_at DESC")])
+
+    # 2.会话事件表, 开启分区时按created_at进行范围分区(按月)
+    partitioned = get_settings().postgres_partition_events
+    op.create_table(
+        "session_events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("session_id", sa.String(255), nullable=False),
+        sa.Column("event_id", sa.String(255), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("data", postgresql.JSONB(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP(0)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", "created_at", name="pk_session_events_id"),
+        postgresql_partition_by="RANGE (created_at)" if partitioned else None,
+    )
+    op.create_index(
+        "ix_session_events_session_id_id", "session_events", ["session_id", "id"]
+    )
+    if partitioned:
+        # 兜底分区, 避免未提前创建月分区时写入失败
+        op.execute(
+            "CREATE TABLE IF NOT EXISTS session_events_default "
+            "PARTITION OF session_events DEFAULT"
+        )
+
+    # 3.会话消息表
+    op.create_table(
+        "session_messages",
+        sa.Column(
+            "id",
+            sa.String(255),
+            server_default=sa.text("uuid_generate_v4()"),
+            nullable=False,
+        ),
+        sa.Column("session_id", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(20), nullable=False),
+        sa.Column("message", sa.Text(), server_default=sa.text("''")),
+        sa.Column(
+            "attachments",
+            postgresql.JSONB(),
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP(0)")
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_session_messages_id"),
+        sa.ForeignKeyConstraint(
+            ["session_id"],
+            ["sessions.id"],
+            name="fk_session_messages_session_id",
+            ondelete="CASCADE",
+        ),
+    )
+    op.create_index(
+        "ix_session_messages_session_id_created_at",
+        "session_messages",
+        ["session_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_session_messages_session_id_created_at", table_name="session_messages"
+    )
+    op.drop_table("session_messages")
+    op.drop_index("ix_session_events_session_id_id", table_name="session_events")
+    op.drop_table("session_events")
+    op.drop_index("ix_sessions_updated_at", table_name="sessions")
+    op.drop_table("sessions")
@@ -40,6 +40,13 @@ class ValidationError(AppException):
         super().__init__(status_code=422, code=422, msg=msg)
 
 
+class PreconditionFailedError(AppException):
+    """前置条件校验失败错误(例如资源版本不匹配)"""
+
+    def __init__(self, msg: str = "资源已被修改，请刷新后重试"):
+        super().__init__(status_code=412, code=412, msg=msg)
+
+
 class TooManusRequestsError(AppException):
     """请求过多错误（触发限流）"""
 
@@ -1,132 +1,192 @@
-from app.application.error.exception import NotFoundError
+import asyncio
+import logging
+from typing import Callable
+
+from app.application.error.exception import NotFoundError, PreconditionFailedError
 from app.domain.model.app_config import AgentConfig, AppConfig, LLMConfig, MCPConfig
 from app.domain.repository.app_config_repository import AppConfigRepository
-from app.domain.service.tool.mcp import MCPClientManager
+from app.domain.service.tool.mcp_pool import MCPClientPool
 from app.interface.schema.app_config import ListMCPServerItem
 
+logger = logging.getLogger(__name__)
+
 
 class AppConfigService:
     """应用配置服务"""
 
-    def __init__(self, app_config_repository: AppConfigRepository) -> None:
+    MAX_UPDATE_RETRIES = 3  # 未指定期望版本时, 版本冲突后的最大尝试次数
+
+    def __init__(
+        self,
+        app_config_repository: AppConfigRepository,
+        mcp_client_pool: MCPClientPool,
+    ) -> None:
         """构造函数: 完成应用配置服务的初始化"""
         self.app_config_repository = app_config_repository
+        self.mcp_client_pool = mcp_client_pool
+        self._update_lock = asyncio.Lock()  # 进程内的更新串行化, 版本冲突只会来自其他进程
 
     async def _load_app_config(self) -> AppConfig:
         """加载应用配置"""
-        return self.app_config_repository.load()
+        return await self.app_config_repository.load()
+
+    async def _update_app_config(
+        self,
+        update_fn: Callable[[AppConfig], None],
+        expected_version: int | None = None,
+    ) -> AppConfig:
+        """读取-修改-保存应用配置, 保存时按读取到的版本号进行CAS
+
+        调用方传递了expected_version时版本不一致直接失败,
+        未传递时说明调用方不关心中间版本, 冲突后重新读取并重试
+        """
+        async with self._update_lock:
+            return await self._update_app_config_locked(update_fn, expected_version)
+
+    async def _update_app_config_locked(
+        self,
+        update_fn: Callable[[AppConfig], None],
+        expected_version: int | None = None,
+    ) -> AppConfig:
+        """在进程内更新锁保护下执行读取-修改-保存"""
+        for attempt in range(1, self.MAX_UPDATE_RETRIES + 1):
+            # 1.加载应用配置并校验调用方期望的版本
+            app_config = await self._load_app_config()
+            if expected_version is not None and expected_version != app_config.version:
+                raise PreconditionFailedError(
+                    f"应用配置版本已变更(当前版本{app_config.version})，请刷新后重试"
+                )
+
+            # 2.修改配置并按读取到的版本号保存
+            update_fn(app_config)
+            try:
+                await self.app_config_repository.save(app_config, app_config.version)
+                return app_config
+            except PreconditionFailedError:
+                if expected_version is not None or attempt == self.MAX_UPDATE_RETRIES:
+                    raise
+
+    async def get_app_config(self) -> AppConfig:
+        """获取完整的应用配置(包含版本号)"""
+        return await self._load_app_config()
+
+    async def get_version(self) -> int:
+        """获取当前应用配置的版本号"""
+        app_config = await self._load_app_config()
+        return app_config.version
 
     async def get_llm_config(self) -> LLMConfig:
         """获取LLM提供商配置"""
         app_config = await self._load_app_config()
         return app_config.llm_config
 
-    async def update_llm_config(self, llm_config: LLMConfig) -> LLMConfig:
-        """根据传递的llm_config更新语言模型提供商配置"""
-
-        # 1.获取应用配置
-        app_config = await self._load_app_config()
-
-        # 2.判断api_key是否为空
-        if not llm_config.api_key.strip():
-            llm_config.api_key = app_config.llm_config.api_key
+    async def update_llm_config(
+        self, llm_config: LLMConfig, expected_version: int | None = None
+    ) -> AppConfig:
+        """根据传递的llm_config更新语言模型提供商配置, 返回更新后的应用配置"""
 
-        # 3.调用函数更新app_config
-        app_config.llm_config = llm_config
+        def update_fn(app_config: AppConfig) -> None:
+            # 1.api_key为空时沿用原有的api_key
+            if not llm_config.api_key.strip():
+                llm_config.api_key = app_config.llm_config.api_key
 
-        # 4.保存应用配置
-        self.app_config_repository.save(app_config)
+            # 2.更新app_config
+            app_config.llm_config = llm_config
 
-        # 5.返回更新后的LLM提供商配置
-        return app_config.llm_config
+        return await self._update_app_config(update_fn, expected_version)
 
     async def get_agent_config(self) -> AgentConfig:
         """获取Agent通用配置"""
         app_config = await self._load_app_config()
         return app_config.agent_config
 
-    async def update_agent_config(self, agent_config: AgentConfig) -> AgentConfig:
-        """根据传递的agent_config更新Agent通用配置"""
-        # 1.获取应用配置
-        app_config = await self._load_app_config()
+    async def update_agent_config(
+        self, agent_config: AgentConfig, expected_version: int | None = None
+    ) -> AppConfig:
+        """根据传递的agent_config更新Agent通用配置, 返回更新后的应用配置"""
 
-        # 2.调用函数更新app_config
-        app_config.agent_config = agent_config
-        self.app_config_repository.save(app_config)
+        def update_fn(app_config: AppConfig) -> None:
+            app_config.agent_config = agent_config
 
-        return app_config.agent_config
+        return await self._update_app_config(update_fn, expected_version)
 
     async def get_mcp_servers(self) -> list[ListMCPServerItem]:
         """获取MCP服务器列表"""
         # 1.获取当前应用配置
         app_config = await self._load_app_config()
 
-        # 2.创建mcp客户端管理器，对配置信息不进行过滤
+        # 2.并发获取每个服务的工具列表(优先使用缓存, 不从预热池租用进程)，对配置信息不进行过滤
+        servers = list(app_config.mcp_config.mcpServers.items())
+        results = await asyncio.gather(
+            *(
+                self.mcp_client_pool.list_tools(server_name, server_config)
+                for server_name, server_config in servers
+            ),
+            return_exceptions=True,
+        )
+
+        # 3.循环组装响应的工具格式, 获取失败的服务工具列表为空
         mcp_servers = []
-        mcp_client_manager = MCPClientManager(mcp_config=app_config.mcp_config)
-
-        try:
-            # 3.初始化mcp客户端管理器
-            await mcp_client_manager.initialize()
-
-            # 4.获取mcp客户端管理器的工具列表
-            tools = mcp_client_manager.tools
-
-            # 5.循环组装响应的工具格式
-            for server_name, server_config in app_config.mcp_config.mcpServers.items():
-                mcp_servers.append(
-                    ListMCPServerItem(
-                        server_name=server_name,
-                        enabled=server_config.enabled,
-                        transport=server_config.transport,
-                        tools=[tool.name for tool in tools.get(server_name, [])],
-                    )
+        for (server_name, server_config), tools in zip(servers, results):
+            if isinstance(tools, BaseException):
+                logger.error(f"获取MCP服务器[{server_name}]工具列表出错: {str(tools)}")
+                tools = []
+            mcp_servers.append(
+                ListMCPServerItem(
+                    server_name=server_name,
+                    enabled=server_config.enabled,
+                    transport=server_config.transport,
+                    tools=[tool.name for tool in tools],
                 )
-        finally:
-            # 6.清除MCP客户端管理器的相关资源
-            await mcp_client_manager.cleanup()
+            )
 
         return mcp_servers
 
-    async def update_and_create_mcp_servers(self, mcp_config: MCPConfig) -> MCPConfig:
-        """根据传递的数据新增或更新MCP配置"""
-        # 1.获取应用配置
-        app_config = await self._load_app_config()
+    async def update_and_create_mcp_servers(
+        self, mcp_config: MCPConfig, expected_version: int | None = None
+    ) -> AppConfig:
+        """根据传递的数据新增或更新MCP配置, 返回更新后的应用配置"""
 
-        # 2.使用新的mcp_config更新原始的配置
-        app_config.mcp_config.mcpServers.update(mcp_config.mcpServers)
+        def update_fn(app_config: AppConfig) -> None:
+            # 使用新的mcp_config更新原始的配置
+            app_config.mcp_config.mcpServers.update(mcp_config.mcpServers)
 
-        # 3.调用数据仓库完成存储or更新
-        self.app_config_repository.save(app_config)
-        return app_config.mcp_config
+        # 配置更新后为新的stdio服务在后台启动预热进程, 旧配置的预热进程不再常驻
+        app_config = await self._update_app_config(update_fn, expected_version)
+        self.mcp_client_pool.prewarm(app_config.mcp_config)
+        return app_config
 
-    async def delete_mcp_server(self, server_name: str) -> MCPConfig:
-        """根据名字删除MCP服务"""
-        # 1.获取应用配置
-        app_config = await self._load_app_config()
+    async def delete_mcp_server(
+        self, server_name: str, expected_version: int | None = None
+    ) -> AppConfig:
+        """根据名字删除MCP服务, 返回更新后的应用配置"""
 
-        # 2.查询对应服务的名字是否存在
-        if server_name not in app_config.mcp_config.mcpServers:
-            raise NotFoundError(f"该MCP服务[{server_name}]不存在，请核实后重试")
+        def update_fn(app_config: AppConfig) -> None:
+            # 1.查询对应服务的名字是否存在
+            if server_name not in app_config.mcp_config.mcpServers:
+                raise NotFoundError(f"该MCP服务[{server_name}]不存在，请核实后重试")
 
-        # 3.如果存在则删除字典中对应的服务
-        del app_config.mcp_config.mcpServers[server_name]
-        self.app_config_repository.save(app_config)
-        return app_config.mcp_config
+            # 2.如果存在则删除字典中对应的服务
+            del app_config.mcp_config.mcpServers[server_name]
+
+        # 被删除服务的预热进程不再常驻
+        app_config = await self._update_app_config(update_fn, expected_version)
+        self.mcp_client_pool.prewarm(app_config.mcp_config)
+        return app_config
 
     async def set_mcp_server_enabled(
-        self, server_name: str, enabled: bool
-    ) -> MCPConfig:
-        """更新MCP服务的启用状态"""
+        self, server_name: str, enabled: bool, expected_version: int | None = None
+    ) -> AppConfig:
+        """更新MCP服务的启用状态, 返回更新后的应用配置"""
 
-        # 1.获取应用配置
-        app_config = await self._load_app_config()
+        def update_fn(app_config: AppConfig) -> None:
+            # 1.查询对应服务的名字是否存在
+            if server_name not in app_config.mcp_config.mcpServers:
+                raise NotFoundError(f"该MCP服务[{server_name}]不存在，请核实后重试")
 
-        # 2.查询对应服务的名字是否存在
-        if server_name not in app_config.mcp_config.mcpServers:
-            raise NotFoundError(f"该MCP服务[{server_name}]不存在，请核实后重试")
+            # 2.如果存在则更新该MCP服务的启用状态
+            app_config.mcp_config.mcpServers[server_name].enabled = enabled
 
-        # 3.如果存在则更新该MCP服务的启用状态
-        app_config.mcp_config.mcpServers[server_name].enabled = enabled
-        self.app_config_repository.save(app_config)
-        return app_config.mcp_config
+        app_config = await self._update_app_config(update_fn, expected_version)
+        self.mcp_client_pool.prewarm(app_config.mcp_config)
+        return app_config
@@ -1,38 +1,145 @@
 import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
 from typing import List
 
 from app.domain.external.health_checker import HealthChecker
 from app.domain.model.health_status import HealthStatus
 
+logger = logging.getLogger(__name__)
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """计算已排序数据的分位数(最近秩法)"""
+    index = max(int(round(percent / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
 
 class StatusService:
-    """状态服务: 用于检查系统的服务状态"""
+    """状态服务: 后台定时检查系统依赖的服务状态, 接口直接返回缓存的检查结果"""
 
-    def __init__(self, checkers: List[HealthChecker]) -> None:
-        """构造函数: 传递所有检查器完成服务初始化"""
+    def __init__(
+        self,
+        checkers: List[HealthChecker],
+        interval: float = 10,
+        timeout: float = 3,
+        latency_window: int = 120,
+        stale_seconds: float = 30,
+    ) -> None:
+        """构造函数: 传递所有检查器及检查间隔、超时时间、耗时窗口、过期时间完成服务初始化"""
         self._checkers = checkers
+        self._interval = interval
+        self._timeout = timeout
+        self._stale_seconds = stale_seconds
+        self._latencies: dict[str, deque[float]] = {
+            checker.name: deque(maxlen=latency_window) for checker in checkers
+        }
+        self._snapshots: dict[str, HealthStatus] = {}
+        self._task: asyncio.Task | None = None
 
-    async def check_all(self) -> List[HealthStatus]:
-        """调用所有检查器, 并返回对应的健康状态"""
-        # 1.并行调用所有服务进行检查
+    async def start(self) -> None:
+        """先同步检查一次生成快照, 再启动后台定时检查任务"""
+        if self._task is not None:
+            logger.warning("健康检查后台任务已启动 无需重复操作")
+            return
+        await self.probe()
+        self._task = asyncio.create_task(self._run(), name="status-prober")
+        logger.info("健康检查后台任务启动成功")
+
+    async def shutdown(self) -> None:
+        """停止后台定时检查任务"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("健康检查后台任务成功关闭")
+
+    async def _run(self) -> None:
+        """后台循环: 按固定间隔检查所有服务"""
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error(f"健康检查后台任务执行出错: {str(e)}")
+
+    async def _check(self, checker: HealthChecker) -> HealthStatus:
+        """带超时地执行单个检查器, 并记录检查耗时、最近错误信息"""
+        # 1.执行检查, 超时或检查器本身抛出异常都格式化为HealthStatus
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(checker.check(), self._timeout)
+        except asyncio.TimeoutError:
+            status = HealthStatus(
+                service=checker.name,
+                status="error",
+                details=f"健康检查超时({self._timeout}s)",
+            )
+        except Exception as e:
+            status = HealthStatus(
+                service=checker.name,
+                status="error",
+                details=f"检查器发生错误: {str(e)}",
+            )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        # 2.记录耗时并计算滚动窗口内的分位数
+        latencies = self._latencies[checker.name]
+        latencies.append(elapsed_ms)
+        sorted_latencies = sorted(latencies)
+        status.latency = {
+            "last": round(elapsed_ms, 3),
+            "p50": round(_percentile(sorted_latencies, 50), 3),
+            "p95": round(_percentile(sorted_latencies, 95), 3),
+            "p99": round(_percentile(sorted_latencies, 99), 3),
+        }
+        status.checked_at = datetime.now()
+
+        # 3.出错时记录最近错误, 正常时沿用上一次的错误信息便于排查抖动
+        previous = self._snapshots.get(checker.name)
+        if status.status == "error":
+            status.last_error = status.details
+            status.last_error_at = status.checked_at
+        elif previous is not None:
+            status.last_error = previous.last_error
+            status.last_error_at = previous.last_error_at
+        return status
+
+    async def probe(self) -> List[HealthStatus]:
+        """并行检查所有服务并更新快照"""
         results = await asyncio.gather(
-            *(checker.check() for checker in self._checkers),
-            return_exceptions=True,  # 捕获异常 而非让gather失效
+            *(self._check(checker) for checker in self._checkers)
         )
+        for checker, status in zip(self._checkers, results):
+            self._snapshots[checker.name] = status
+        return list(results)
+
+    async def check_all(self) -> List[HealthStatus]:
+        """返回缓存的健康状态快照, 后台任务未启动时实时检查一次"""
+        if self._task is None or len(self._snapshots) < len(self._checkers):
+            return await self.probe()
+        return [self._snapshots[checker.name] for checker in self._checkers]
+
+    def is_ready(self) -> bool:
+        """所有服务的快照均存在、未过期且状态正常时视为就绪"""
+        now = datetime.now()
+        for checker in self._checkers:
+            status = self._snapshots.get(checker.name)
+            if status is None or status.status != "ok" or status.checked_at is None:
+                return False
+            if (now - status.checked_at).total_seconds() > self._stale_seconds:
+                return False
+        return True
 
-        # 2.处理可能发生的异常
-        processed_results = []
-        for res in results:
-            if isinstance(res, Exception):
-                # 3.如果服务检查本身抛出异常则格式化为HealthStatus
-                processed_results.append(
-                    HealthStatus(
-                        service="未知服务",
-                        status="error",
-                        details=f"未知检查器发生错误: {str(res)}",
-                    )
-                )
-            else:
-                processed_results.append(res)
-
-        return processed_results
+    def snapshots(self) -> List[HealthStatus]:
+        """返回当前已有的健康状态快照, 不触发检查"""
+        return [
+            self._snapshots[checker.name]
+            for checker in self._checkers
+            if checker.name in self._snapshots
+        ]
@@ -0,0 +1,97 @@
+import logging
+import re
+from typing import Any, AsyncGenerator
+
+from app.application.error.exception import NotFoundError
+from app.domain.external.message_queue import MessageQueue
+from app.domain.external.task import Task
+
+logger = logging.getLogger(__name__)
+
+# 出现这些事件时代表本轮任务输出结束, 事件流可以关闭
+TERMINAL_EVENT_TYPES = {"done", "error", "wait"}
+
+# 事件均以model_dump_json()写入, 顶层type字段位于id之后, 使用正则提取避免完整反序列化
+_EVENT_TYPE_PATTERN = re.compile(r'"type"\s*:\s*"(\w*)"')
+
+
+class TaskService:
+    """任务服务: 提供任务输出事件流的读取能力"""
+
+    def __init__(
+        self,
+        task_cls: type[Task],
+        batch_size: int = 100,
+        block_ms: int = 15000,
+    ) -> None:
+        """构造函数: 传递任务类+批量读取条数+阻塞时长完成服务初始化"""
+        self._task_cls = task_cls
+        self._batch_size = batch_size
+        self._block_ms = block_ms
+
+    @classmethod
+    def get_event_type(cls, data: Any) -> str:
+        """从输出流中的原始事件数据提取事件类型, 无法识别时返回message"""
+        if isinstance(data, str):
+            match = _EVENT_TYPE_PATTERN.search(data)
+            if match:
+                return match.group(1)
+        return "message"
+
+    async def stream_events(
+        self, task_id: str, last_event_id: str | None = None
+    ) -> AsyncGenerator[list[tuple[str, str, Any]], None]:
+        """根据任务id+最后接收的事件id返回事件批次生成器, 空批次代表当前空闲需要发送心跳"""
+        # 1.获取任务, 如果任务不在当前进程运行则直接根据id读取输出流
+        task = self._task_cls.get(task_id)
+        output_stream = (
+            task.output_stream if task else self._task_cls.get_output_stream(task_id)
+        )
+
+        # 2.任务不存在且输出流为空, 说明任务id无效
+        if task is None and await output_stream.size() == 0:
+            raise NotFoundError(f"任务[{task_id}]不存在，请核实后重试")
+
+        # 3.在开始推送前完成校验, 这样接口可以正常返回404
+        return self._iter_events(task_id, task, output_stream, last_event_id or "0")
+
+    async def _iter_events(
+        self,
+        task_id: str,
+        task: Task | None,
+        output_stream: MessageQueue,
+        start_id: str,
+    ) -> AsyncGenerator[list[tuple[str, str, Any]], None]:
+        """订阅输出流并循环批量读取, 按批次返回(事件id, 事件类型, 原始数据)"""
+        async with output_stream.subscribe(start_id) as subscription:
+            while True:
+                # 1.阻塞批量读取, 有数据时立即返回, 无数据时在block_ms后返回空列表
+                messages = await subscription.get(
+                    count=self._batch_size, block_ms=self._block_ms
+                )
+
+                # 2.空闲时返回空批次, 如果本进程中的任务已经结束则关闭事件流
+                if not messages:
+                    if task is not None and task.done:
+                        return
+                    yield []
+                    continue
+
+                # 3.提取事件类型并检查是否遇到结束事件
+                batch = []
+                finished = False
+                for message_id, data in messages:
+                    event_type = self.get_event_type(data)
+                    batch.append((message_id, event_type, data))
+                    if event_type in TERMINAL_EVENT_TYPES:
+                        finished = True
+                        break
+
+                # 4.返回批次, 遇到结束事件后关闭事件流
+                yield batch
+
+                if finished:
+                    logger.info(
+                        f"任务[{task_id}]输出流推送结束, 最后事件id: {batch[-1][0]}"
+                    )
+                    return
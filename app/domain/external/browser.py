@@ -6,11 +6,15 @@ from app.domain.model.tool_result import ToolResult
 class Browser(Protocol):
     """浏览器服务扩展"""
 
-    async def view_page(self) -> ToolResult:
-        """浏览获取当前浏览器的页面内容"""
+    async def view_page(self, full_elements: bool | None = None) -> ToolResult:
+        """浏览获取当前浏览器的页面内容, full_elements=True时返回完整的可交互元素列表而不是差异"""
         ...
 
-    async def navigate(self, url: str) -> ToolResult:
+    async def navigate(
+        self,
+        url: str,
+        resource_profile: str | None = None,  # 本次导航的资源拦截配置(full/no_media/text_only)
+    ) -> ToolResult:
         """传递对应的url使用浏览器导航到该页面"""
         ...
 
@@ -66,10 +70,18 @@ class Browser(Protocol):
         """对当前浏览器的页面进行截图, 传递full_page=True则意味着整页截图"""
         ...
 
+    async def screenshot_url(self, full_page: bool | None = None) -> str:
+        """对当前浏览器的页面进行截图并上传, 返回截图地址, 用于工具事件中的浏览器快照"""
+        ...
+
     async def console_exec(self, javascript: str) -> ToolResult:
         """传递对应的js脚本在浏览器的控制台执行"""
         ...
 
-    async def console_view(self, max_lines: int | None = None) -> ToolResult:
+    async def console_view(
+        self,
+        max_lines: int | None = None,
+        level: str | None = None,  # 最低日志级别(debug/info/warning/error), 不传递则返回所有级别
+    ) -> ToolResult:
         """传递最大输出行数, 获取控制台的输出结果, 如果不传递则获取所有结果"""
         ...
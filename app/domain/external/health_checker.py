@@ -6,6 +6,8 @@ from app.domain.model.health_status import HealthStatus
 class HealthChecker(Protocol):
     """服务健康检查协议"""
 
+    name: str  # 被检查的服务名字
+
     async def check(self) -> HealthStatus:
         """用于检查对应的服务是否健康"""
         ...
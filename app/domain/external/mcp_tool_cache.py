@@ -0,0 +1,19 @@
+from typing import Protocol
+
+from mcp import Tool
+
+
+class MCPToolCache(Protocol):
+    """MCP工具列表缓存协议: 以MCP服务配置哈希为键持久化工具参数声明"""
+
+    async def get(self, key: str) -> list[Tool] | None:
+        """获取缓存的工具列表, 不存在或已过期时返回None"""
+        ...
+
+    async def set(self, key: str, tools: list[Tool]) -> None:
+        """缓存工具列表"""
+        ...
+
+    async def delete(self, key: str) -> None:
+        """删除缓存的工具列表"""
+        ...
@@ -1,6 +1,20 @@
 from typing import Any, Protocol
 
 
+class MessageSubscription(Protocol):
+    """消息订阅协议: 从指定位置开始持续接收消息队列中的新消息, 需要配合async with使用"""
+
+    async def get(
+        self, count: int = 100, block_ms: int | None = None
+    ) -> list[tuple[str, Any]]:
+        """获取最多count条新消息, 无消息时阻塞block_ms毫秒, 超时返回空列表"""
+        ...
+
+    async def __aenter__(self) -> "MessageSubscription": ...
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None: ...
+
+
 class MessageQueue(Protocol):
     """消息队列协议:"""
 
@@ -14,6 +28,16 @@ class MessageQueue(Protocol):
         """根据传递的开始id+阻塞时间, 获取1条数据"""
         ...
 
+    async def get_batch(
+        self, start_id: str | None = None, count: int = 100, block_ms: int | None = None
+    ) -> list[tuple[str, Any]]:
+        """根据传递的开始id(不包含)+条数+阻塞时间, 批量获取数据, 超时无数据时返回空列表"""
+        ...
+
+    def subscribe(self, start_id: str | None = None) -> MessageSubscription:
+        """订阅消息队列中start_id(不包含)之后的消息"""
+        ...
+
     async def pop(self) -> tuple[str, Any]:
         """获取并移除消息队列中的第一条消息"""
         ...
@@ -0,0 +1,9 @@
+from typing import Protocol
+
+
+class ScreenshotStore(Protocol):
+    """截图存储协议: 保存浏览器截图并返回可访问的地址, 事件中只携带地址而不是图片内容"""
+
+    async def put(self, key: str, data: bytes, content_type: str) -> str:
+        """根据对象键保存截图, 返回截图的访问地址"""
+        ...
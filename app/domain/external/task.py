@@ -55,10 +55,15 @@ class Task(Protocol):
         ...
 
     @classmethod
-    def get(cls, task_id: str) -> ["Task"] | None:
+    def get(cls, task_id: str) -> "Task | None":
         """类方法: 根据任务id获取对应任务"""
         ...
 
+    @classmethod
+    def get_output_stream(cls, task_id: str) -> MessageQueue:
+        """类方法: 根据任务id获取输出流, 任务不在当前进程中运行时也可以读取"""
+        ...
+
     @classmethod
     def create(cls, task_runner: TaskRunner) -> "Task":
         """类方法: 根据传递的任务运行器创建任务"""
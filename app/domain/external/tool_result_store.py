@@ -0,0 +1,13 @@
+from typing import Protocol
+
+
+class ToolResultStore(Protocol):
+    """工具结果存储协议: 保存超出阈值的大体积工具结果, 供Agent通过引用句柄分页读取"""
+
+    async def put(self, handle: str, content: str) -> None:
+        """根据句柄保存完整的工具结果"""
+        ...
+
+    async def get(self, handle: str) -> str | None:
+        """根据句柄获取完整的工具结果, 不存在时返回None"""
+        ...
@@ -78,6 +78,7 @@ class AppConfig(BaseModel):
     llm_config: LLMConfig
     agent_config: AgentConfig
     mcp_config: MCPConfig  # MCP服务配置
+    version: int = 0  # 配置版本号, 每次保存单调递增, 用于乐观并发控制与ETag
 
     # 允许传递额外的字段初始化
     model_config = ConfigDict(extra="allow")
@@ -69,7 +69,7 @@ class MessageEvent(BaseEvent):
 class BrowserToolContent(BaseModel):
     """浏览器工具扩展内容"""
 
-    screenshot: str  # 浏览器快照截图
+    screenshot: str  # 浏览器快照截图地址, 事件中不携带图片内容
 
 
 class MCPToolContent(BaseModel):
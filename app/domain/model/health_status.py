@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 
@@ -9,3 +12,15 @@ class HealthStatus(BaseModel):
         default="", description="健康检查状态: 支持ok表示正常, error表示出错"
     )
     details: str = Field(default="", description="出错时的详情提示")
+    metrics: dict[str, Any] = Field(
+        default_factory=dict, description="服务的运行指标, 例如连接池使用情况"
+    )
+    latency: dict[str, float] = Field(
+        default_factory=dict,
+        description="检查耗时(毫秒): 最近一次及滚动窗口内的p50/p95/p99",
+    )
+    checked_at: datetime | None = Field(default=None, description="最近一次检查时间")
+    last_error: str = Field(default="", description="最近一次检查失败的错误信息")
+    last_error_at: datetime | None = Field(
+        default=None, description="最近一次检查失败的时间"
+    )
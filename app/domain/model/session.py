@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+
+class SessionStatus(str, Enum):
+    """会话状态: 等待中/运行中/等待用户输入/已完成"""
+
+    PENDING = "pending"  # 等待中
+    RUNNING = "running"  # 运行中
+    WAITING = "waiting"  # 等待用户输入
+    COMPLETED = "completed"  # 已完成
+
+
+class Session(BaseModel):
+    """会话Domain模型: 记录一次用户与Agent的完整交互"""
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))  # 会话id
+    task_id: str | None = None  # 会话当前关联的任务id
+    title: str = ""  # 会话标题
+    latest_message: str = ""  # 最后一条消息
+    status: SessionStatus = SessionStatus.PENDING  # 会话状态
+    created_at: datetime = Field(default_factory=datetime.now)  # 创建时间
+    updated_at: datetime = Field(default_factory=datetime.now)  # 更新时间
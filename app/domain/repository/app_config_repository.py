@@ -6,10 +6,12 @@ from app.domain.model.app_config import AppConfig
 class AppConfigRepository(Protocol):
     """应用配置仓库"""
 
-    def load(self) -> AppConfig | None:
+    async def load(self) -> AppConfig | None:
         """加载应用配置"""
         ...
 
-    def save(self, app_config: AppConfig) -> None:
-        """保存应用配置"""
+    async def save(
+        self, app_config: AppConfig, expected_version: int | None = None
+    ) -> int:
+        """保存应用配置并返回新的版本号, 传递expected_version时若当前版本不一致则保存失败"""
         ...
@@ -0,0 +1,47 @@
+from typing import Protocol
+
+from app.domain.model.event import Event
+from app.domain.model.message import Message
+from app.domain.model.session import Session
+
+
+class SessionRepository(Protocol):
+    """会话仓库: 负责会话、会话事件、会话消息的持久化"""
+
+    async def save(self, session: Session) -> None:
+        """新增或更新会话"""
+        ...
+
+    async def get_by_id(self, session_id: str) -> Session | None:
+        """根据id获取会话, 不存在时返回None"""
+        ...
+
+    async def get_all(self, limit: int = 50, offset: int = 0) -> list[Session]:
+        """按更新时间倒序分页获取会话列表"""
+        ...
+
+    async def delete_by_id(self, session_id: str) -> None:
+        """根据id删除会话及其事件、消息"""
+        ...
+
+    async def add_event(self, session_id: str, event: Event) -> None:
+        """往会话中追加一条事件, 允许异步批量写入"""
+        ...
+
+    async def get_events(
+        self, session_id: str, after_id: int = 0, limit: int = 100
+    ) -> list[tuple[int, Event]]:
+        """获取会话中序号大于after_id的事件, 返回(事件序号, 事件)列表"""
+        ...
+
+    async def add_message(
+        self, session_id: str, message: Message, role: str = "user"
+    ) -> None:
+        """往会话中追加一条消息"""
+        ...
+
+    async def get_messages(
+        self, session_id: str, limit: int = 100
+    ) -> list[tuple[str, Message]]:
+        """按时间顺序获取会话消息, 返回(角色, 消息)列表"""
+        ...
@@ -18,6 +18,7 @@ from app.domain.model.memory import Memory
 from app.domain.model.message import Message
 from app.domain.model.tool_result import ToolResult
 from app.domain.service.tool.base import BaseTool
+from app.domain.service.tool.spool import SpoolTool, ToolResultSpooler
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +39,19 @@ class BaseAgent(ABC):
         memory: Memory,  # 记忆
         json_parser: JSONParser,  # JSON输出解析器
         tools: list[BaseTool],  # 工具列表
+        tool_result_spooler: ToolResultSpooler | None = None,  # 大体积工具结果转存器
     ) -> None:
-        """构造函数: 完成Agent的初始化"""
+        """构造函数: 完成Agent的初始化, 传递转存器时自动挂载分页读取转存结果的工具"""
         self._agent_config = agent_config
         self._llm = llm
         self._memory = memory
         self._json_parser = json_parser
         self._tools = tools
+        self._tool_result_spooler = tool_result_spooler
+        if tool_result_spooler is not None and not any(
+            isinstance(tool, SpoolTool) for tool in tools
+        ):
+            self._tools = [*tools, SpoolTool(tool_result_spooler)]
 
     @property
     def memory(self) -> Memory:
@@ -208,7 +215,11 @@ class BaseAgent(ABC):
                 # 9.调用工具并获取结果
                 result = await self._invoke_tool(tool, function_name, function_args)
 
-                # 10.返回工具调用结果，其中tool_content比较特殊，需要在业务中进行实现
+                # 10.大体积结果转存, 事件与记忆中只保留预览+引用句柄
+                if self._tool_result_spooler is not None:
+                    result = await self._tool_result_spooler.spool(function_name, result)
+
+                # 11.返回工具调用结果，其中tool_content比较特殊，需要在业务中进行实现
                 yield ToolEvent(
                     tool_call_id=tool_call_id,
                     tool_name=tool.name,
@@ -218,7 +229,7 @@ class BaseAgent(ABC):
                     status=ToolEventStatus.CALLED,
                 )
 
-                # 11.组装工具响应
+                # 12.组装工具响应
                 tool_messages.append(
                     {
                         "role": "tool",
@@ -228,15 +239,15 @@ class BaseAgent(ABC):
                     }
                 )
 
-            # 12.所有工具都执行完成后，调用LLM获取汇总消息二次提供
+            # 13.所有工具都执行完成后，调用LLM获取汇总消息二次提供
             message = await self._invoke_llm(tool_messages)
         else:
-            # 13.超过最大迭代次数后，则抛出错误
+            # 14.超过最大迭代次数后，则抛出错误
             yield ErrorEvent(
                 error=f"Agent迭代超过最大迭代次数: {self._agent_config.max_iterations}, 任务处理失败"
             )
 
-        # 14.在指定步骤内完成了迭代则返回消息事件
+        # 15.在指定步骤内完成了迭代则返回消息事件
         yield MessageEvent(message=message["content"])
 
     async def roll_back(self, message: Message) -> None:
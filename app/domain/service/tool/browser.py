@@ -16,12 +16,17 @@ class BrowserTool(BaseTool):
     @tool(
         name="browser_view",
         description="查看当前浏览器页面内容, 用于确认已打开页面的最新状态",
-        parameters={},
+        parameters={
+            "full_elements": {
+                "type": "boolean",
+                "description": "(可选)是否返回完整的可交互元素列表, 默认只返回相对上一次新增、变化及移除(按元素索引)的元素",
+            }
+        },
         required=[],
     )
-    async def browser_view(self) -> ToolResult:
+    async def browser_view(self, full_elements: bool | None = None) -> ToolResult:
         """获取浏览器当前网页内容并返回"""
-        return await self.browser.view_page()
+        return await self.browser.view_page(full_elements)
 
     @tool(
         name="browser_navigate",
@@ -30,13 +35,20 @@ class BrowserTool(BaseTool):
             "url": {
                 "type": "string",
                 "description": "要访问的完整URL, 必须包含协议前缀(如https://)",
-            }
+            },
+            "resource_profile": {
+                "type": "string",
+                "enum": ["full", "no_media", "text_only"],
+                "description": "(可选)资源加载模式, 只需要阅读文本时使用text_only或no_media可以更快加载, 需要截图或查看图片时使用full",
+            },
         },
         required=["url"],
     )
-    async def browser_navigate(self, url: str) -> ToolResult:
+    async def browser_navigate(
+        self, url: str, resource_profile: str | None = None
+    ) -> ToolResult:
         """传递url地址, 使用浏览器导航到对应页面"""
-        return await self.browser.navigate(url)
+        return await self.browser.navigate(url, resource_profile)
 
     @tool(
         name="browser_restart",
@@ -210,10 +222,17 @@ class BrowserTool(BaseTool):
             "max_lines": {
                 "type": "integer",
                 "description": "(可选)返回的最大日志行数",
-            }
+            },
+            "level": {
+                "type": "string",
+                "enum": ["debug", "info", "warning", "error"],
+                "description": "(可选)最低日志级别, 例如传递warning只返回警告与错误日志",
+            },
         },
         required=[],
     )
-    async def browser_console_view(self, max_lines: int | None = None) -> ToolResult:
-        """传递浏览的最大行数查看控制台的输出"""
-        return await self.browser.console_view(max_lines)
+    async def browser_console_view(
+        self, max_lines: int | None = None, level: str | None = None
+    ) -> ToolResult:
+        """传递浏览的最大行数及最低日志级别查看控制台的输出"""
+        return await self.browser.console_view(max_lines, level)
@@ -11,278 +11,275 @@
   需要根据传输协议的不同来创建客户端会话(ClientSession), 同时缓存会话;
 4.另外有可能有一些环境变量是存储在我们整个系统中的, 在初始化MCP服务的时候, 需要将传递进来的
   环境变量与系统的环境变量进行合并后传递给MCP服务;
-5.使用AsyncExitStack异步上下文管理器来管理上下文, 避免使用with多层嵌套;
+5.连接的建立与关闭交给进程级共享的MCP连接池(mcp_pool.py), 管理器只持有连接的引用,
+  不同请求、不同任务之间复用连接, 避免每次都重新启动stdio子进程、建立HTTP会话;
 6.MCPClientManager的初始化非常耗时, 所以需要有机制可以判断避免重复初始化;
 7.由于config.yaml是直接暴露在项目中的, 所以在使用config.yaml进行初始化的时候必须二次校验;
-8.同时缓存ClientSession客户端会话 和 Tool-Schema工具参数声明;
-9.MCP客户端管理器在清除/停止使用的时候, 必须关闭异步上下文管理器、清除资源(ClientSession、Tool-Schema)、
-  初始化标识等, 从而避免资源泄露;
+8.同时缓存ClientSession客户端会话 和 Tool-Schema工具参数声明, 工具声明与"带前缀工具名->(服务, 原始工具名)"
+  的索引在工具列表变化时才重建, 调用工具时直接查索引而不是遍历所有服务前缀;
+9.MCP客户端管理器在清除/停止使用的时候, 必须归还连接池中的连接、清除资源(ClientSession、Tool-Schema)、
+  初始化标识等, 从而避免资源泄露; 未传递连接池时管理器使用私有连接池, 清除时一并关闭;
 """
 
+import asyncio
 import logging
-import os
-from contextlib import AsyncExitStack
+import time
 from typing import Any
 
-from mcp import ClientSession, StdioServerParameters, Tool, stdio_client
-from mcp.client.sse import sse_client
-from mcp.client.streamable_http import streamablehttp_client
+from mcp import Tool
 
 from app.application.error.exception import NotFoundError
-from app.domain.model.app_config import MCPConfig, MCPServerConfig, MCPTransport
+from app.domain.model.app_config import MCPConfig, MCPServerConfig
 from app.domain.model.tool_result import ToolResult
 from app.domain.service.tool.base import BaseTool
+from app.domain.service.tool.mcp_pool import MCPClientPool, MCPConnection
 
 logger = logging.getLogger(__name__)
 
 
+def get_mcp_tool_name(server_name: str, tool_name: str) -> str:
+    """为MCP工具名字加上mcp_前缀+服务名字, 避免不同服务的工具重名"""
+    if server_name.startswith("mcp_"):
+        return f"{server_name}_{tool_name}"
+    return f"mcp_{server_name}_{tool_name}"
+
+
 class MCPClientManager:
     """MCP客户端管理器"""
 
-    def __init__(self, mcp_config: MCPConfig | None = None) -> None:
-        """构造函数: 完成MCP客户端管理器的初步初始化"""
+    def __init__(
+        self, mcp_config: MCPConfig | None = None, pool: MCPClientPool | None = None
+    ) -> None:
+        """构造函数: 完成MCP客户端管理器的初步初始化, 未传递连接池时使用私有连接池"""
         self._mcp_config: MCPConfig = mcp_config  # mcp配置信息
-        self._exit_stack: AsyncExitStack = AsyncExitStack()  # 异步上下文管理器
-        self._clients: dict[str, ClientSession] = {}  # 缓存的客户端会话
+        self._pool: MCPClientPool = pool or MCPClientPool()  # MCP连接池
+        self._owns_pool: bool = pool is None  # 是否为私有连接池
+        self._connections: dict[str, MCPConnection] = {}  # 从连接池获取的连接
         self._tools: dict[str, list[Tool]] = {}  # 缓存的MCP工具参数声明
+        self._tools_versions: dict[str, int | None] = {}  # 每个服务已加载的工具列表版本
+        self._llm_tools: dict[str, list[dict[str, Any]]] = {}  # 预先生成的OpenAI工具声明
+        self._tool_index: dict[str, tuple[str, str]] = {}  # 带前缀工具名->(服务名字, 原始工具名)
+        self._pending: dict[str, asyncio.Task] = {}  # 每个服务的连接任务
+        self._connect_report: dict[str, dict[str, Any]] = {}  # 每个服务的连接结果与耗时
         self._initialized: bool = False  # 是否初始化标识
 
     @property
     def tools(self) -> dict[str, list[Tool]]:
         """只读属性, 返回缓存的MCP工具参数声明, 键就是服务名字, 值就是服务对应的工具声明"""
+        self._sync_tools()
         return self._tools
 
-    async def initialize(self) -> None:
-        """手动初始化: 用于连接所有配置的MCP服务器"""
+    def _set_server_tools(
+        self, server_name: str, tools: list[Tool], version: int | None
+    ) -> None:
+        """更新单个服务的工具列表, 同时重建该服务的OpenAI工具声明与工具名索引"""
+        # 1.删除该服务旧的工具名索引
+        for tool_name in [
+            name for name, (server, _) in self._tool_index.items() if server == server_name
+        ]:
+            del self._tool_index[tool_name]
+
+        # 2.生成OpenAI工具描述并建立索引
+        llm_tools = []
+        for tool in tools:
+            tool_name = get_mcp_tool_name(server_name, tool.name)
+            llm_tools.append(
+                {
+                    "type": "function",
+                    "function": {
+                        "name": tool_name,
+                        "description": f"[{server_name}] {tool.description or tool.name}",
+                        "parameters": tool.inputSchema,
+                    },
+                }
+            )
+            self._tool_index[tool_name] = (server_name, tool.name)
+
+        self._tools[server_name] = tools
+        self._llm_tools[server_name] = llm_tools
+        self._tools_versions[server_name] = version
+
+    def _sync_tools(self) -> None:
+        """连接的工具列表被刷新(list_changed/缓存过期)后, 同步重建对应服务的工具声明"""
+        for server_name, conn in self._connections.items():
+            if self._tools_versions.get(server_name) != conn.tools_version:
+                self._set_server_tools(server_name, conn.tools, conn.tools_version)
+
+    @property
+    def connect_report(self) -> dict[str, dict[str, Any]]:
+        """只读属性, 返回每个服务的连接状态(ok/error/timeout/pending)、等待耗时及错误信息"""
+        report = {
+            server_name: {"status": "pending", "latency_ms": None, "error": ""}
+            for server_name in self._pending
+        }
+        report.update(self._connect_report)
+        return report
+
+    async def initialize(self, wait: bool = True) -> None:
+        """手动初始化: 并发连接所有配置的MCP服务器
+
+        wait为False时先读取缓存的工具声明并发起连接, 只等待缓存未命中的服务连接完成,
+        缓存命中的服务在后台连接, 调用未就绪服务的工具时会等待其连接完成
+        """
         # 1.检查下是否已经初始化成功
         if self._initialized:
             return
 
         try:
-            # 2.记录日志并连接MCP服务器
+            # 2.记录日志, 不等待连接时先并发读取缓存的工具声明, 连接完成前Agent即可拿到工具
             logger.info(
                 f"从 app_config.yaml 中加载了{len(self._mcp_config.mcpServers)}个MCP服务器",
             )
-            await self._connect_mcp_servers()
+            cache_missed: list[str] = []
+            if not wait:
+                server_names = list(self._mcp_config.mcpServers.keys())
+                hits = await asyncio.gather(
+                    *(
+                        self._load_cached_tools(server_name, server_config)
+                        for server_name, server_config in self._mcp_config.mcpServers.items()
+                    )
+                )
+                cache_missed = [name for name, hit in zip(server_names, hits) if not hit]
+
+            # 3.为每个MCP服务器发起连接任务
+            self._connect_mcp_servers()
             self._initialized = True
+
+            # 4.等待所有服务连接完成(每个服务受各自的超时时间约束), 不等待时只等待缓存未命中的服务,
+            #   保证首次调用LLM时所有服务都有工具声明
+            if wait:
+                await self.wait_all()
+            elif cache_missed:
+                await asyncio.gather(
+                    *(self._wait_server(server_name) for server_name in cache_missed)
+                )
             logger.info("MCP客户端管理器加载成功")
         except Exception as e:
-            # 3.记录错误信息并直接抛出
+            # 5.记录错误信息并直接抛出
             logger.error(f"MCP客户端管理器加载失败: {e!s}")
             raise
 
-    async def _connect_mcp_servers(self) -> None:
-        """根据配置 连接所有MCP服务"""
-        # 1.循环遍历传递进来的所有MCP服务器，不用理会enabled的状态，因为在外部会执行筛选
+    def _connect_mcp_servers(self) -> None:
+        """根据配置 为每个MCP服务创建一个连接任务, 所有服务并发连接, 互不阻塞"""
+        # 循环遍历传递进来的所有MCP服务器，不用理会enabled的状态，因为在外部会执行筛选
         for server_name, server_config in self._mcp_config.mcpServers.items():
-            try:
-                # 2.根据服务名字+服务配置连接到MCP服务器
-                await self._connect_mcp_server(server_name, server_config)
-            except Exception as e:
-                # 3.记录错误日志并跳过错误的MCP服务器
-                logger.error(f"连接MCP服务器[{server_name}]出错: {str(e)}")
-                continue
-
-    async def _connect_mcp_server(
-        self, server_name: str, server_config: MCPServerConfig
-    ) -> None:
-        """根据传递的服务名字+服务配置连接到单个MCP服务"""
-        try:
-            # 1.获取mcp服务的传输协议
-            transport = server_config.transport
-
-            # 2.根据不同的传输协议调用不同的方法连接MCP服务器
-            if transport == MCPTransport.STDIO:
-                await self._connect_stdio_server(server_name, server_config)
-            elif transport == MCPTransport.SSE:
-                await self._connect_sse_server(server_name, server_config)
-            elif transport == MCPTransport.STREAMABLE_HTTP:
-                await self._connect_streamable_http_server(server_name, server_config)
-            else:
-                raise ValueError(
-                    f"MCP服务[{server_name}]使用了不支持的传输协议: {transport}"
-                )
-        except Exception as e:
-            # 3.记录日志并抛出异常
-            logger.error(f"连接MCP服务器[{server_name}]出错: {str(e)}")
-            raise
-
-    async def _connect_stdio_server(
-        self, server_name: str, server_config: MCPServerConfig
-    ) -> None:
-        """根据服务名字+配置连接stdio服务"""
-        # 1.从配置中提取相关命令信息
-        command = server_config.command
-        args = server_config.args
-        env = server_config.env
-
-        # 2.检查command是否存在
-        if not command:
-            raise ValueError("连接stdio-mcp服务器需要配置command命令")
-
-        # 3.构建stdio连接参数
-        server_parameters = StdioServerParameters(
-            command=command,
-            args=args,
-            env={**os.environ, **env},
-        )
-
-        try:
-            # 4.使用异步上下文管理器创建传输协议
-            stdio_transport = await self._exit_stack.enter_async_context(
-                stdio_client(server_parameters),
-            )
-            read_stream, write_stream = stdio_transport
-
-            # 5.根据读取与写入流构建会话
-            session: ClientSession = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream),
+            self._pending[server_name] = asyncio.create_task(
+                self._connect_with_report(server_name, server_config),
+                name=f"mcp-connect:{server_name}",
             )
 
-            # 6.初始化MCP服务会话
-            await session.initialize()
-
-            # 7.缓存对应的mcp连接客户端
-            self._clients[server_name] = session
-
-            # 8.缓存对应mcp服务的工具列表
-            await self._cache_mcp_server_tools(server_name, session)
-            logger.info(f"连接stdio-mcp服务器成功: {server_name}")
-        except Exception as e:
-            # 记录错误日志并直接抛出异常
-            logger.error(f"连接stdio-mcp服务器失败: {str(e)}")
-            raise
-
-    async def _connect_sse_server(
+    async def _load_cached_tools(
         self, server_name: str, server_config: MCPServerConfig
-    ) -> None:
-        """根据服务名字+配置连接sse服务"""
-        # 1.提取sse服务器的连接url并判断是否存在
-        url = server_config.url
-        if not url:
-            raise ValueError("连接sse-mcp服务器需要配置url")
-
+    ) -> bool:
+        """读取服务缓存的工具列表(已有可用连接或持久化缓存), 返回是否命中, 未命中或读取失败时由调用方等待连接完成"""
         try:
-            # 2.建立sse连接
-            sse_transport = await self._exit_stack.enter_async_context(
-                sse_client(url=url, headers=server_config.headers),
-            )
-            read_stream, write_stream = sse_transport
-
-            # 3.创建客户端会话
-            session: ClientSession = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream),
-            )
-
-            # 4.初始化MCP服务会话
-            await session.initialize()
-
-            # 5.缓存对应的mcp连接客户端
-            self._clients[server_name] = session
-
-            # 6.缓存对应mcp服务的工具列表
-            await self._cache_mcp_server_tools(server_name, session)
-            logger.info(f"连接sse-mcp服务器成功: {server_name}")
+            cached_tools = await self._pool.get_cached_tools(server_config)
         except Exception as e:
-            # 7.记录错误日志并直接抛出异常
-            logger.error(f"连接sse-mcp服务器失败: {str(e)}")
-            raise
-
-    async def _connect_streamable_http_server(
+            logger.warning(f"读取MCP服务器[{server_name}]缓存的工具列表失败: {str(e)}")
+            return False
+        if cached_tools is None:
+            return False
+        self._set_server_tools(server_name, cached_tools, None)
+        return True
+
+    async def _connect_with_report(
         self, server_name: str, server_config: MCPServerConfig
     ) -> None:
-        """根据服务名字+配置连接streamable-http服务"""
-        # 1.提取streamable-http服务器的连接url并判断是否存在
-        url = server_config.url
-        if not url:
-            raise ValueError("连接sse-mcp服务器需要配置url")
-
+        """连接单个MCP服务并记录连接结果与耗时, 失败只影响当前服务"""
+        start = time.perf_counter()
         try:
-            # 2.连接streamable-http服务
-            streamable_http_transport = await self._exit_stack.enter_async_context(
-                streamablehttp_client(url=url, headers=server_config.headers),
-            )
-
-            # 3.streamable-http模型需要解包获取输入与输出流
-            # # FIXME: redundant checking, the length will always be 3
-            if len(streamable_http_transport) == 3:
-                read_stream, write_stream, _ = streamable_http_transport
-            else:
-                read_stream, write_stream = streamable_http_transport
-
-            # 4.创建客户端会话
-            session: ClientSession = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream),
-            )
-
-            # 5.初始化MCP服务会话
-            await session.initialize()
-
-            # 6.缓存对应的mcp连接客户端
-            self._clients[server_name] = session
-
-            # 7.缓存对应mcp服务的工具列表
-            await self._cache_mcp_server_tools(server_name, session)
-            logger.info(f"连接streamable-http-mcp服务器成功: {server_name}")
+            # 从连接池获取连接
+            conn = await self._connect_mcp_server(server_name, server_config)
+            self._connect_report[server_name] = {
+                "status": "ok",
+                "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+                "error": "",
+                # 连接池中该连接首次建立的耗时, 远大于latency_ms时说明复用了已有连接
+                "connect_latency_ms": conn.connect_latency_ms,
+            }
         except Exception as e:
-            # 7.记录错误日志并直接抛出异常
-            logger.error(f"连接streamable-http-mcp服务器失败: {str(e)}")
-            raise
+            # 记录错误并跳过错误的MCP服务器, 同时移除该服务缓存的工具声明
+            logger.error(f"连接MCP服务器[{server_name}]出错: {str(e)}")
+            if server_name not in self._connections:
+                self._set_server_tools(server_name, [], None)
+            self._connect_report[server_name] = {
+                "status": "timeout" if isinstance(e, asyncio.TimeoutError) else "error",
+                "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+                "error": str(e),
+            }
+        finally:
+            self._pending.pop(server_name, None)
+
+    async def wait_all(self) -> dict[str, dict[str, Any]]:
+        """等待所有服务连接完成, 返回每个服务的连接报告"""
+        if self._pending:
+            await asyncio.gather(*self._pending.values(), return_exceptions=True)
+        logger.info(f"MCP服务器连接结果: {self.connect_report}")
+        return self.connect_report
+
+    async def _wait_server(self, server_name: str) -> None:
+        """等待单个服务的连接任务完成"""
+        task = self._pending.get(server_name)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
 
-    async def _cache_mcp_server_tools(
-        self, server_name: str, session: ClientSession
-    ) -> None:
-        """根据传递的服务名字+会话缓存mcp服务工具列表"""
+    async def _connect_mcp_server(
+        self, server_name: str, server_config: MCPServerConfig
+    ) -> MCPConnection:
+        """从连接池获取单个MCP服务的连接, 并缓存连接与工具列表"""
+        conn = await self._pool.acquire(server_name, server_config)
+        self._connections[server_name] = conn
+        self._set_server_tools(server_name, conn.tools, conn.tools_version)
+        return conn
+
+    async def _get_connection(self, server_name: str) -> MCPConnection | None:
+        """获取服务对应的连接, 连接已断开时懒加载重新连接"""
+        # 1.等待该服务的连接任务完成, 未连接的服务直接返回None
+        await self._wait_server(server_name)
+        conn = self._connections.get(server_name)
+        if conn is None or conn.alive:
+            return conn
+
+        # 2.连接已断开, 归还旧连接并从连接池重新获取
+        self._pool.release(conn)
+        del self._connections[server_name]
         try:
-            tools_response = await session.list_tools()
-            tools = tools_response.tools if tools_response else []
-            self._tools[server_name] = tools
-            logger.info(f"MCP服务器[{server_name}]提供了{len(tools)}个工具")
+            return await self._connect_mcp_server(server_name, conn.server_config)
         except Exception as e:
-            # 记录日志并将缓存设置为空
-            logger.error(f"获取MCP服务器[{server_name}]工具列表失败: {str(e)}")
-            self._tools[server_name] = []
+            logger.error(f"重新连接MCP服务器[{server_name}]失败: {str(e)}")
+            return None
 
     async def invoke(self, tool_name: str, arguments: dict[str, Any]) -> ToolResult:
         """根据传递的工具名字+参数调用MCP工具"""
         try:
-            # 1.定义变量存储原始的服务名字+工具
-            original_server_name = None
-            original_tool_name = None
-
-            # 2.循环遍历当前的所有mcp服务配置
-            for server_name in self._mcp_config.mcpServers.keys():
-                # 3.为server_name组装前缀
-                expected_prefix = (
-                    server_name
-                    if server_name.startswith("mcp_")
-                    else f"mcp_{server_name}"
-                )
-
-                # 4.判断工具名字是否以该服务名字为开头
-                if tool_name.startswith(f"{expected_prefix}_"):
-                    # 5.取出原始的服务名字+工具名字
-                    original_server_name = server_name
-                    original_tool_name = tool_name[len(expected_prefix) + 1 :]
-                    break
-
-            # 6.判断服务名字+工具是否都存在
-            if not original_server_name or not original_tool_name:
+            # 1.从预先建立的索引中查找工具所属的服务+原始工具名
+            entry = self._tool_index.get(tool_name)
+
+            # 2.未找到时可能是工具列表刷新了或服务仍在连接中, 同步后再查找一次
+            if entry is None:
+                if self._pending:
+                    await asyncio.gather(*self._pending.values(), return_exceptions=True)
+                self._sync_tools()
+                entry = self._tool_index.get(tool_name)
+
+            # 3.判断服务名字+工具是否都存在
+            if entry is None:
                 raise NotFoundError(f"服务器解析MCP工具不存在: {tool_name}")
+            original_server_name, original_tool_name = entry
 
-            # 7.获取该工具所属的会话
-            session = self._clients.get(original_server_name)
-            if not session:
+            # 4.获取该工具所属的连接
+            conn = await self._get_connection(original_server_name)
+            if not conn:
                 return ToolResult(
                     success=False, message=f"MCP服务器[{original_server_name}]未连接"
                 )
 
-            # 8.使用会话调用工具
-            result = await session.call_tool(original_tool_name, arguments)
+            # 5.使用连接调用工具
+            result = await conn.call_tool(original_tool_name, arguments)
 
-            # 9.判断结果是否存在执行不同的操作
+            # 6.判断结果是否存在执行不同的操作
             if result:
-                # 10.处理MCP工具生成的content
+                # 7.处理MCP工具生成的content
                 content = []
                 if hasattr(result, "content") and result.content:
                     for item in result.content:
@@ -291,7 +288,7 @@ class MCPClientManager:
                         else:
                             content.append(str(item))
 
-                # 11.返回工具结果
+                # 8.返回工具结果
                 return ToolResult(
                     success=True, data="\n".join(content) if content else "工具执行成功"
                 )
@@ -306,43 +303,45 @@ class MCPClientManager:
             )
 
     async def cleanup(self) -> None:
-        """当退出MCP服务时, 清除对应资源"""
+        """当退出MCP服务时, 归还连接并清除对应资源"""
         try:
-            await self._exit_stack.aclose()
-            self._clients.clear()
+            for task in list(self._pending.values()):
+                task.cancel()
+            if self._pending:
+                await asyncio.gather(*self._pending.values(), return_exceptions=True)
+            for conn in self._connections.values():
+                self._pool.release(conn)
+            if self._owns_pool:
+                await self._pool.shutdown()
+            self._connections.clear()
             self._tools.clear()
+            self._tools_versions.clear()
+            self._llm_tools.clear()
+            self._tool_index.clear()
+            self._connect_report.clear()
             self._initialized = False
             logger.info("清除MCP客户端管理器成功")
         except Exception as e:
             logger.error(f"清理MCP客户端管理器失败: {str(e)}")
 
-    async def get_llm_tools(self) -> list[dict[str, Any]]:
-        """获取所有MCP工具列表, 返回LLM可以使用的工具参数声明列表并处理MCP的名字"""
-        # 1.定义一个变量存储所有结果
-        llm_tools = []
+    @property
+    def llm_tools(self) -> list[dict[str, Any]]:
+        """只读属性, 返回当前的LLM工具参数声明列表(工具名已加上服务前缀), 读取前同步已刷新的工具列表"""
+        self._sync_tools()
+        return [
+            tool_schema
+            for llm_tools in self._llm_tools.values()
+            for tool_schema in llm_tools
+        ]
 
-        # 2.循环遍历所有缓存的工具
-        for server_name, tools in self._tools.items():
-            # 3.循环取出每个MCP服务的工具列表
-            for tool in tools:
-                # 4.修改工具名字加上mcp_前缀+服务名字
-                if server_name.startswith("mcp_"):
-                    tool_name = f"{server_name}_{tool.name}"
-                else:
-                    tool_name = f"mcp_{server_name}_{tool.name}"
-
-                # 5.生成OpenAI工具描述
-                tool_schema = {
-                    "type": "function",
-                    "function": {
-                        "name": tool_name,
-                        "description": f"[{server_name}] {tool.description or tool.name}",
-                        "parameters": tool.inputSchema,
-                    },
-                }
-                llm_tools.append(tool_schema)
+    def has_tool(self, tool_name: str) -> bool:
+        """判断当前工具索引中是否存在该工具(工具名已加上服务前缀)"""
+        self._sync_tools()
+        return tool_name in self._tool_index
 
-        return llm_tools
+    async def get_llm_tools(self) -> list[dict[str, Any]]:
+        """获取所有MCP工具列表, 返回预先生成的LLM工具参数声明列表(工具名已加上服务前缀)"""
+        return self.llm_tools
 
 
 class MCPTool(BaseTool):
@@ -350,38 +349,31 @@ class MCPTool(BaseTool):
 
     name: str = "mcp"
 
-    def __init__(self) -> None:
-        """构造函数: 完成MCP工具包的初始化"""
+    def __init__(self, pool: MCPClientPool | None = None) -> None:
+        """构造函数: 完成MCP工具包的初始化, 传递连接池时复用进程级共享的MCP连接"""
         super().__init__()
         self._initialized: bool = False
-        self._tools: list[dict[str, Any]] = []
+        self._pool: MCPClientPool | None = pool
         self._manager: MCPClientManager = None
 
     async def initialize(self, mcp_config: MCPConfig | None = None) -> None:
-        """手动初始化MCP工具包"""
+        """手动初始化MCP工具包: 缓存命中的服务使用缓存的工具声明并在后台连接, 只等待缓存未命中的服务连接完成"""
         # 1.判断是否初始化，如果未初始化则进行初始化
         if not self._initialized:
-            # 2.初始化MCP客户端管理器
-            self._manager = MCPClientManager(mcp_config=mcp_config)
-            await self._manager.initialize()
-
-            # 3.获取mcpServers工具列表
-            self._tools = await self._manager.get_llm_tools()
+            # 2.初始化MCP客户端管理器, 工具列表每次从管理器的当前索引读取
+            self._manager = MCPClientManager(mcp_config=mcp_config, pool=self._pool)
+            await self._manager.initialize(wait=False)
             self._initialized = True
 
     def get_tools(self) -> list[dict[str, Any]]:
-        """同步获取工具包下的所有工具列表"""
-        return self._tools
+        """同步获取工具包下的所有工具列表, 包含连接完成及list_changed/缓存过期刷新后的工具"""
+        if not self._manager:
+            return []
+        return self._manager.llm_tools
 
     def has_tool(self, tool_name: str) -> bool:
         """传递工具名字判断工具是否存在"""
-        # 1.循环遍历所有的工具
-        for tool in self._tools:
-            # 2.判断工具的名字是否存在，如果是则返回True，否则返回False
-            if tool["function"]["name"] == tool_name:
-                return True
-
-        return False
+        return self._manager is not None and self._manager.has_tool(tool_name)
 
     async def invoke(self, tool_name: str, **kwargs) -> ToolResult:
         """传递工具名字+参数调用MCP工具并获取结果"""
@@ -0,0 +1,538 @@
+"""MCP连接池的开发思路:
+1.原先每次获取MCP服务列表、每个Agent初始化MCP工具时都会新建连接(启动stdio子进程/建立HTTP会话),
+  用完立即销毁, 耗时且浪费资源, 所以将连接提升为进程级共享, 跨请求、跨任务复用;
+2.连接池以"MCP服务配置的哈希值"作为键, 配置不变则复用已有连接, 配置变化会生成新的键并建立新连接,
+  旧连接无人使用后由空闲回收任务关闭, 从而实现只重建配置发生变化的服务;
+3.MCP的传输协议与ClientSession基于anyio实现, 其cancel scope要求在同一个asyncio任务中进入和退出,
+  所以每个连接由一个独立的后台任务持有AsyncExitStack: 在任务内建立连接, 等待关闭信号, 再在任务内退出;
+4.连接断开(子进程退出、HTTP会话失效)后会被标记为不可用, 下一次获取时懒加载重新建立连接;
+5.每个连接记录引用计数与最近使用时间, 引用计数为0且空闲超过阈值的连接会被后台任务回收;
+6.建立连接(含initialize)与获取工具列表分别有独立的超时时间, 由看门狗任务监控,
+  超时后直接取消连接任务, 让取消沿着anyio的cancel scope正常传播并清理子进程/HTTP会话;
+7.stdio服务可以开启预热池(mcp_warm_pool.py), 开启后stdio连接以独占租约的方式从预热池获取, 不在任务间共享;
+8.工具列表以配置哈希为键持久化到MCPToolCache, 缓存未过期时连接后不再调用list_tools,
+  只有收到服务端的tools/list_changed通知或缓存过期时才重新获取, 并通过tools_version通知使用方重建;
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from contextlib import AsyncExitStack
+from typing import Any
+
+from mcp import ClientSession, StdioServerParameters, Tool, stdio_client, types
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+
+from app.domain.external.mcp_tool_cache import MCPToolCache
+from app.domain.model.app_config import MCPConfig, MCPServerConfig, MCPTransport
+from app.domain.service.tool.mcp_warm_pool import StdioWarmPool
+
+logger = logging.getLogger(__name__)
+
+# 创建stdio子进程前后对比当前进程的子进程列表来获取新进程pid, 需要串行执行避免相互干扰
+_spawn_lock = asyncio.Lock()
+
+
+def _get_child_pids(pid: int | str = "self") -> set[int]:
+    """读取/proc获取进程的直接子进程pid列表, 非Linux系统返回空集合"""
+    pids: set[int] = set()
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children", "r") as f:
+                pids.update(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return pids
+
+
+def get_process_tree_rss_mb(pid: int) -> float:
+    """计算进程及其所有子孙进程的常驻内存(MB), npx/uvx启动的服务实际工作在子进程中"""
+    rss_kb, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        rss_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        stack.extend(_get_child_pids(current))
+    return round(rss_kb / 1024, 3)
+
+
+def get_config_hash(server_config: MCPServerConfig) -> str:
+    """计算MCP服务配置的哈希值, 启用状态与描述不影响连接所以不参与计算"""
+    data = server_config.model_dump_json(exclude={"enabled", "description"})
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class MCPConnection:
+    """MCP连接: 由独立的后台任务持有连接上下文, 其他任务通过session调用工具"""
+
+    CLOSE_TIMEOUT = 5  # 关闭连接时等待后台任务退出的最长时间(秒)
+
+    def __init__(
+        self,
+        server_name: str,
+        server_config: MCPServerConfig,
+        key: str,
+        connect_timeout: float | None = None,
+        list_tools_timeout: float | None = None,
+        tool_cache: MCPToolCache | None = None,
+    ) -> None:
+        """构造函数: 传递服务名字、服务配置、配置哈希、连接/获取工具列表的超时时间及工具缓存完成初始化"""
+        self.server_name = server_name
+        self.server_config = server_config
+        self.key = key
+        self._tool_cache = tool_cache
+        self._connect_timeout = connect_timeout
+        self._list_tools_timeout = list_tools_timeout
+        self.session: ClientSession | None = None  # 连接成功后的客户端会话
+        self.tools: list[Tool] = []  # 连接成功后获取的工具列表
+        self.tools_version = 0  # 工具列表版本, 每次刷新工具列表后递增
+        self.tools_loaded_at = time.monotonic()  # 工具列表最近加载时间
+        self.error: Exception | None = None  # 连接失败时的异常
+        self.connect_latency_ms: float | None = None  # 建立连接+获取工具列表的耗时
+        self.refs = 0  # 正在使用该连接的管理器数量
+        self.pid: int | None = None  # stdio服务的子进程pid
+        self.leased = False  # 是否为预热池独占租出的连接
+        self.last_used = time.monotonic()  # 最近使用时间
+        self._connected = asyncio.Event()  # 会话initialize完成后设置
+        self._ready = asyncio.Event()  # 连接成功或失败后设置
+        self._closing = asyncio.Event()  # 设置后后台任务退出连接上下文
+        self._task: asyncio.Task | None = None
+        self._watchdog: asyncio.Task | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def alive(self) -> bool:
+        """连接是否可用: 已连接成功且未关闭"""
+        return (
+            self.session is not None
+            and not self._closing.is_set()
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    @property
+    def failed(self) -> bool:
+        """连接是否已经失败或关闭, 失败的连接需要重新建立"""
+        return self._closing.is_set() or (self._ready.is_set() and self.session is None)
+
+    def start(self) -> None:
+        """启动后台任务建立连接, 同时启动看门狗任务监控连接超时"""
+        self._task = asyncio.create_task(
+            self._run(), name=f"mcp-connection:{self.server_name}"
+        )
+        self._watchdog = asyncio.create_task(
+            self._watch(), name=f"mcp-connection-watchdog:{self.server_name}"
+        )
+
+    async def _watch(self) -> None:
+        """看门狗: 建立连接或获取工具列表超时后取消连接任务"""
+        for event, timeout, stage in (
+            (self._connected, self._connect_timeout, "建立连接"),
+            (self._ready, self._list_tools_timeout, "获取工具列表"),
+        ):
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                self.error = asyncio.TimeoutError(f"{stage}超时({timeout}s)")
+                logger.error(f"MCP服务器[{self.server_name}]{stage}超时({timeout}s)")
+                self._task.cancel()
+
+                # 不等待连接任务清理完成(stdio子进程退出可能较慢), 立即唤醒等待方
+                self._closing.set()
+                self._ready.set()
+                return
+
+    async def wait_ready(self, timeout: float | None = None) -> None:
+        """等待连接建立完成, 超时抛出asyncio.TimeoutError, 连接失败时抛出对应异常"""
+        await asyncio.wait_for(self._ready.wait(), timeout)
+        if self.session is None:
+            raise self.error or RuntimeError(f"MCP服务器[{self.server_name}]连接已关闭")
+
+    def mark_broken(self) -> None:
+        """标记连接不可用并通知后台任务退出, 下一次获取时会重新建立连接"""
+        if not self._closing.is_set():
+            logger.warning(f"MCP服务器[{self.server_name}]连接不可用, 等待重新连接")
+            self._closing.set()
+
+    async def close(self) -> None:
+        """关闭连接: 通知后台任务退出上下文, 超时未退出则取消任务"""
+        self._closing.set()
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), self.CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+        except Exception:
+            pass
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any]) -> Any:
+        """调用工具, 发生非协议层错误(传输断开等)时标记连接不可用"""
+        self.last_used = time.monotonic()
+        if self.session is None:
+            raise RuntimeError(f"MCP服务器[{self.server_name}]未连接")
+        try:
+            return await self.session.call_tool(tool_name, arguments)
+        except McpError:
+            raise
+        except Exception:
+            self.mark_broken()
+            raise
+
+    async def _run(self) -> None:
+        """后台任务: 在同一个任务内进入与退出连接上下文"""
+        start = time.perf_counter()
+        try:
+            async with AsyncExitStack() as exit_stack:
+                # 1.根据传输协议建立读写流并创建客户端会话
+                read_stream, write_stream = await self._open_transport(exit_stack)
+                session: ClientSession = await exit_stack.enter_async_context(
+                    ClientSession(
+                        read_stream, write_stream, message_handler=self._handle_message
+                    ),
+                )
+
+                # 2.初始化会话并获取工具列表(优先使用未过期的缓存)
+                await session.initialize()
+                self._connected.set()
+                await self._load_tools(session)
+                self.session = session
+                self.connect_latency_ms = round((time.perf_counter() - start) * 1000, 3)
+                self._ready.set()
+                logger.info(
+                    f"连接MCP服务器[{self.server_name}]成功, 提供了{len(self.tools)}个工具, "
+                    f"耗时{self.connect_latency_ms}ms"
+                )
+
+                # 3.等待关闭信号, 之后在当前任务内退出上下文
+                await self._closing.wait()
+        except Exception as e:
+            self.error = e
+            logger.error(f"MCP服务器[{self.server_name}]连接出错: {str(e)}")
+        finally:
+            self.session = None
+            self._closing.set()
+            self._connected.set()
+            self._ready.set()
+
+    async def _load_tools(self, session: ClientSession) -> None:
+        """加载工具列表: 缓存命中时直接使用, 否则调用list_tools并写入缓存"""
+        cached = await self._tool_cache.get(self.key) if self._tool_cache else None
+        if cached is not None:
+            self.tools = cached
+        else:
+            tools_response = await session.list_tools()
+            self.tools = tools_response.tools if tools_response else []
+            if self._tool_cache:
+                await self._tool_cache.set(self.key, self.tools)
+        self.tools_version += 1
+        self.tools_loaded_at = time.monotonic()
+
+    async def _handle_message(self, message: Any) -> None:
+        """处理服务端消息: 收到tools/list_changed通知时调度刷新工具列表
+
+        该回调运行在会话的消息接收循环中, 不能在这里直接发起请求等待响应, 否则会阻塞接收循环
+        """
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            logger.info(f"MCP服务器[{self.server_name}]工具列表已变更, 重新获取工具列表")
+            self.schedule_refresh()
+
+    def schedule_refresh(self) -> None:
+        """在后台刷新工具列表, 同一时间只会有一个刷新任务"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh_tools())
+
+    async def refresh_tools(self) -> None:
+        """重新获取工具列表并更新缓存"""
+        if self.session is None:
+            return
+        try:
+            if self._tool_cache:
+                await self._tool_cache.delete(self.key)
+            await self._load_tools(self.session)
+        except Exception as e:
+            logger.error(f"刷新MCP服务器[{self.server_name}]工具列表失败: {str(e)}")
+
+    async def _open_transport(self, exit_stack: AsyncExitStack) -> tuple[Any, Any]:
+        """根据不同的传输协议建立连接, 返回读取流与写入流"""
+        transport = self.server_config.transport
+        if transport == MCPTransport.STDIO:
+            return await self._open_stdio(exit_stack)
+        elif transport == MCPTransport.SSE:
+            return await self._open_sse(exit_stack)
+        elif transport == MCPTransport.STREAMABLE_HTTP:
+            return await self._open_streamable_http(exit_stack)
+        raise ValueError(f"MCP服务[{self.server_name}]使用了不支持的传输协议: {transport}")
+
+    async def _open_stdio(self, exit_stack: AsyncExitStack) -> tuple[Any, Any]:
+        """连接stdio服务, 传递的环境变量与系统环境变量合并后传递给子进程"""
+        # 1.检查command是否存在
+        if not self.server_config.command:
+            raise ValueError("连接stdio-mcp服务器需要配置command命令")
+
+        # 2.构建stdio连接参数并建立连接
+        server_parameters = StdioServerParameters(
+            command=self.server_config.command,
+            args=self.server_config.args or [],
+            env={**os.environ, **(self.server_config.env or {})},
+        )
+        async with _spawn_lock:
+            before = _get_child_pids()
+            streams = await exit_stack.enter_async_context(stdio_client(server_parameters))
+            new_pids = _get_child_pids() - before
+        if len(new_pids) == 1:
+            self.pid = new_pids.pop()
+        return streams
+
+    def rss_mb(self) -> float | None:
+        """stdio服务进程树的常驻内存(MB), 无法获取pid时返回None"""
+        return get_process_tree_rss_mb(self.pid) if self.pid else None
+
+    async def _open_sse(self, exit_stack: AsyncExitStack) -> tuple[Any, Any]:
+        """连接sse服务"""
+        if not self.server_config.url:
+            raise ValueError("连接sse-mcp服务器需要配置url")
+        return await exit_stack.enter_async_context(
+            sse_client(url=self.server_config.url, headers=self.server_config.headers),
+        )
+
+    async def _open_streamable_http(self, exit_stack: AsyncExitStack) -> tuple[Any, Any]:
+        """连接streamable-http服务, 返回值的第三项为会话id获取函数, 这里不需要"""
+        if not self.server_config.url:
+            raise ValueError("连接streamable-http-mcp服务器需要配置url")
+        read_stream, write_stream, _ = await exit_stack.enter_async_context(
+            streamablehttp_client(
+                url=self.server_config.url, headers=self.server_config.headers
+            ),
+        )
+        return read_stream, write_stream
+
+
+class MCPClientPool:
+    """MCP连接池: 进程级共享MCP连接, 按配置哈希复用, 懒加载重连, 回收空闲连接"""
+
+    def __init__(
+        self,
+        idle_seconds: float = 300,
+        reap_interval_seconds: float = 30,
+        connect_timeout: float | None = 30,
+        list_tools_timeout: float | None = 10,
+        tool_cache: MCPToolCache | None = None,
+        tools_ttl_seconds: float | None = None,
+        stdio_warm_pool_size: int = 0,
+        stdio_max_rss_mb: float = 512,
+    ) -> None:
+        """构造函数: 传递空闲回收阈值、回收检查间隔、单个服务的连接/获取工具列表超时时间、工具缓存及其有效期、
+        stdio预热池参数(每个配置的预热进程数, 为0时不开启; 预热进程树最大内存)完成初始化"""
+        self._tool_cache = tool_cache
+        self._tools_ttl = tools_ttl_seconds
+        self._warm_pool: StdioWarmPool | None = (
+            StdioWarmPool(
+                connection_factory=self._create_connection,
+                size=stdio_warm_pool_size,
+                max_rss_mb=stdio_max_rss_mb,
+                idle_seconds=idle_seconds,
+                check_interval_seconds=reap_interval_seconds,
+            )
+            if stdio_warm_pool_size > 0
+            else None
+        )
+        self._idle_seconds = idle_seconds
+        self._reap_interval = reap_interval_seconds
+        self._connect_timeout = connect_timeout
+        self._list_tools_timeout = list_tools_timeout
+        self._connections: dict[str, MCPConnection] = {}
+        self._lock = asyncio.Lock()
+        self._reaper: asyncio.Task | None = None
+
+    def _create_connection(
+        self, server_name: str, server_config: MCPServerConfig, key: str
+    ) -> MCPConnection:
+        """按连接池的超时时间与工具缓存创建连接(未启动)"""
+        return MCPConnection(
+            server_name,
+            server_config,
+            key,
+            connect_timeout=self._connect_timeout,
+            list_tools_timeout=self._list_tools_timeout,
+            tool_cache=self._tool_cache,
+        )
+
+    async def start(self) -> None:
+        """启动空闲连接回收任务及stdio预热池"""
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_loop(), name="mcp-pool-reaper")
+            logger.info("MCP连接池启动成功")
+        if self._warm_pool is not None:
+            await self._warm_pool.start()
+
+    def prewarm(self, mcp_config: MCPConfig) -> None:
+        """为已启用的stdio服务在后台启动预热进程, 配置中已不存在或已禁用的服务不再常驻, 未开启预热池时不做任何操作"""
+        if self._warm_pool is None:
+            return
+        keys = set()
+        for server_name, server_config in mcp_config.mcpServers.items():
+            if server_config.enabled and server_config.transport == MCPTransport.STDIO:
+                key = get_config_hash(server_config)
+                keys.add(key)
+                self._warm_pool.prewarm(server_name, server_config, key)
+        self._warm_pool.retain(keys)
+
+    async def shutdown(self) -> None:
+        """停止回收任务并关闭所有连接"""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+        if self._warm_pool is not None:
+            await self._warm_pool.shutdown()
+
+        async with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        await asyncio.gather(*(conn.close() for conn in connections))
+        if connections:
+            logger.info(f"MCP连接池已关闭{len(connections)}个连接")
+
+    async def acquire(
+        self,
+        server_name: str,
+        server_config: MCPServerConfig,
+        timeout: float | None = None,
+    ) -> MCPConnection:
+        """获取MCP连接: 配置相同且可用的连接直接复用, 否则新建连接, 使用完毕后需要调用release"""
+        # 1.开启预热池时stdio服务从预热池独占租用连接
+        key = get_config_hash(server_config)
+        if self._warm_pool is not None and server_config.transport == MCPTransport.STDIO:
+            return await self._warm_pool.lease(server_name, server_config, key, timeout)
+
+        # 2.在锁内查找或创建连接, 保证同一配置同时只会建立一个连接
+        async with self._lock:
+            conn = self._connections.get(key)
+            if conn is None or conn.failed:
+                if conn is not None:
+                    asyncio.create_task(conn.close())
+                conn = self._create_connection(server_name, server_config, key)
+                conn.start()
+                self._connections[key] = conn
+            conn.refs += 1
+
+        # 3.在锁外等待连接就绪, 多个调用方共享同一次连接过程
+        try:
+            await conn.wait_ready(timeout)
+        except BaseException:
+            self.release(conn)
+            raise
+        # 4.长期复用的连接在工具列表超过有效期后, 后台重新获取工具列表
+        conn.last_used = time.monotonic()
+        if self._tools_ttl and conn.last_used - conn.tools_loaded_at > self._tools_ttl:
+            conn.schedule_refresh()
+        return conn
+
+    async def list_tools(
+        self,
+        server_name: str,
+        server_config: MCPServerConfig,
+        timeout: float | None = None,
+    ) -> list[Tool]:
+        """获取服务的工具列表(用于展示): 优先使用缓存, 未命中时才建立连接, 不会从预热池租用进程"""
+        # 1.已有可用连接或持久化缓存时直接返回
+        cached_tools = await self.get_cached_tools(server_config)
+        if cached_tools is not None:
+            return cached_tools
+
+        # 2.开启预热池时stdio服务建立一次性连接, 获取工具列表(同时写入缓存)后立即关闭
+        if self._warm_pool is not None and server_config.transport == MCPTransport.STDIO:
+            conn = self._create_connection(
+                server_name, server_config, get_config_hash(server_config)
+            )
+            conn.start()
+            try:
+                await conn.wait_ready(timeout)
+                return conn.tools
+            finally:
+                await conn.close()
+
+        # 3.其他服务使用共享连接
+        conn = await self.acquire(server_name, server_config, timeout)
+        try:
+            return conn.tools
+        finally:
+            self.release(conn)
+
+    async def get_cached_tools(self, server_config: MCPServerConfig) -> list[Tool] | None:
+        """获取服务的工具列表: 已有可用连接时直接返回, 否则读取持久化缓存, 用于连接完成前提前获取工具声明"""
+        key = get_config_hash(server_config)
+        conn = self._connections.get(key)
+        if conn is not None and conn.alive:
+            return conn.tools
+        if self._tool_cache is None:
+            return None
+        return await self._tool_cache.get(key)
+
+    def release(self, conn: MCPConnection) -> None:
+        """归还连接, 连接并不会立即关闭, 空闲超时后由回收任务关闭; 预热池租出的连接归还给预热池"""
+        if conn.leased and self._warm_pool is not None:
+            self._warm_pool.give_back(conn)
+            return
+        conn.refs = max(conn.refs - 1, 0)
+        conn.last_used = time.monotonic()
+
+    async def reap(self) -> int:
+        """回收无人使用且空闲超时、或者已经失败的连接, 返回回收的连接数"""
+        now = time.monotonic()
+        async with self._lock:
+            expired = [
+                conn
+                for conn in self._connections.values()
+                if conn.refs == 0
+                and (conn.failed or now - conn.last_used > self._idle_seconds)
+            ]
+            for conn in expired:
+                del self._connections[conn.key]
+        await asyncio.gather(*(conn.close() for conn in expired))
+        return len(expired)
+
+    async def _reap_loop(self) -> None:
+        """后台循环: 定期回收空闲连接"""
+        while True:
+            await asyncio.sleep(self._reap_interval)
+            try:
+                reaped = await self.reap()
+                if reaped:
+                    logger.info(f"MCP连接池回收了{reaped}个空闲连接")
+            except Exception as e:
+                logger.error(f"MCP连接池回收空闲连接出错: {str(e)}")
+
+    def stats(self) -> dict[str, Any]:
+        """返回连接池中每个共享连接的状态及stdio预热池的冷/热启动统计"""
+        now = time.monotonic()
+        connections = [
+            {
+                "server_name": conn.server_name,
+                "key": conn.key[:12],
+                "alive": conn.alive,
+                "refs": conn.refs,
+                "tools": len(conn.tools),
+                "connect_latency_ms": conn.connect_latency_ms,
+                "idle_seconds": round(now - conn.last_used, 3),
+            }
+            for conn in self._connections.values()
+        ]
+        warm_pool = self._warm_pool.stats() if self._warm_pool is not None else []
+        return {"connections": connections, "stdio_warm_pool": warm_pool}
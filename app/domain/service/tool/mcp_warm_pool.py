@@ -0,0 +1,256 @@
+"""stdio MCP服务预热池的开发思路:
+1.stdio服务通常使用npx/uvx启动, 每次冷启动都需要数秒, 所以为每个配置提前启动N个已完成initialize的进程;
+2.stdio服务进程内可能保存会话状态(例如浏览器、文件句柄、ClientSession上的订阅), 所以预热池中的连接以独占租约的方式交给任务使用,
+  每个进程只服务一个任务, 归还后直接关闭进程, 不会放回预热队列, 避免状态在任务之间泄露;
+3.预热中的进程树常驻内存超过阈值或进程退出后回收(关闭进程);
+4.租出连接或回收进程后在后台补充新进程, 请求路径上不等待补充完成;
+5.分别统计每个服务的冷启动(池中无可用进程)与热启动(直接租用预热进程)耗时;
+6.通过prewarm登记的配置(已启用的服务)常驻预热池; 只由租用登记的配置长时间没有被租用时会被移出预热池并关闭其进程,
+  配置变化后旧配置不再常驻, 其进程也会因此被回收;
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable
+
+from app.domain.model.app_config import MCPServerConfig
+
+if TYPE_CHECKING:
+    from app.domain.service.tool.mcp_pool import MCPConnection
+
+logger = logging.getLogger(__name__)
+
+
+class _WarmEntry:
+    """单个stdio服务配置在预热池中的状态"""
+
+    def __init__(self, server_name: str, server_config: MCPServerConfig, key: str) -> None:
+        self.server_name = server_name
+        self.server_config = server_config
+        self.key = key
+        self.idle: deque["MCPConnection"] = deque()  # 已就绪可租用的连接
+        self.starting = 0  # 正在后台启动的进程数
+        self.last_leased = time.monotonic()  # 最近一次租用时间
+        self.pinned = False  # 是否为prewarm登记的常驻配置, 常驻配置不会因长时间未租用而移出
+        self.cold_starts = 0  # 冷启动次数
+        self.warm_starts = 0  # 热启动次数
+        self.recycled = 0  # 回收的进程数
+        self.cold_latencies: deque[float] = deque(maxlen=100)  # 最近的冷启动耗时(毫秒)
+        self.warm_latencies: deque[float] = deque(maxlen=100)  # 最近的热启动耗时(毫秒)
+        self.replenish_task: asyncio.Task | None = None
+
+
+class StdioWarmPool:
+    """stdio MCP服务预热池: 为每个配置维护N个已初始化的进程, 独占租用且只使用一次, 后台补充"""
+
+    def __init__(
+        self,
+        connection_factory: Callable[[str, MCPServerConfig, str], "MCPConnection"],
+        size: int = 1,
+        max_rss_mb: float = 512,
+        idle_seconds: float = 300,
+        check_interval_seconds: float = 30,
+    ) -> None:
+        """构造函数: 传递连接工厂、每个配置的预热进程数、预热进程最大内存、配置空闲时长、检查间隔完成初始化"""
+        self._connection_factory = connection_factory
+        self._size = size
+        self._max_rss_mb = max_rss_mb
+        self._idle_seconds = idle_seconds
+        self._check_interval = check_interval_seconds
+        self._entries: dict[str, _WarmEntry] = {}
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        """启动后台检查任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="mcp-stdio-warm-pool")
+            logger.info(f"stdio MCP预热池启动成功, 每个配置预热{self._size}个进程")
+
+    async def shutdown(self) -> None:
+        """停止后台任务并关闭所有预热进程"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            if entry.replenish_task is not None:
+                entry.replenish_task.cancel()
+        await asyncio.gather(
+            *(conn.close() for entry in entries for conn in entry.idle),
+            return_exceptions=True,
+        )
+
+    def prewarm(self, server_name: str, server_config: MCPServerConfig, key: str) -> None:
+        """登记常驻配置并在后台启动预热进程"""
+        entry = self._get_entry(server_name, server_config, key)
+        entry.pinned = True
+        self._schedule_replenish(entry)
+
+    def retain(self, keys: set[str]) -> None:
+        """只保留keys对应的常驻配置, 其他配置取消常驻, 长时间未被租用后移出预热池"""
+        now = time.monotonic()
+        for key, entry in self._entries.items():
+            if entry.pinned and key not in keys:
+                entry.pinned = False
+                entry.last_leased = now
+
+    async def lease(
+        self,
+        server_name: str,
+        server_config: MCPServerConfig,
+        key: str,
+        timeout: float | None = None,
+    ) -> "MCPConnection":
+        """独占租用一个连接: 优先使用预热进程(热启动), 没有可用进程时直接启动新进程(冷启动)"""
+        entry = self._get_entry(server_name, server_config, key)
+        entry.last_leased = time.monotonic()
+        start = time.perf_counter()
+
+        # 1.从预热队列中取出可用的连接, 不可用或需要回收的连接直接关闭
+        conn = None
+        while entry.idle:
+            candidate = entry.idle.popleft()
+            if candidate.alive and not self._should_recycle(candidate):
+                conn = candidate
+                break
+            self._recycle(entry, candidate)
+
+        # 2.没有预热连接时冷启动
+        if conn is None:
+            conn = self._connection_factory(server_name, server_config, key)
+            conn.start()
+            try:
+                await conn.wait_ready(timeout)
+            except BaseException:
+                asyncio.create_task(conn.close())
+                raise
+            entry.cold_starts += 1
+            entry.cold_latencies.append((time.perf_counter() - start) * 1000)
+        else:
+            entry.warm_starts += 1
+            entry.warm_latencies.append((time.perf_counter() - start) * 1000)
+
+        # 3.标记独占租用并在后台补充预热进程
+        conn.leased = True
+        conn.refs += 1
+        conn.last_used = time.monotonic()
+        self._schedule_replenish(entry)
+        return conn
+
+    def give_back(self, conn: "MCPConnection") -> None:
+        """归还租用的连接: 进程及会话可能残留上一个任务的状态, 直接关闭并在后台补充新的预热进程"""
+        conn.leased = False
+        conn.refs = max(conn.refs - 1, 0)
+        conn.last_used = time.monotonic()
+        entry = self._entries.get(conn.key)
+        if entry is not None:
+            self._recycle(entry, conn)
+        else:
+            asyncio.create_task(conn.close())
+
+    def stats(self) -> list[dict[str, Any]]:
+        """返回每个服务的预热进程数及冷/热启动次数、平均耗时"""
+
+        def avg(values: deque[float]) -> float | None:
+            return round(sum(values) / len(values), 3) if values else None
+
+        return [
+            {
+                "server_name": entry.server_name,
+                "key": entry.key[:12],
+                "idle": len(entry.idle),
+                "starting": entry.starting,
+                "cold_starts": entry.cold_starts,
+                "warm_starts": entry.warm_starts,
+                "recycled": entry.recycled,
+                "avg_cold_start_ms": avg(entry.cold_latencies),
+                "avg_warm_start_ms": avg(entry.warm_latencies),
+            }
+            for entry in self._entries.values()
+        ]
+
+    def _get_entry(
+        self, server_name: str, server_config: MCPServerConfig, key: str
+    ) -> _WarmEntry:
+        """获取配置对应的预热状态, 不存在则创建"""
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _WarmEntry(server_name, server_config, key)
+            self._entries[key] = entry
+        return entry
+
+    def _should_recycle(self, conn: "MCPConnection") -> bool:
+        """预热进程树常驻内存超过阈值时需要回收"""
+        rss_mb = conn.rss_mb()
+        return rss_mb is not None and rss_mb > self._max_rss_mb
+
+    def _recycle(self, entry: _WarmEntry, conn: "MCPConnection") -> None:
+        """在后台关闭连接(进程)并补充新的预热进程"""
+        entry.recycled += 1
+        logger.info(
+            f"回收stdio MCP服务[{entry.server_name}]进程: 内存{conn.rss_mb()}MB"
+        )
+        asyncio.create_task(conn.close())
+        self._schedule_replenish(entry)
+
+    def _schedule_replenish(self, entry: _WarmEntry) -> None:
+        """在后台补充预热进程, 同一配置同一时间只会有一个补充任务"""
+        if entry.replenish_task is None or entry.replenish_task.done():
+            entry.replenish_task = asyncio.create_task(self._replenish(entry))
+
+    async def _replenish(self, entry: _WarmEntry) -> None:
+        """逐个启动新进程直到预热数量达到目标, 启动失败则等待下一轮检查"""
+        while self._entries.get(entry.key) is entry and len(entry.idle) < self._size:
+            conn = self._connection_factory(
+                entry.server_name, entry.server_config, entry.key
+            )
+            entry.starting += 1
+            conn.start()
+            try:
+                await conn.wait_ready()
+            except asyncio.CancelledError:
+                asyncio.create_task(conn.close())
+                raise
+            except Exception as e:
+                logger.error(f"预热stdio MCP服务[{entry.server_name}]失败: {str(e)}")
+                await conn.close()
+                return
+            finally:
+                entry.starting -= 1
+
+            # 启动期间可能已有连接归还到预热队列, 超出目标数量的进程直接关闭
+            if len(entry.idle) >= self._size:
+                await conn.close()
+                return
+            entry.idle.append(conn)
+
+    async def _run(self) -> None:
+        """后台循环: 移除长时间未租用的配置, 检查预热进程是否需要回收并补充"""
+        while True:
+            await asyncio.sleep(self._check_interval)
+            try:
+                now = time.monotonic()
+                for key, entry in list(self._entries.items()):
+                    # 1.非常驻且长时间未被租用的配置移出预热池并关闭其进程
+                    if not entry.pinned and now - entry.last_leased > self._idle_seconds:
+                        del self._entries[key]
+                        for conn in entry.idle:
+                            asyncio.create_task(conn.close())
+                        continue
+
+                    # 2.检查预热进程是否存活、是否超出内存阈值
+                    for conn in list(entry.idle):
+                        if not conn.alive or self._should_recycle(conn):
+                            entry.idle.remove(conn)
+                            self._recycle(entry, conn)
+                    self._schedule_replenish(entry)
+            except Exception as e:
+                logger.error(f"stdio MCP预热池检查出错: {str(e)}")
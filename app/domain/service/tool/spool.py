@@ -0,0 +1,168 @@
+"""大体积工具结果转存的开发思路:
+1.MCP/Shell等工具可能一次返回几十上百KB的内容, 直接写入记忆会让后续每一次LLM请求、每一条Redis事件都携带这份数据;
+2.工具结果序列化后超过阈值时写入ToolResultStore(对象存储), 记忆与事件中只保留截断的预览+引用句柄+总长度;
+3.提供spool_read工具, LLM确实需要完整内容时按offset分页读取, 每页长度有上限;
+4.最近读取过的结果在进程内保留少量副本, 连续分页时不用重复下载;
+5.写入存储失败时退化为只保留截断预览, 不影响工具调用本身;
+"""
+
+import json
+import logging
+import re
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from app.domain.external.tool_result_store import ToolResultStore
+from app.domain.model.tool_result import ToolResult
+from app.domain.service.tool.base import BaseTool, tool
+
+logger = logging.getLogger(__name__)
+
+# 引用句柄格式, 句柄由LLM传回并用于拼接存储的对象键, 必须严格校验
+SPOOL_HANDLE_PATTERN = re.compile(r"spool_[0-9a-f]{32}")
+
+
+class ToolResultSpooler:
+    """工具结果转存器: 超出阈值的工具结果写入存储, 返回预览+引用句柄"""
+
+    def __init__(
+        self,
+        store: ToolResultStore,
+        threshold_chars: int = 8000,
+        preview_chars: int = 2000,
+        page_chars: int = 8000,
+        cache_size: int = 16,
+    ) -> None:
+        """构造函数: 传递结果存储、转存阈值、预览长度、单页最大长度、进程内缓存数量完成初始化"""
+        self._store = store
+        self._threshold_chars = threshold_chars
+        self._preview_chars = preview_chars
+        self._page_chars = page_chars
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, str] = OrderedDict()
+
+    @property
+    def page_chars(self) -> int:
+        """只读属性: 返回分页读取时单页的最大长度"""
+        return self._page_chars
+
+    @classmethod
+    def _serialize(cls, data: Any) -> str:
+        """将工具结果数据序列化为字符串"""
+        if isinstance(data, str):
+            return data
+        if hasattr(data, "model_dump"):
+            data = data.model_dump(mode="json")
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+    def _remember(self, handle: str, content: str) -> None:
+        """在进程内缓存最近使用的结果, 超出数量时淘汰最久未使用的"""
+        self._cache[handle] = content
+        self._cache.move_to_end(handle)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    async def spool(self, function_name: str, result: ToolResult) -> ToolResult:
+        """工具结果数据超出阈值时转存并返回预览+引用句柄, 否则原样返回"""
+        # 1.分页读取工具自身的结果不再转存, 没有数据的结果也无需处理
+        if function_name == SpoolTool.READ_TOOL_NAME or result.data is None:
+            return result
+
+        # 2.序列化后未超过阈值则原样返回
+        content = self._serialize(result.data)
+        total_chars = len(content)
+        if total_chars <= self._threshold_chars:
+            return result
+
+        # 3.写入存储, 失败时只保留截断的预览
+        handle = f"spool_{uuid.uuid4().hex}"
+        try:
+            await self._store.put(handle, content)
+            self._remember(handle, content)
+        except Exception as e:
+            logger.error(f"转存工具[{function_name}]结果失败, 仅保留预览: {str(e)}")
+            handle = None
+
+        # 4.组装预览结果
+        data = {
+            "preview": content[: self._preview_chars],
+            "total_chars": total_chars,
+            "truncated": True,
+        }
+        if handle is not None:
+            data["spool_handle"] = handle
+            data["hint"] = (
+                f"结果过大({total_chars}字符)仅展示前{self._preview_chars}字符, "
+                f"如需完整内容请调用{SpoolTool.READ_TOOL_NAME}并传递spool_handle按offset分页读取"
+            )
+        return ToolResult(success=result.success, message=result.message, data=data)
+
+    async def read(
+        self, handle: str, offset: int = 0, limit: int | None = None
+    ) -> ToolResult:
+        """根据引用句柄分页读取转存的工具结果"""
+        # 1.校验句柄格式, 避免构造任意的存储对象键
+        if not SPOOL_HANDLE_PATTERN.fullmatch(handle or ""):
+            return ToolResult(success=False, message=f"转存结果句柄[{handle}]格式错误")
+
+        # 2.优先读取进程内缓存, 没有再从存储中获取
+        content = self._cache.get(handle)
+        if content is None:
+            content = await self._store.get(handle)
+            if content is None:
+                return ToolResult(success=False, message=f"转存结果[{handle}]不存在或已过期")
+        self._remember(handle, content)
+
+        # 3.计算分页范围, 单页长度在1到上限之间
+        limit = max(min(limit or self._page_chars, self._page_chars), 1)
+        offset = min(max(offset, 0), len(content))
+        page = content[offset : offset + limit]
+        next_offset = offset + len(page)
+        return ToolResult(
+            success=True,
+            data={
+                "content": page,
+                "offset": offset,
+                "next_offset": next_offset,
+                "total_chars": len(content),
+                "eof": next_offset >= len(content),
+            },
+        )
+
+
+class SpoolTool(BaseTool):
+    """转存结果工具包, 提供按offset分页读取大体积工具结果的能力"""
+
+    name: str = "spool"
+    READ_TOOL_NAME = "spool_read"
+
+    def __init__(self, spooler: ToolResultSpooler) -> None:
+        """构造函数，完成转存结果工具包的初始化"""
+        super().__init__()
+        self.spooler = spooler
+
+    @tool(
+        name=READ_TOOL_NAME,
+        description="分页读取被转存的大体积工具结果。当工具结果中包含spool_handle且预览内容不足以完成任务时使用, 通过next_offset继续读取下一页, eof为true表示已读取完毕。",
+        parameters={
+            "spool_handle": {
+                "type": "string",
+                "description": "工具结果中返回的spool_handle引用句柄",
+            },
+            "offset": {
+                "type": "integer",
+                "description": "（可选）开始读取的字符位置，默认为0，继续读取时传递上一页返回的next_offset",
+            },
+            "limit": {
+                "type": "integer",
+                "description": "（可选）本次读取的最大字符数，超过单页上限时按上限读取",
+            },
+        },
+        required=["spool_handle"],
+    )
+    async def spool_read(
+        self, spool_handle: str, offset: int | None = None, limit: int | None = None
+    ) -> ToolResult:
+        """根据引用句柄+offset分页读取转存的工具结果"""
+        return await self.spooler.read(spool_handle, offset or 0, limit)
@@ -0,0 +1,3 @@
+from .cpu_executor import CPUExecutor, get_cpu_executor
+
+__all__ = ["CPUExecutor", "get_cpu_executor"]
@@ -0,0 +1,81 @@
+"""CPU密集任务执行器的开发思路:
+1.HTML解析、HTML转markdown等纯Python的CPU密集操作直接在事件循环中执行时, 会阻塞同一个worker上的所有会话;
+2.提供进程内共享的执行器, 通过run_in_executor将这类操作放到线程池或进程池中执行, 事件循环只等待结果;
+3.线程池开销小但受GIL限制, 只能缓解单次长时间阻塞; 进程池可以真正并行, 但参数与返回值需要序列化, 提交的函数必须是模块级函数;
+4.执行器类型与工作数量通过配置选择, 随应用生命周期启动与关闭, 未启动时首次提交任务会自动启动;
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, TypeVar
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CPUExecutor:
+    """CPU密集任务执行器: 将同步的CPU密集函数放到线程池/进程池中执行"""
+
+    def __init__(self, kind: str = "thread", max_workers: int = 0) -> None:
+        """构造函数: 传递执行器类型(thread/process)与工作数量(为0时按CPU核数)完成初始化"""
+        if kind not in ("thread", "process"):
+            raise ValueError(f"不支持的执行器类型: {kind}")
+        self._kind = kind
+        self._max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Executor | None = None
+        self._submitted = 0  # 提交的任务数
+
+    async def start(self) -> None:
+        """创建线程池或进程池"""
+        if self._executor is not None:
+            return
+        if self._kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="cpu-executor"
+            )
+        logger.info(f"CPU任务执行器启动成功: {self._kind} x {self._max_workers}")
+
+    async def shutdown(self) -> None:
+        """等待执行中的任务结束并关闭执行器"""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+            logger.info("成功关闭: CPU任务执行器")
+
+        # 清除缓存
+        get_cpu_executor.cache_clear()
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """在执行器中运行同步函数并等待结果, 使用进程池时func及参数必须可以被pickle"""
+        if self._executor is None:
+            await self.start()
+        self._submitted += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    def stats(self) -> dict[str, Any]:
+        """返回执行器的统计信息"""
+        return {
+            "kind": self._kind,
+            "max_workers": self._max_workers,
+            "started": self._executor is not None,
+            "submitted": self._submitted,
+        }
+
+
+@lru_cache()
+def get_cpu_executor() -> CPUExecutor:
+    """使用lru_cache实现单例模式 获取CPU密集任务执行器"""
+    settings = get_settings()
+    return CPUExecutor(
+        kind=settings.cpu_executor_kind,
+        max_workers=settings.cpu_executor_max_workers,
+    )
@@ -0,0 +1,179 @@
+"""页面内容LLM分块提取的开发思路:
+1.原先配置了LLM时会将最多50k字符的markdown一次性发送给LLM, 大页面只能等待最慢的一次整体改写, 超过50k的内容直接丢弃;
+2.内容较短(低于阈值)时不调用LLM, 直接返回markdown;
+3.较长的内容按结构边界(标题 > 空行分隔的段落 > 换行 > 硬切分)切分为多个分块, 每个分块不超过设定的长度;
+4.分块通过信号量限制并发数后并行调用LLM提取, 单个分块失败时保留该分块的原始markdown;
+5.分块结果按(模型名+分块内容)的哈希缓存在进程内(LRU), 页面局部变化或重复访问时只需要重新提取变化的分块;
+6.按原始顺序合并所有分块的提取结果;
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from typing import Any
+
+from app.domain.external.llm import LLM
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_SYSTEM_PROMPT = "您是一名专业的网页信息提取助手。请从当前页面内容中提取所有信息并将其转换为markdown格式。"
+CHUNK_SYSTEM_PROMPT = (
+    "您是一名专业的网页信息提取助手。当前内容是网页中的第{index}/{total}个片段, "
+    "请提取该片段中的所有信息并将其转换为markdown格式, 不要补充片段之外的内容, 也不要添加总结或说明。"
+)
+
+# 结构边界: markdown标题行之前、空行、换行
+_HEADING_BOUNDARY = re.compile(r"\n(?=#{1,6} )")
+_PARAGRAPH_BOUNDARY = re.compile(r"\n\s*\n")
+
+
+class _ChunkCache:
+    """分块提取结果的进程内LRU缓存及命中统计"""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._items: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> str | None:
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+def split_markdown(markdown: str, chunk_chars: int) -> list[str]:
+    """按结构边界将markdown切分为不超过chunk_chars的分块, 相邻的小片段会被合并"""
+    separators = [(_HEADING_BOUNDARY, "\n"), (_PARAGRAPH_BOUNDARY, "\n\n"), (re.compile(r"\n"), "\n")]
+
+    def split(text: str, level: int) -> list[str]:
+        # 1.长度满足要求则直接作为一个片段
+        if len(text) <= chunk_chars:
+            return [text]
+
+        # 2.所有结构边界都无法满足长度要求时硬切分
+        if level >= len(separators):
+            return [text[i : i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+
+        # 3.按当前层级的边界切分, 仍然过长的片段使用下一层级的边界继续切分
+        pattern, joiner = separators[level]
+        pieces: list[str] = []
+        for part in pattern.split(text):
+            if part.strip():
+                pieces.extend(split(part, level + 1) if len(part) > chunk_chars else [part])
+
+        # 4.贪心合并相邻片段, 减少分块数量
+        chunks: list[str] = []
+        for piece in pieces:
+            if chunks and len(chunks[-1]) + len(joiner) + len(piece) <= chunk_chars:
+                chunks[-1] = chunks[-1] + joiner + piece
+            else:
+                chunks.append(piece)
+        return chunks
+
+    return split(markdown.strip(), 0) if markdown.strip() else []
+
+
+class LLMContentExtractor:
+    """使用LLM将页面markdown整理为结构化内容: 短内容跳过, 长内容分块并行提取后合并"""
+
+    def __init__(
+        self,
+        llm: LLM,
+        min_chars: int,  # 内容低于该长度时不调用LLM
+        chunk_chars: int,  # 单个分块的最大长度, 内容不超过该长度时一次提取
+        max_chars: int,  # 参与提取的最大内容长度
+        concurrency: int,  # 同一页面同时提取的分块数
+    ) -> None:
+        self.llm = llm
+        self.min_chars = min_chars
+        self.chunk_chars = chunk_chars
+        self.max_chars = max_chars
+        self.concurrency = max(1, concurrency)
+
+    async def extract(self, markdown: str) -> str:
+        """提取页面内容, 返回合并后的markdown"""
+        # 1.内容较短时不调用LLM
+        markdown = markdown[: self.max_chars]
+        if len(markdown) < self.min_chars:
+            return markdown
+
+        # 2.按结构边界切分
+        chunks = split_markdown(markdown, self.chunk_chars)
+        if not chunks:
+            return markdown
+
+        # 3.限制并发数后并行提取所有分块
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(
+                self._extract_chunk(chunk, index, len(chunks), semaphore)
+                for index, chunk in enumerate(chunks, start=1)
+            )
+        )
+
+        # 4.按原始顺序合并
+        return "\n\n".join(result.strip() for result in results if result.strip())
+
+    async def _extract_chunk(
+        self, chunk: str, index: int, total: int, semaphore: asyncio.Semaphore
+    ) -> str:
+        """提取单个分块, 优先读取缓存, 调用失败时返回原始分块"""
+        # 1.只有一个分块时与整体提取使用相同的提示词
+        system_prompt = (
+            EXTRACT_SYSTEM_PROMPT
+            if total == 1
+            else CHUNK_SYSTEM_PROMPT.format(index=index, total=total)
+        )
+
+        # 2.按模型名+分块内容计算缓存键, 片段序号只影响提示词不影响提取结果, 不参与计算
+        key = hashlib.sha256(
+            f"{self.llm.model_name}\0{total == 1}\0{chunk}".encode("utf-8")
+        ).hexdigest()
+        cached = _chunk_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # 3.调用LLM提取分块内容
+        async with semaphore:
+            try:
+                response = await self.llm.invoke(
+                    [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": chunk},
+                    ]
+                )
+                content = response.get("content") or ""
+            except Exception as e:
+                logger.warning(f"LLM提取页面内容分块[{index}/{total}]失败, 使用原始内容: {str(e)}")
+                return chunk
+
+        # 4.缓存提取结果
+        if content.strip():
+            _chunk_cache.put(key, content)
+            return content
+        return chunk
+
+
+def content_extraction_stats() -> dict[str, Any]:
+    """返回分块提取结果缓存的统计信息"""
+    return _chunk_cache.to_dict()
+
+
+# 进程内共享的分块提取结果缓存
+_chunk_cache = _ChunkCache(max_size=512)
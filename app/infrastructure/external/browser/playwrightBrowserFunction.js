@@ -1,49 +1,154 @@
-const getVisibleContent = () => {
-    // 1.定义变量存储所有可视元素+视口宽高
-    const visibleElements = [];
+const extractVisibleContent = (onVisibleElement) => {
+    // 1.定义视口宽高、输出上限及需要保留的结构化标签(其余可见元素只输出文本)
     const viewportHeight = window.innerHeight;
-    const viewportWeight = window.innerWidth;
+    const viewportWidth = window.innerWidth;
+    const maxChars = 200000;
+    const skipTags = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE', 'SVG', 'CANVAS', 'IFRAME', 'OBJECT', 'HEAD']);
+    const blockTags = new Set(['DIV', 'SECTION', 'ARTICLE', 'MAIN', 'HEADER', 'FOOTER', 'NAV', 'ASIDE', 'FORM', 'FIGURE', 'DETAILS', 'SUMMARY']);
+    const keepTags = new Set([
+        'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'P', 'UL', 'OL', 'LI', 'DL', 'DT', 'DD',
+        'TABLE', 'THEAD', 'TBODY', 'TFOOT', 'TR', 'TD', 'TH', 'CAPTION', 'PRE', 'CODE', 'BLOCKQUOTE',
+        'A', 'STRONG', 'B', 'EM', 'I', 'FIGCAPTION', 'BUTTON', 'LABEL', 'TEXTAREA', 'SELECT', 'OPTION'
+    ]);
+    const voidTags = new Set(['IMG', 'INPUT', 'BR', 'HR']);
+    const keepAttributes = ['href', 'src', 'alt', 'title', 'type', 'placeholder'];
+
+    // 2.转义文本与属性值
+    const escapeHtml = (text) => text
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;');
+
+    // 3.判断元素是否可见, 文本节点根据父元素的结果判断; TreeWalker在parentNode/nextSibling时会重复调用过滤函数, 所以按元素缓存判断结果
+    const visibleState = new Map([[document.body, true]]);
+    const decisions = new Map();
+    const acceptNode = (node) => {
+        // 4.文本节点: 父元素可见才输出, 纯空白文本折叠为一个空格保留行内元素之间的间隔
+        if (node.nodeType === Node.TEXT_NODE) {
+            return visibleState.get(node.parentElement) && node.nodeValue
+                ? NodeFilter.FILTER_ACCEPT
+                : NodeFilter.FILTER_REJECT;
+        }
 
-    // 2.获取页面上所有元素
-    const elements = document.querySelectorAll("body *");
+        // 5.脚本/样式等标签, display:none及opacity:0的元素整棵子树都不可见, 直接跳过子树
+        const element = node;
+        const decided = decisions.get(element);
+        if (decided !== undefined) return decided;
+        const tagName = element.tagName.toUpperCase();
+        if (skipTags.has(tagName)) {
+            decisions.set(element, NodeFilter.FILTER_REJECT);
+            return NodeFilter.FILTER_REJECT;
+        }
+        const style = window.getComputedStyle(element);
+        if (style.display === 'none' || style.opacity === '0') {
+            decisions.set(element, NodeFilter.FILTER_REJECT);
+            return NodeFilter.FILTER_REJECT;
+        }
 
-    // 3.循环遍历所有元素逐个处理
-    for (let i = 0; i < elements.length; i++) {
-        // 4.获取元素的尺寸与位置
-        const element = elements[i];
+        // 6.没有大小、不在视口内或visibility:hidden的元素本身不输出, 但子元素仍可能可见, 需要继续遍历
         const rect = element.getBoundingClientRect();
-
-        // 5.判断元素的宽高，如果没有大小则跳过
-        if (rect.height === 0 || rect.width === 0) continue;
-
-        // 6.排除完全在当前屏幕可视区域之外的元素(上方、下方、左侧、右侧)的元素
-        if (
+        const visible = !(
+            rect.width === 0 ||
+            rect.height === 0 ||
             rect.bottom < 0 ||
             rect.top > viewportHeight ||
             rect.right < 0 ||
-            rect.left > viewportWeight
-        ) continue;
+            rect.left > viewportWidth ||
+            style.visibility === 'hidden'
+        );
+        visibleState.set(element, visible);
+        if (visible && onVisibleElement) onVisibleElement(element);
+
+        // 7.只有需要保留结构的可见元素才会被接受, 其余元素跳过自身但继续遍历子节点
+        const decision = visible && (keepTags.has(tagName) || blockTags.has(tagName) || voidTags.has(tagName))
+            ? NodeFilter.FILTER_ACCEPT
+            : NodeFilter.FILTER_SKIP;
+        decisions.set(element, decision);
+        return decision;
+    };
 
-        // 7.通用样式判断当前元素是否隐藏
-        const style = window.getComputedStyle(element);
-        if (
-            style.display === 'none' || // 块隐藏
-            style.visibility === 'hidden' || // 隐藏不可见
-            style.opacity === '0' // 透明度为0
-        ) continue;
+    // 8.生成元素的开始标签, 块级容器统一输出为div, 只保留必要的属性
+    const openTag = (element) => {
+        const tagName = element.tagName.toUpperCase();
+        const name = blockTags.has(tagName) ? 'div' : tagName.toLowerCase();
+        let attributes = '';
+        for (const attribute of keepAttributes) {
+            const value = element.getAttribute(attribute);
+            if (value) attributes += ` ${attribute}="${escapeHtml(value)}"`;
+        }
+        if (tagName === 'INPUT' && element.value) attributes += ` value="${escapeHtml(element.value)}"`;
+        return {name, html: `<${name}${attributes}>`};
+    };
 
-        // 8.如果element是文本节点或有意义的元素, 请将其添加到结果中
-        if (
-            element.innerText ||
-            element.tagName === "IMG" ||
-            element.tagName === "INPUT" ||
-            element.tagName === "BUTTON"
-        ) visibleElements.push(element.outerHTML)
+    // 9.使用TreeWalker深度优先遍历, 每个文本节点只输出一次, 进入/离开元素时输出结构化标签
+    const output = [];
+    let length = 0;
+    let preDepth = 0;
+    const push = (html) => {
+        output.push(html);
+        length += html.length;
+    };
+    const walker = document.createTreeWalker(
+        document.body || document.documentElement,
+        NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT,
+        {acceptNode}
+    );
+    const visit = () => {
+        if (length > maxChars) return;
+        const node = walker.currentNode;
+
+        // 10.文本节点: pre中保留原始空白, 其余折叠连续空白
+        if (node.nodeType === Node.TEXT_NODE) {
+            const text = preDepth > 0 ? node.nodeValue : node.nodeValue.replace(/\s+/g, ' ');
+            push(escapeHtml(text));
+            return;
+        }
+
+        // 11.元素节点: 输出开始标签, 递归子节点后输出结束标签, 空标签不需要结束标签
+        const tag = openTag(node);
+        push(tag.html);
+        if (voidTags.has(node.tagName.toUpperCase())) return;
+        const isPre = tag.name === 'pre';
+        if (isPre) preDepth++;
+        if (walker.firstChild()) {
+            do {
+                visit();
+            } while (walker.nextSibling());
+            walker.parentNode();
+        }
+        if (isPre) preDepth--;
+        push(`</${tag.name}>`);
+    };
+
+    // 12.body本身不输出, 从其第一个被接受的子节点开始遍历
+    if (walker.firstChild()) {
+        do {
+            visit();
+        } while (walker.nextSibling());
     }
 
-    // 9.将所有内容使用空格拼接后包裹在div内返回
-    return '<div>' + visibleElements.join(' ') + '</div>'
-}
+    // 13.将所有内容包裹在div内返回
+    return '<div>' + output.join('') + '</div>';
+};
+
+const getVisibleContent = () => extractVisibleContent(null);
+
+// 元素与id的映射按DOM节点身份保存, 同一个元素在多次快照中保持相同的id
+const assignStableElementId = (element) => {
+    const ids = window.__manusElementIds || (window.__manusElementIds = new WeakMap());
+    let id = ids.get(element);
+    if (id === undefined) {
+        id = window.__manusNextElementId ?? 0;
+        window.__manusNextElementId = id + 1;
+        ids.set(element, id);
+    }
+    const value = `manus-element-${id}`;
+    if (element.getAttribute('data-manus-id') !== value) {
+        element.setAttribute('data-manus-id', value);
+    }
+    return id;
+};
 
 const getInteractiveElements = () => {
     // 1.定义变量存储激活元素列表+视口宽高
@@ -54,9 +159,6 @@ const getInteractiveElements = () => {
     // 2.获取页面上所有可交互的元素，包含按钮、a标签、输入框、文本域、下拉菜单、按钮、tab等
     const elements = document.querySelectorAll('button, a, input, textarea, select, [role="button"], [tabindex]:not([tabindex="-1"])');
 
-    // 3.定义变量用于生成连续的唯一索引
-    let validElementIndex = 0;
-
     // 4.循环遍历所有元素
     for (let i = 0; i < elements.length; i++) {
         // 5.取出对应元素并获取尺寸+位置
@@ -171,36 +273,21 @@ const getInteractiveElements = () => {
             text = text.substring(0, 97) + '...';
         }
 
-        // 24.为当前元素添加data-manus-id的属性，值为manus-element-idx，这样可以通过索引找到对应的元素
-        element.setAttribute('data-manus-id', `manus-element-${validElementIndex}`);
+        // 24.为当前元素分配稳定id并添加data-manus-id的属性，值为manus-element-id，这样可以通过id找到对应的元素
+        const elementId = assignStableElementId(element);
 
         // 25.构建css选择器
-        const selector = `[data-manus-id="manus-element-${validElementIndex}"]`;
+        const selector = `[data-manus-id="manus-element-${elementId}"]`;
 
-        // 26.将索引、标签名、文本、选择器添加到激活元素列表中
+        // 26.将id、标签名、文本、选择器添加到激活元素列表中
         interactiveElements.push({
-            index: validElementIndex,
+            index: elementId,
             tag: tagName,
             text: text,
             selector: selector
         });
-
-        // 27.索引自增1
-        validElementIndex++;
     }
 
-    // 28.最终返回所有激活元素数据
+    // 27.最终返回所有激活元素数据
     return interactiveElements;
 }
-
-const injectConsoleLogs = () => {
-    // 1.定义变量存储控制台输出日志
-    window.console.logs = [];
-
-    // 2.重写window.console.log函数
-    const originalLog = console.log;
-    console.log = (...args) => {
-        window.console.logs.push(args.join(" "));
-        originalLog.apply(console, args);
-    };
-}
\ No newline at end of file
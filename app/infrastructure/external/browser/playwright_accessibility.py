@@ -0,0 +1,226 @@
+"""基于CDP无障碍树的可交互元素提取的开发思路:
+1.注入js的提取方式需要对每个候选元素调用getComputedStyle/getBoundingClientRect, 无法进入shadow DOM与iframe, 还会给DOM写入data-manus-id属性;
+2.通过DOMSnapshot.captureSnapshot一次获取所有文档(包含同进程iframe及shadow DOM)中节点的布局信息, 过滤出有尺寸且位于视口内的节点;
+3.通过Accessibility.getFullAXTree获取每个frame的无障碍树, 只保留可交互角色(按钮/链接/输入框等)且可见的节点, 使用角色+可访问名称描述元素;
+4.元素使用backendDOMNodeId作为索引, 在节点存活期间保持稳定, 点击/输入/选择直接通过backendNodeId操作, 不再需要query_selector;
+5.跨进程iframe(OOPIF)需要单独的CDP会话, 暂不提取;
+"""
+
+import logging
+from typing import Any
+
+from playwright.async_api import CDPSession, Page
+
+from app.infrastructure.external.browser.playwright_cdp import get_cdp_session
+
+logger = logging.getLogger(__name__)
+
+# 视为可交互的无障碍角色
+INTERACTIVE_ROLES = frozenset(
+    {
+        "button",
+        "link",
+        "textbox",
+        "searchbox",
+        "combobox",
+        "listbox",
+        "option",
+        "checkbox",
+        "radio",
+        "switch",
+        "slider",
+        "spinbutton",
+        "menuitem",
+        "menuitemcheckbox",
+        "menuitemradio",
+        "tab",
+        "treeitem",
+    }
+)
+
+# 描述文本最大长度, 与注入js的提取方式保持一致
+MAX_TEXT_LENGTH = 100
+
+
+def _ax_value(node: dict[str, Any], field: str) -> str:
+    """读取无障碍节点中role/name/value等字段的字符串值"""
+    value = node.get(field, {}).get("value", "")
+    return str(value).strip() if value is not None else ""
+
+
+async def _get_frame_ids(session: CDPSession) -> list[str]:
+    """获取页面所有frame的id(主frame在前)"""
+    frame_tree = (await session.send("Page.getFrameTree"))["frameTree"]
+    frame_ids, stack = [], [frame_tree]
+    while stack:
+        node = stack.pop(0)
+        frame_ids.append(node["frame"]["id"])
+        stack.extend(node.get("childFrames", []))
+    return frame_ids
+
+
+async def _get_visible_backend_node_ids(session: CDPSession) -> set[int]:
+    """通过DOM快照获取有尺寸的节点, 主文档中的节点还需要与视口相交"""
+    # 1.获取视口在主文档中的位置
+    metrics = await session.send("Page.getLayoutMetrics")
+    viewport = metrics["cssLayoutViewport"]
+    left, top = viewport["pageX"], viewport["pageY"]
+    right, bottom = left + viewport["clientWidth"], top + viewport["clientHeight"]
+
+    # 2.一次获取所有文档(包含iframe与shadow DOM)的布局信息
+    snapshot = await session.send(
+        "DOMSnapshot.captureSnapshot", {"computedStyles": []}
+    )
+    visible: set[int] = set()
+    for document_index, document in enumerate(snapshot["documents"]):
+        backend_node_ids = document["nodes"]["backendNodeId"]
+        layout = document["layout"]
+        for node_index, (x, y, width, height) in zip(
+            layout["nodeIndex"], layout["bounds"]
+        ):
+            if width <= 0 or height <= 0:
+                continue
+            # 3.iframe中的坐标相对于iframe自身, 只校验尺寸
+            if document_index == 0 and (
+                x + width < left or x > right or y + height < top or y > bottom
+            ):
+                continue
+            visible.add(backend_node_ids[node_index])
+    return visible
+
+
+async def extract_accessibility_elements(page: Page) -> list[dict[str, Any]]:
+    """提取页面中可见的可交互元素, 返回索引(backendNodeId)、角色、描述文本"""
+    session = await get_cdp_session(page)
+
+    # 1.获取可见节点及所有frame
+    visible = await _get_visible_backend_node_ids(session)
+    frame_ids = await _get_frame_ids(session)
+
+    # 2.逐个frame读取无障碍树, 跨进程iframe读取失败时跳过
+    elements: list[dict[str, Any]] = []
+    seen: set[int] = set()
+    for frame_id in frame_ids:
+        try:
+            tree = await session.send(
+                "Accessibility.getFullAXTree", {"frameId": frame_id}
+            )
+        except Exception as e:
+            logger.debug(f"读取frame[{frame_id}]无障碍树失败: {str(e)}")
+            continue
+
+        for node in tree["nodes"]:
+            # 3.过滤被忽略、非可交互角色、不可见及重复的节点
+            backend_node_id = node.get("backendDOMNodeId")
+            role = _ax_value(node, "role")
+            if (
+                node.get("ignored")
+                or role not in INTERACTIVE_ROLES
+                or backend_node_id not in visible
+                or backend_node_id in seen
+            ):
+                continue
+            seen.add(backend_node_id)
+
+            # 4.使用可访问名称描述元素, 输入类元素附带当前值
+            name = " ".join(_ax_value(node, "name").split())
+            value = _ax_value(node, "value")
+            if value and role in ("textbox", "searchbox", "combobox", "spinbutton", "slider"):
+                text = f"[Label: {name}] {value}" if name else value
+            else:
+                text = name or value or "[No text]"
+            if len(text) > MAX_TEXT_LENGTH:
+                text = text[: MAX_TEXT_LENGTH - 3] + "..."
+            elements.append(
+                {
+                    "index": backend_node_id,
+                    "tag": role,
+                    "text": text,
+                    "backend_node_id": backend_node_id,
+                }
+            )
+    return elements
+
+
+async def _call_on_backend_node(
+    session: CDPSession, backend_node_id: int, function: str, *args: Any
+) -> Any:
+    """在backendNodeId对应的节点上执行js函数(this为该节点)并返回结果"""
+    node = await session.send("DOM.resolveNode", {"backendNodeId": backend_node_id})
+    object_id = node["object"]["objectId"]
+    try:
+        response = await session.send(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": function,
+                "arguments": [{"value": arg} for arg in args],
+                "returnByValue": True,
+                "awaitPromise": True,
+            },
+        )
+    finally:
+        await session.send("Runtime.releaseObject", {"objectId": object_id})
+    if "exceptionDetails" in response:
+        raise RuntimeError(response["exceptionDetails"].get("text", "执行js出错"))
+    return response["result"].get("value")
+
+
+async def click_backend_node(page: Page, backend_node_id: int) -> None:
+    """滚动到backendNodeId对应的节点并点击其中心位置"""
+    session = await get_cdp_session(page)
+
+    # 1.滚动到节点位置并获取节点在视口中的内容区域
+    await session.send("DOM.scrollIntoViewIfNeeded", {"backendNodeId": backend_node_id})
+    quads = (await session.send("DOM.getContentQuads", {"backendNodeId": backend_node_id}))[
+        "quads"
+    ]
+    if not quads:
+        raise RuntimeError("元素不可见, 无法点击")
+
+    # 2.点击第一个内容区域的中心
+    quad = quads[0]
+    x = sum(quad[0::2]) / 4
+    y = sum(quad[1::2]) / 4
+    await page.mouse.click(x, y)
+
+
+async def fill_backend_node(page: Page, backend_node_id: int, text: str) -> None:
+    """聚焦backendNodeId对应的输入框, 清空原有内容后输入文本"""
+    session = await get_cdp_session(page)
+    await session.send("DOM.scrollIntoViewIfNeeded", {"backendNodeId": backend_node_id})
+    await session.send("DOM.focus", {"backendNodeId": backend_node_id})
+    await _call_on_backend_node(
+        session,
+        backend_node_id,
+        """function() {
+            if ('value' in this) {
+                this.value = '';
+                this.dispatchEvent(new Event('input', {bubbles: true}));
+            } else if (this.isContentEditable) {
+                this.textContent = '';
+            }
+        }""",
+    )
+    await page.keyboard.type(text)
+
+
+async def select_backend_node_option(page: Page, backend_node_id: int, option: int) -> None:
+    """选择backendNodeId对应的下拉菜单中指定序号的选项"""
+    session = await get_cdp_session(page)
+    selected = await _call_on_backend_node(
+        session,
+        backend_node_id,
+        """function(option) {
+            if (!(this instanceof HTMLSelectElement) || option < 0 || option >= this.options.length) {
+                return false;
+            }
+            this.selectedIndex = option;
+            this.dispatchEvent(new Event('input', {bubbles: true}));
+            this.dispatchEvent(new Event('change', {bubbles: true}));
+            return true;
+        }""",
+        option,
+    )
+    if not selected:
+        raise RuntimeError(f"下拉菜单中不存在序号为{option}的选项")
@@ -1,27 +1,182 @@
 import asyncio
 import logging
+import uuid
+from collections import deque
+from typing import Any
 
-from markdownify import markdownify
 from playwright.async_api import (
     Browser,
+    BrowserContext,
+    ConsoleMessage,
     ElementHandle,
+    Error,
     Page,
     Playwright,
+    Request,
     async_playwright,
 )
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from app.domain.external.browser import Browser as BrowserProtocol
 from app.domain.external.llm import LLM
+from app.domain.external.screenshot_store import ScreenshotStore
 from app.domain.model.tool_result import ToolResult
+from app.infrastructure.external.browser.llm_content_extractor import (
+    EXTRACT_SYSTEM_PROMPT,
+    LLMContentExtractor,
+)
+from app.infrastructure.external.browser.playwright_accessibility import (
+    click_backend_node,
+    extract_accessibility_elements,
+    fill_backend_node,
+    select_backend_node_option,
+)
 from app.infrastructure.external.browser.playwright_browser_function import (
     GET_INTERACTIVE_ELEMENTS_FUNCTION,
+    GET_PAGE_SNAPSHOT_FUNCTION,
+    GET_PAGE_STATE_FUNCTION,
     GET_VISIBLE_CONTENT_FUNCTION,
-    INJECT_CONSOLE_LOGS_FUNCTION,
+    INSTALL_MUTATION_COUNTER_FUNCTION,
+    WAIT_FOR_DOM_SETTLE_FUNCTION,
+)
+from app.infrastructure.external.browser.playwright_browser_pool import (
+    PlaywrightBrowserPool,
 )
+from app.infrastructure.external.browser.playwright_resource_profile import (
+    ResourceProfile,
+    apply_resource_profile,
+)
+from app.infrastructure.external.browser.playwright_screenshot import (
+    ScreenshotPipeline,
+    screenshot_stats,
+)
+from app.infrastructure.executor import get_cpu_executor
+from app.infrastructure.html_parser import html_to_markdown, resolve_html_parser
+from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+class _NetworkTracker:
+    """页面网络请求跟踪器: 监听请求开始/结束事件, 记录进行中的请求数及最近一次网络活动时间"""
+
+    def __init__(self, page: Page) -> None:
+        """构造函数: 传递页面并注册请求事件监听"""
+        self.inflight: set[Request] = set()
+        self.last_activity = asyncio.get_running_loop().time()
+        self.changed = asyncio.Event()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _touch(self) -> None:
+        self.last_activity = asyncio.get_running_loop().time()
+        self.changed.set()
+
+    def _on_request(self, request: Request) -> None:
+        self.inflight.add(request)
+        self._touch()
+
+    def _on_request_done(self, request: Request) -> None:
+        self.inflight.discard(request)
+        self._touch()
+
+    async def wait_for_quiet(
+        self, quiet_seconds: float, max_inflight: int, timeout: float
+    ) -> bool:
+        """等待进行中的请求数不超过max_inflight并持续quiet_seconds, 超时返回False"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            # 1.计算距离满足静默时长还需要等待多久
+            now = loop.time()
+            if len(self.inflight) <= max_inflight:
+                remaining_quiet = self.last_activity + quiet_seconds - now
+                if remaining_quiet <= 0:
+                    return True
+            else:
+                remaining_quiet = deadline - now
+            if now >= deadline:
+                return False
+
+            # 2.等待下一次网络事件或静默时长到达, 两者都不会超过截止时间
+            self.changed.clear()
+            try:
+                await asyncio.wait_for(
+                    self.changed.wait(), min(remaining_quiet, deadline - now)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+
+class _ConsoleBuffer:
+    """页面控制台日志环形缓冲区: 监听console/pageerror事件, 只保留最近的N条日志"""
+
+    # 控制台消息类型对应的日志级别, 未列出的类型(log/info/dir/table等)按info处理
+    LEVELS = {"debug": 0, "info": 1, "warning": 2, "error": 3}
+    TYPE_LEVELS = {
+        "debug": "debug",
+        "trace": "debug",
+        "warning": "warning",
+        "error": "error",
+        "assert": "error",
+    }
+
+    def __init__(self, page: Page, max_size: int) -> None:
+        """构造函数: 传递页面及缓冲区大小并注册控制台事件监听"""
+        self.entries: deque[tuple[str, str]] = deque(maxlen=max_size)
+        self.dropped = 0  # 因缓冲区已满而丢弃的日志数
+        page.on("console", self._on_console)
+        page.on("pageerror", self._on_page_error)
+
+    def _append(self, level: str, text: str) -> None:
+        if len(self.entries) == self.entries.maxlen:
+            self.dropped += 1
+        self.entries.append((level, text))
+
+    def _on_console(self, message: ConsoleMessage) -> None:
+        self._append(self.TYPE_LEVELS.get(message.type, "info"), message.text)
+
+    def _on_page_error(self, error: Error) -> None:
+        self._append("error", f"Uncaught {error.name}: {error.message}")
+
+    def read(self, max_lines: int | None = None, level: str | None = None) -> list[str]:
+        """读取不低于level级别的最近max_lines条日志"""
+        min_level = self.LEVELS.get(level or "debug", 0)
+        logs = [
+            f"[{entry_level}] {text}"
+            for entry_level, text in self.entries
+            if self.LEVELS[entry_level] >= min_level
+        ]
+        return logs[-max_lines:] if max_lines is not None else logs
+
+
+class _ViewCacheStats:
+    """页面内容缓存命中统计"""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+# 进程内所有浏览器实例的页面内容缓存命中统计
+_view_cache_stats = _ViewCacheStats()
+
+
 class PlaywrightBrowser(BrowserProtocol):
     """基础Playwright管理的浏览器扩展"""
 
@@ -30,15 +185,45 @@ class PlaywrightBrowser(BrowserProtocol):
         cdp_url: str,  # CDP的连接地址
         llm: LLM
         | None = None,  # 可选参数，传递LLM，如果传递了则会使用LLM对页面内容进行整理变成markdown格式
+        pool: PlaywrightBrowserPool
+        | None = None,  # 可选参数，传递连接池后共享Playwright驱动与CDP连接，不再单独启动
+        session_id: str | None = None,  # 会话id，使用连接池时同一会话复用同一个浏览器上下文
+        resource_profile: str
+        | None = None,  # 可选参数，会话的资源拦截配置(full/no_media/text_only)，不传递则使用配置中的默认值
+        screenshot_store: ScreenshotStore
+        | None = None,  # 可选参数，截图存储，传递后截图上传到对象存储并只返回地址
     ) -> None:
         """构造函数: 完成Playwright浏览器初始化"""
-        # LLM相关
+        # 配置与LLM相关
+        self._settings = get_settings()
         self.llm: LLM | None = llm
 
+        # 页面内容缓存命中统计
+        self._view_cache_stats = _ViewCacheStats()
+
+        # 连接池相关
+        self.pool: PlaywrightBrowserPool | None = pool
+        self.session_id: str = session_id or str(uuid.uuid4())
+
+        # 资源拦截配置
+        self.resource_profile = ResourceProfile(
+            resource_profile or self._settings.browser_resource_profile
+        )
+
+        # 截图流水线
+        self._screenshot_pipeline = ScreenshotPipeline(
+            store=screenshot_store,
+            image_format=self._settings.browser_screenshot_format,
+            quality=self._settings.browser_screenshot_quality,
+            max_width=self._settings.browser_screenshot_max_width,
+            dedupe_distance=self._settings.browser_screenshot_dedupe_distance,
+        )
+
         # 浏览器相关
         self.cdp_url: str = cdp_url
         self.playwright: Playwright | None = None
         self.browser: Browser | None = None
+        self.context: BrowserContext | None = None
         self.page: Page | None = None
 
     async def _ensure_browser(self) -> None:
@@ -52,13 +237,16 @@ class PlaywrightBrowser(BrowserProtocol):
         # 1.先保证浏览器存在
         await self._ensure_browser()
 
-        # 2.如果页面不存在则创建新上下文+页面
+        # 2.如果页面不存在则创建新页面, 使用连接池时在会话独占的上下文中创建
         if not self.page:
-            self.page = await self.browser.new_page()
-            # 等同于self.browser.new_context().new_page()
+            if self.context:
+                self.page = await self.context.new_page()
+            else:
+                self.page = await self.browser.new_page()
+                # 等同于self.browser.new_context().new_page()
         else:
-            # 3.如果页面存在则提取所有上下文
-            contexts = self.browser.contexts
+            # 3.如果页面存在则提取当前使用的上下文, 未使用连接池时为默认上下文
+            contexts = [self.context] if self.context else self.browser.contexts
             if contexts:
                 # 4.获取默认上下文及页面
                 default_context = contexts[0]
@@ -73,27 +261,40 @@ class PlaywrightBrowser(BrowserProtocol):
                     if self.page != latest_page:
                         self.page = latest_page
 
-    async def _extract_content(self) -> str:
-        """提取当前页面内容"""
-        # 1.使用js代码获取当前页面可见元素内容
-        visible_content = await self.page.evaluate(GET_VISIBLE_CONTENT_FUNCTION)
+        # 8.开始采集页面的控制台日志
+        self._get_console_buffer(self.page)
 
-        # 2.使用markdownify这个库将html文档转换为markdown
-        markdown_content = markdownify(visible_content)
+    async def _extract_content(self, visible_content: str | None = None) -> str:
+        """提取当前页面内容, 传递了页面快照中的可见内容则不再单独执行js"""
+        # 1.使用js代码获取当前页面可见元素内容
+        if visible_content is None:
+            visible_content = await self.page.evaluate(GET_VISIBLE_CONTENT_FUNCTION)
+
+        # 2.使用markdownify这个库将html文档转换为markdown, 转换为CPU密集操作, 放到执行器中避免阻塞事件循环
+        markdown_content = await get_cpu_executor().run(
+            html_to_markdown,
+            visible_content,
+            resolve_html_parser(self._settings.html_parser),
+        )
 
         # 3.模型上下文长度有限，提取最大不超过50k个字符
         max_content_length = min(len(markdown_content), 50000)
 
         # 4.判断是否传递了llm，如果传递了，还可以使用llm对markdown_content进行整理
-        if self.llm:
-            # 5.调用llm对markdown_content内容进行二次整理
+        if self.llm and self._settings.browser_llm_extract_chunked:
+            # 5.分块模式: 短内容跳过LLM, 长内容按结构切分后并行提取再合并
+            return await LLMContentExtractor(
+                llm=self.llm,
+                min_chars=self._settings.browser_llm_extract_min_chars,
+                chunk_chars=self._settings.browser_llm_extract_chunk_chars,
+                max_chars=self._settings.browser_llm_extract_max_chars,
+                concurrency=self._settings.browser_llm_extract_concurrency,
+            ).extract(markdown_content)
+        elif self.llm:
+            # 6.调用llm对markdown_content内容进行一次性整理
             response = await self.llm.invoke(
                 [
-                    # TODO: system prompt
-                    {
-                        "role": "system",
-                        "content": "您是一名专业的网页信息提取助手。请从当前页面内容中提取所有信息并将其转换为markdown格式。",
-                    },
+                    {"role": "system", "content": EXTRACT_SYSTEM_PROMPT},
                     {
                         "role": "user",
                         "content": markdown_content[:max_content_length],
@@ -112,15 +313,23 @@ class PlaywrightBrowser(BrowserProtocol):
         # 2.清除当前页面上的缓存可交互元素列表
         self.page.interactive_elements_cache = []
 
-        # 3.执行js脚本获取可交互的元素列表
-        interactive_elements = await self.page.evaluate(
-            GET_INTERACTIVE_ELEMENTS_FUNCTION
-        )
+        # 3.执行js脚本(或读取CDP无障碍树)获取可交互的元素列表
+        if self._use_accessibility_extractor:
+            interactive_elements = await extract_accessibility_elements(self.page)
+        else:
+            interactive_elements = await self.page.evaluate(
+                GET_INTERACTIVE_ELEMENTS_FUNCTION
+            )
 
-        # 4.更新缓存的可交互元素列表
+        # 4.更新缓存的可交互元素列表并格式化为字符串
         self.page.interactive_elements_cache = interactive_elements
+        return self._format_interactive_elements(interactive_elements)
 
-        # 5.格式化可交互元素为字符串
+    @classmethod
+    def _format_interactive_elements(
+        cls, interactive_elements: list[dict[str, Any]]
+    ) -> list[str]:
+        """格式化可交互元素为字符串"""
         formatted_elements = []
         for element in interactive_elements:
             formatted_elements.append(
@@ -129,20 +338,124 @@ class PlaywrightBrowser(BrowserProtocol):
 
         return formatted_elements
 
-    async def _get_element_by_id(self, index: int) -> "ElementHandle" | None:
+    @classmethod
+    def _diff_interactive_elements(
+        cls, page: Page, full: bool = False
+    ) -> tuple[str, list[str] | dict[str, Any]]:
+        """对比页面当前的可交互元素与上一次返回给模型的元素, 返回结果中使用的键及内容
+
+        元素id在多次快照中保持稳定, 按id对比格式化后的文本得到新增/移除/变化的元素;
+        没有上一次的记录、要求完整列表或差异不比完整列表更小时返回完整列表
+        """
+        # 1.格式化当前元素并记录为最新返回给模型的元素
+        current = {
+            element["index"]: line
+            for element, line in zip(
+                page.interactive_elements_cache,
+                cls._format_interactive_elements(page.interactive_elements_cache),
+            )
+        }
+        previous: dict[int, str] | None = getattr(page, "sent_interactive_elements", None)
+        page.sent_interactive_elements = current
+        if full or previous is None:
+            return "interactive_elements", list(current.values())
+
+        # 2.按id计算新增、变化及移除的元素
+        added = [line for index, line in current.items() if index not in previous]
+        changed = [
+            line
+            for index, line in current.items()
+            if index in previous and previous[index] != line
+        ]
+        removed = [index for index in previous if index not in current]
+        if len(added) + len(changed) + len(removed) >= len(current):
+            return "interactive_elements", list(current.values())
+        return "interactive_elements_diff", {
+            "added": added,
+            "changed": changed,
+            "removed": removed,
+            "unchanged": len(current) - len(added) - len(changed),
+        }
+
+    async def _snapshot(self) -> tuple[str, list[str], list[Any]]:
+        """一次js调用获取页面快照, 返回可见内容html、格式化后的可交互元素列表及页面状态"""
+        # 1.执行快照脚本, 一次DOM遍历同时得到可见内容与可交互元素, 使用无障碍树提取元素时快照只提取可见内容
+        self.page.interactive_elements_cache = []
+        use_accessibility = self._use_accessibility_extractor
+        snapshot = await self.page.evaluate(
+            GET_PAGE_SNAPSHOT_FUNCTION, not use_accessibility
+        )
+
+        # 2.更新缓存的可交互元素列表
+        if use_accessibility:
+            interactive_elements = await extract_accessibility_elements(self.page)
+        else:
+            interactive_elements = snapshot["interactiveElements"]
+        self.page.interactive_elements_cache = interactive_elements
+        return (
+            snapshot["content"],
+            self._format_interactive_elements(interactive_elements),
+            snapshot["state"],
+        )
+
+    @classmethod
+    async def _ensure_mutation_counter(cls, page: Page) -> None:
+        """为页面安装DOM变化计数器: 之后创建的文档通过init_script安装, 当前文档立即安装一次"""
+        if getattr(page, "mutation_counter_installed", False):
+            return
+        await page.add_init_script(f"({INSTALL_MUTATION_COUNTER_FUNCTION})()")
+        await page.evaluate(INSTALL_MUTATION_COUNTER_FUNCTION)
+        page.mutation_counter_installed = True
+
+    @classmethod
+    def _is_cacheable_state(cls, state: list[Any]) -> bool:
+        """页面状态中包含文档id与变化计数时才可以作为缓存的键"""
+        return state[1] is not None and state[2] is not None
+
+    def view_cache_stats(self) -> dict[str, Any]:
+        """返回页面内容缓存的命中统计, 包含当前浏览器实例与进程内所有实例"""
+        return {
+            "browser": self._view_cache_stats.to_dict(),
+            "process": _view_cache_stats.to_dict(),
+        }
+
+    def _record_view_cache(self, hit: bool) -> None:
+        """记录一次页面内容缓存的命中/未命中"""
+        self._view_cache_stats.record(hit)
+        _view_cache_stats.record(hit)
+
+    @property
+    def _use_accessibility_extractor(self) -> bool:
+        """是否使用CDP无障碍树提取可交互元素"""
+        return self._settings.browser_element_extractor == "accessibility"
+
+    def _get_cached_element(self, index: int) -> dict[str, Any] | None:
+        """从当前页面的可交互元素缓存中查找索引/id对应的元素信息"""
+        for element in getattr(self.page, "interactive_elements_cache", None) or []:
+            if element["index"] == index:
+                return element
+        return None
+
+    async def _get_element_by_id(self, index: int) -> ElementHandle | None:
         """根据传递的索引/id获取对应的元素"""
         # 1.判断也当前页面是否存在可交互元素缓存
-        if (
-            not hasattr(self.page, "interactive_elements_cache")
-            or not self.page.interactive_elements_cache
-            or index >= len(self.page.interactive_elements_cache)
-        ):
+        if self._get_cached_element(index) is None:
             return None
 
         # 2.构建选择器
         selector = f'[data-manus-id="manus-element-{index}"]'
         return await self.page.query_selector(selector)
 
+    async def _initialize_from_pool(self) -> None:
+        """从连接池租用会话独占的上下文, 优先复用其中的空白页面"""
+        # 1.租用上下文, 浏览器连接由连接池共享
+        self.context = await self.pool.lease_context(self.cdp_url, self.session_id)
+        self.browser = self.context.browser
+
+        # 2.会话已有页面时继续使用最新页面, 预热的上下文中已经带有空白页面
+        pages = [page for page in self.context.pages if not page.is_closed()]
+        self.page = pages[-1] if pages else await self.context.new_page()
+
     async def initialize(self) -> bool:
         """初始化并确保资源是可用的"""
         # 1.定义重试次数+重试延迟确保资源存在
@@ -152,21 +465,26 @@ class PlaywrightBrowser(BrowserProtocol):
         # 2.循环开始资源构建
         for attempt in range(max_retries):
             try:
-                # 3.创建playwright上下文并连接到cdp浏览器
+                # 3.传递了连接池则直接租用上下文, 不再启动Playwright驱动
+                if self.pool:
+                    await self._initialize_from_pool()
+                    return True
+
+                # 4.创建playwright上下文并连接到cdp浏览器
                 self.playwright = await async_playwright().start()
                 self.browser = await self.playwright.chromium.connect_over_cdp(
                     self.cdp_url
                 )
 
-                # 4.获取浏览器的所有上下文
+                # 5.获取浏览器的所有上下文
                 contexts = self.browser.contexts
 
-                # 5.如果上下文存在，并且第一个上下文只有一个页面则执行如下逻辑
+                # 6.如果上下文存在，并且第一个上下文只有一个页面则执行如下逻辑
                 if contexts and len(contexts[0].pages) == 1:
-                    # 6.获取当前上下文的第一个页面
+                    # 7.获取当前上下文的第一个页面
                     page = contexts[0].pages[0]
 
-                    # 7.判断当前页面是不是空页面，如果是则直接使用page，否则新建一个
+                    # 8.判断当前页面是不是空页面，如果是则直接使用page，否则新建一个
                     if (
                         page.url == "about:blank"
                         or page.url == "chrome://newtab/"
@@ -175,10 +493,10 @@ class PlaywrightBrowser(BrowserProtocol):
                     ):
                         self.page = page
                     else:
-                        # 8.当前页面已经有数据则新建一个页面
+                        # 9.当前页面已经有数据则新建一个页面
                         self.page = await contexts[0].new_page()
                 else:
-                    # 9.上下文不存在或者页面不唯一则表示数据被污染，新建一个页面
+                    # 10.上下文不存在或者页面不唯一则表示数据被污染，新建一个页面
                     context = (
                         contexts[0] if contexts else await self.browser.new_context()
                     )
@@ -186,25 +504,32 @@ class PlaywrightBrowser(BrowserProtocol):
 
                 return True
             except Exception as e:
-                # 10.清除所有资源
+                # 11.清除所有资源
                 await self.cleanup()
 
-                # 11.判断重试次数是否等于最大重试次数
+                # 12.判断重试次数是否等于最大重试次数
                 if attempt == max_retries - 1:
                     logger.error(
                         f"初始化Playwright浏览器失败(已重试{max_retries}次): {str(e)}"
                     )
                     return False
 
-                # 12.使用指数级增长进行休眠，最大休眠时间为10s
+                # 13.使用指数级增长进行休眠，最大休眠时间为10s
                 retry_interval = min(retry_interval * 2, 10)
                 logger.warning(
                     f"初始化Playwright浏览器失败, 即将进行第{attempt + 1}次重试: {str(e)}"
                 )
                 await asyncio.sleep(retry_interval)
 
-    async def cleanup(self) -> None:
-        """清除Playwright资源, 包含浏览器+页面+Playwright"""
+    async def cleanup(self, recycle: bool = False) -> None:
+        """清除Playwright资源, 包含浏览器+页面+Playwright, 使用连接池时只归还上下文(recycle=True时关闭该上下文)"""
+        if self.pool:
+            self.pool.release_context(self.session_id, recycle=recycle)
+            self.page = None
+            self.context = None
+            self.browser = None
+            return
+
         try:
             # 1.检测浏览器是否存在，如果存在则删除该浏览器下的所有tabs页面
             if self.browser:
@@ -240,75 +565,199 @@ class PlaywrightBrowser(BrowserProtocol):
             self.browser = None
             self.playwright = None
 
+    def _get_console_buffer(self, page: Page) -> _ConsoleBuffer:
+        """获取页面的控制台日志缓冲区, 不存在则创建并挂载到页面上"""
+        buffer = getattr(page, "console_buffer", None)
+        if buffer is None:
+            buffer = _ConsoleBuffer(page, self._settings.browser_console_buffer_size)
+            page.console_buffer = buffer
+        return buffer
+
+    @classmethod
+    def _get_network_tracker(cls, page: Page) -> _NetworkTracker:
+        """获取页面的网络请求跟踪器, 不存在则创建并挂载到页面上"""
+        tracker = getattr(page, "network_tracker", None)
+        if tracker is None:
+            tracker = _NetworkTracker(page)
+            page.network_tracker = tracker
+        return tracker
+
     async def wait_for_page_load(self, timeout: int = 15) -> bool:
-        """传递超时时间，等待当前页面是否加载完毕"""
-        # 1.确保当前页面存在
+        """传递超时时间, 基于事件等待当前页面就绪: DOMContentLoaded -> load -> 网络空闲 -> DOM稳定, 每个阶段都有截止时间"""
+        # 1.确保当前页面存在并开始跟踪网络请求
         await self._ensure_page()
+        page = self.page
+        tracker = self._get_network_tracker(page)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
 
-        # 2.使用异步任务事件循环中的时间来作为开始时间(只和异步任务相关)
-        start_time = asyncio.get_event_loop().time()
-        check_interval = 5
+        def remaining(limit: float | None = None) -> float:
+            """返回距离总截止时间的剩余秒数, 传递limit时不超过该阶段的上限"""
+            left = max(deadline - loop.time(), 0)
+            return min(left, limit) if limit is not None else left
 
-        # 3.循环检测网页是否加载成功
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            # 4.使用js代码判断网页是否加载成功
-            is_completed = await self.page.evaluate(
-                """() => document.readyState === 'complete'"""
+        def remaining_ms(limit: float | None = None) -> float:
+            """返回Playwright使用的毫秒超时时间, 0在Playwright中表示不限时, 所以最少为1ms"""
+            return max(remaining(limit) * 1000, 1)
+
+        # 2.等待DOMContentLoaded, 超时则认为页面不可用
+        try:
+            await page.wait_for_load_state(
+                "domcontentloaded", timeout=remaining_ms()
             )
-            if is_completed:
-                return True
+        except PlaywrightTimeoutError:
+            return False
 
-            # 5.未加载成功则休眠对应时间
-            await asyncio.sleep(check_interval)
+        # 3.等待load事件, 图片/字体等资源迟迟不结束时不阻塞页面使用
+        try:
+            await page.wait_for_load_state(
+                "load",
+                timeout=remaining_ms(self._settings.browser_load_timeout_seconds),
+            )
+        except PlaywrightTimeoutError:
+            logger.info(f"等待页面load事件超时, 按DOMContentLoaded继续: {page.url}")
+
+        # 4.等待网络空闲: 进行中的请求数不超过阈值并持续静默窗口
+        await tracker.wait_for_quiet(
+            quiet_seconds=self._settings.browser_network_quiet_ms / 1000,
+            max_inflight=self._settings.browser_network_max_inflight,
+            timeout=remaining(self._settings.browser_network_quiet_timeout_seconds),
+        )
 
-        return False
+        # 5.等待DOM稳定(前端框架渲染完成), 页面跳转导致脚本上下文销毁时忽略
+        settle_timeout = remaining(self._settings.browser_dom_settle_timeout_seconds)
+        if settle_timeout > 0:
+            try:
+                await page.evaluate(
+                    WAIT_FOR_DOM_SETTLE_FUNCTION,
+                    [self._settings.browser_dom_settle_ms, int(settle_timeout * 1000)],
+                )
+            except Exception as e:
+                logger.info(f"等待页面DOM稳定失败: {str(e)}")
+
+        return True
 
-    async def navigate(self, url: str) -> ToolResult:
-        """根据传递的url跳转到指定页面"""
+    async def navigate(
+        self, url: str, resource_profile: str | None = None
+    ) -> ToolResult:
+        """根据传递的url跳转到指定页面, resource_profile用于覆盖本次导航的资源拦截配置"""
         # 1.确保页面存在
         await self._ensure_page()
+        context = self.page.context
 
         try:
-            # 2.在跳转之前先将可交互元素的缓存清空
+            # 2.在跳转之前先将可交互元素及页面内容的缓存清空, 并开始跟踪页面的网络请求
             self.page.interactive_elements_cache = []
+            self.page.view_cache = None
+            self._get_network_tracker(self.page)
+
+            # 3.应用本次导航的资源拦截配置
+            await apply_resource_profile(
+                context,
+                ResourceProfile(resource_profile or self.resource_profile),
+                self._settings.browser_blocked_domains,
+            )
 
-            # 3.使用goto进行跳转
+            # 4.使用goto进行跳转, 跳转后总是返回完整的可交互元素列表并记录为模型最新看到的元素
             await self.page.goto(url)
+            await self._extract_interactive_elements()
+            _, interactive_elements = self._diff_interactive_elements(
+                self.page, full=True
+            )
             return ToolResult(
                 success=True,
-                data={
-                    "interactive_elements": await self._extract_interactive_elements()
-                },
+                data={"interactive_elements": interactive_elements},
             )
         except Exception as e:
             # 返回错误的工具结果
             return ToolResult(
                 success=False, message=f"浏览器导航到[{url}]失败: {str(e)}"
             )
+        finally:
+            # 5.单次导航覆盖了配置时, 跳转结束后恢复会话的资源拦截配置
+            if resource_profile and resource_profile != self.resource_profile:
+                try:
+                    await apply_resource_profile(
+                        context,
+                        self.resource_profile,
+                        self._settings.browser_blocked_domains,
+                    )
+                except Exception as e:
+                    logger.warning(f"恢复浏览器资源拦截配置失败: {str(e)}")
 
-    async def view_page(self) -> ToolResult:
-        """获取当前网页的内容(内容+可交互元素列表)"""
-        # 1.确保页面存在
+    async def view_page(self, full_elements: bool | None = None) -> ToolResult:
+        """获取当前网页的内容(内容+可交互元素列表), 页面没有变化时直接返回缓存的结果
+
+        开启可交互元素差异模式时只返回相对上一次的新增/移除/变化的元素, full_elements=True时返回完整列表
+        """
+        # 1.确保页面存在并安装DOM变化计数器
         await self._ensure_page()
+        page = self.page
+        use_cache = self._settings.browser_view_cache_enabled
+        if use_cache:
+            try:
+                await self._ensure_mutation_counter(page)
+            except Exception as e:
+                logger.warning(f"安装DOM变化计数器失败, 本次不使用页面内容缓存: {str(e)}")
+                use_cache = False
+
+        # 2.页面状态(url、文档id、变化计数、滚动位置、视口)与缓存的键一致则直接返回
+        if use_cache:
+            state = await page.evaluate(GET_PAGE_STATE_FUNCTION)
+            view_cache = getattr(page, "view_cache", None)
+            if (
+                view_cache is not None
+                and self._is_cacheable_state(state)
+                and view_cache[0] == state
+            ):
+                self._record_view_cache(True)
+                page.interactive_elements_cache = view_cache[2]
+                return ToolResult(
+                    success=True,
+                    data=self._with_interactive_elements(
+                        page, view_cache[1], full_elements
+                    ),
+                )
 
-        # 2.等待页面加载完成
+        # 3.等待页面加载完成
         await self.wait_for_page_load()
 
-        # 3.更新页面的可交互元素
-        interactive_elements = await self._extract_interactive_elements()
+        # 4.一次获取页面快照, 同时更新页面的可交互元素
+        visible_content, interactive_elements, state = await self._snapshot()
+        data = {
+            "content": await self._extract_content(visible_content),
+            "interactive_elements": interactive_elements,
+        }
+
+        # 5.以快照时的页面状态为键缓存结果, 提取内容期间页面发生变化时下一次会因为键不一致而重新提取
+        if use_cache:
+            self._record_view_cache(False)
+            page.view_cache = (
+                (state, data, page.interactive_elements_cache)
+                if self._is_cacheable_state(state)
+                else None
+            )
 
-        # 4.返回工具结果
+        # 6.返回工具结果, 可交互元素按配置返回完整列表或差异
         return ToolResult(
             success=True,
-            data={
-                "content": await self._extract_content(),
-                "interactive_elements": interactive_elements,
-            },
+            data=self._with_interactive_elements(page, data, full_elements),
         )
 
+    def _with_interactive_elements(
+        self, page: Page, data: dict[str, Any], full_elements: bool | None
+    ) -> dict[str, Any]:
+        """将页面内容与可交互元素(完整列表或相对上一次返回的差异)组装为工具结果数据"""
+        key, interactive_elements = self._diff_interactive_elements(
+            page,
+            full=bool(full_elements)
+            or not self._settings.browser_interactive_elements_diff,
+        )
+        return {"content": data["content"], key: interactive_elements}
+
     async def restart(self, url: str) -> ToolResult:
-        """重启并跳转到指定URL"""
-        await self.cleanup()
+        """重启并跳转到指定URL, 使用连接池时换成新的上下文而不是重启Playwright驱动"""
+        await self.cleanup(recycle=True)
         return await self.navigate(url)
 
     async def scroll_up(self, to_top: bool | None = None) -> ToolResult:
@@ -338,43 +787,45 @@ class PlaywrightBrowser(BrowserProtocol):
         return ToolResult(success=True)
 
     async def screenshot(self, full_page: bool | None = None) -> bytes:
-        """传递full_page完成网页截图"""
+        """传递full_page完成网页截图, 按配置的格式、质量及最大宽度编码"""
         # 1.确保页面存在
         await self._ensure_page()
 
-        # 2.创建一个截图配置
-        screenshot_options = {"full_page": full_page, "type": "png"}
-
-        return await self.page.screenshot(**screenshot_options)
+        # 2.由浏览器缩放并编码后返回图片字节
+        return await self._screenshot_pipeline.encode(self.page, bool(full_page))
 
-    async def console_exec(self, javascript: str) -> ToolResult:
-        """传递js代码在当前页面控制台执行"""
+    async def screenshot_url(self, full_page: bool | None = None) -> str:
+        """截图并上传, 返回截图地址, 页面与上一次截图几乎相同时直接返回上一次的地址"""
         # 1.确保页面存在
         await self._ensure_page()
 
-        # 2.在正式开始执行代码之前先注入logs
-        try:
-            await self.page.evaluate(INJECT_CONSOLE_LOGS_FUNCTION)
-        except Exception as e:
-            logger.warning(f"注入window.console.logs失败: {str(e)}")
+        # 2.执行截图流水线(缩放编码 -> 去重 -> 上传)
+        result = await self._screenshot_pipeline.capture(self.page, bool(full_page))
+        return result.url
+
+    @classmethod
+    def screenshot_stats(cls) -> dict[str, Any]:
+        """返回进程内截图流水线的统计信息(截图/去重次数、平均大小、编码及上传耗时)"""
+        return screenshot_stats()
 
-        # 3.正式执行js脚本
+    async def console_exec(self, javascript: str) -> ToolResult:
+        """传递js代码在当前页面控制台执行, 控制台输出由页面的日志缓冲区采集, 不再向页面注入代码"""
+        # 1.确保页面存在(同时开始采集控制台日志)
+        await self._ensure_page()
+
+        # 2.正式执行js脚本
         result = await self.page.evaluate(javascript)
         return ToolResult(success=True, data={"result": result})
 
-    async def console_view(self, max_lines: int | None = None) -> ToolResult:
-        """根据传递的行数查看控制台的日志"""
+    async def console_view(
+        self, max_lines: int | None = None, level: str | None = None
+    ) -> ToolResult:
+        """根据传递的行数及最低日志级别查看控制台的日志, 直接读取本地缓冲区, 不需要与页面交互"""
         # 1.确保页面存在
         await self._ensure_page()
 
-        # 2.可以指定另外一段js代码查看控制台的内容
-        logs = await self.page.evaluate("""() => {
-            return window.console.logs || [];
-        }""")
-
-        if max_lines is not None:
-            logs = logs[-max_lines:]
-
+        # 2.读取页面控制台日志缓冲区
+        logs = self._get_console_buffer(self.page).read(max_lines, level)
         return ToolResult(success=True, data={"logs": logs})
 
     async def click(
@@ -392,7 +843,13 @@ class PlaywrightBrowser(BrowserProtocol):
             await self.page.mouse.click(coordinate_x, coordinate_y)
         elif index is not None:
             try:
-                # 3.根据index获取元素
+                # 3.无障碍树提取的元素直接通过backendNodeId滚动并点击
+                cached_element = self._get_cached_element(index)
+                if cached_element and cached_element.get("backend_node_id"):
+                    await click_backend_node(self.page, cached_element["backend_node_id"])
+                    return ToolResult(success=True)
+
+                # 4.根据index获取元素
                 element = await self._get_element_by_id(index)
                 if not element:
                     return ToolResult(
@@ -400,7 +857,7 @@ class PlaywrightBrowser(BrowserProtocol):
                     )
 
                 # FIXME: redundant element check
-                # 4.检查元素是否是可见的
+                # 5.检查元素是否是可见的
                 is_visible = await self.page.evaluate(
                     """(element) => {
                     if (!element) return false;
@@ -417,9 +874,9 @@ class PlaywrightBrowser(BrowserProtocol):
                     element,
                 )
 
-                # 5.如果元素不可见则执行以下代码
+                # 6.如果元素不可见则执行以下代码
                 if not is_visible:
-                    # 6.尝试将页面滚动到该元素的位置
+                    # 7.尝试将页面滚动到该元素的位置
                     await self.page.evaluate(
                         """(element) => {
                         if (element) {
@@ -430,7 +887,7 @@ class PlaywrightBrowser(BrowserProtocol):
                     )
                     await asyncio.sleep(1)
 
-                # 7.点击元素
+                # 8.点击元素
                 await element.click(timeout=5000)
             except Exception as e:
                 return ToolResult(success=False, message=f"点击元素出错: {str(e)}")
@@ -456,25 +913,32 @@ class PlaywrightBrowser(BrowserProtocol):
             await self.page.keyboard.type(text)
         elif index is not None:
             try:
-                # 4.根据索引查找元素
-                element = await self._get_element_by_id(index)
-                if not element:
-                    return ToolResult(
-                        success=False, message="输入文本失败, 该元素不存在"
+                # 4.无障碍树提取的元素直接通过backendNodeId聚焦、清空后输入
+                cached_element = self._get_cached_element(index)
+                if cached_element and cached_element.get("backend_node_id"):
+                    await fill_backend_node(
+                        self.page, cached_element["backend_node_id"], text
                     )
-
-                try:
-                    # 5.先清空原始输入框的内容然后再填充
-                    await element.fill("")
-                    await element.type(text)
-                except Exception:
-                    # 6.如果填充失败则尝试点击后输入文本，而不是直接清空
-                    await element.click()
-                    await element.type(text)
+                else:
+                    # 5.根据索引查找元素
+                    element = await self._get_element_by_id(index)
+                    if not element:
+                        return ToolResult(
+                            success=False, message="输入文本失败, 该元素不存在"
+                        )
+
+                    try:
+                        # 6.先清空原始输入框的内容然后再填充
+                        await element.fill("")
+                        await element.type(text)
+                    except Exception:
+                        # 7.如果填充失败则尝试点击后输入文本，而不是直接清空
+                        await element.click()
+                        await element.type(text)
             except Exception as e:
                 return ToolResult(success=False, message=f"输入文本失败: {str(e)}")
 
-        # 7.判断是否按Enter键
+        # 8.判断是否按Enter键
         if press_enter:
             await self.page.keyboard.press("Enter")
 
@@ -498,14 +962,22 @@ class PlaywrightBrowser(BrowserProtocol):
         await self._ensure_page()
 
         try:
-            # 2.获取元素信息
+            # 2.无障碍树提取的元素直接通过backendNodeId选择
+            cached_element = self._get_cached_element(index)
+            if cached_element and cached_element.get("backend_node_id"):
+                await select_backend_node_option(
+                    self.page, cached_element["backend_node_id"], option
+                )
+                return ToolResult(success=True)
+
+            # 3.获取元素信息
             element = await self._get_element_by_id(index)
             if not element:
                 return ToolResult(
                     success=False, message=f"使用索引[{index}]查找该下拉菜单元素不存在"
                 )
 
-            # 3.调用函数直接选择对应选项
+            # 4.调用函数直接选择对应选项
             await element.select_option(index=option)
             return ToolResult(success=True)
         except Exception as e:
@@ -0,0 +1,259 @@
+"""Playwright浏览器连接池的开发思路:
+1.原先每个PlaywrightBrowser实例都会启动一个新的Playwright驱动进程并执行connect_over_cdp, restart时全部销毁重建;
+2.连接池在进程内只启动一个Playwright驱动, 同一个cdp_url只保持一条CDP连接, 连接断开时懒加载重连;
+3.每个会话独占一个BrowserContext(cookie/存储相互隔离), 同一会话后续创建的PlaywrightBrowser继续复用该上下文;
+4.上下文被租用次数达到上限后回收(关闭并换成新的上下文), 避免长会话中页面/内存不断累积;
+5.每个cdp_url提前创建N个带空白页的上下文, 会话首次租用时直接取用, 取用后在后台补充;
+6.会话长时间没有租用上下文时由后台任务关闭其上下文;
+"""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Any
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class _SessionContext:
+    """会话独占的浏览器上下文及其租用信息"""
+
+    def __init__(self, cdp_url: str, context: BrowserContext) -> None:
+        self.cdp_url = cdp_url
+        self.context = context
+        self.uses = 0  # 被租用的次数
+        self.last_used = time.monotonic()  # 最近一次租用/归还时间
+
+
+class PlaywrightBrowserPool:
+    """Playwright浏览器连接池: 共享驱动与CDP连接, 按会话隔离上下文, 按次数回收, 提前预热"""
+
+    def __init__(self) -> None:
+        """构造函数: 完成配置获取及连接池状态初始化"""
+        self._settings = get_settings()
+        self._playwright: Playwright | None = None
+        self._browsers: dict[str, Browser] = {}
+        self._connect_locks: dict[str, asyncio.Lock] = {}
+        self._warm: dict[str, list[BrowserContext]] = {}
+        self._warm_tasks: dict[str, asyncio.Task] = {}
+        self._sessions: dict[str, _SessionContext] = {}
+        self._reaper: asyncio.Task | None = None
+        self._leases = 0  # 租用总次数
+        self._warm_hits = 0  # 直接使用预热上下文的次数
+        self._recycled = 0  # 因租用次数达到上限而回收的上下文数
+        self._reconnects = 0  # CDP连接建立次数
+
+    async def start(self) -> None:
+        """启动Playwright驱动及空闲上下文回收任务"""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+            logger.info("Playwright浏览器连接池启动成功")
+        if self._reaper is None:
+            self._reaper = asyncio.create_task(self._reap_loop(), name="browser-pool-reaper")
+
+    async def shutdown(self) -> None:
+        """关闭所有上下文、CDP连接并停止Playwright驱动"""
+        # 1.停止后台任务
+        if self._reaper is not None:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+        for task in self._warm_tasks.values():
+            task.cancel()
+        self._warm_tasks.clear()
+
+        # 2.关闭所有上下文及连接, 连接到外部浏览器时close只会断开连接, 不会关闭沙箱中的浏览器
+        contexts = [entry.context for entry in self._sessions.values()]
+        contexts.extend(context for warm in self._warm.values() for context in warm)
+        self._sessions.clear()
+        self._warm.clear()
+        await asyncio.gather(
+            *(self._close_context(context) for context in contexts),
+            return_exceptions=True,
+        )
+        for browser in self._browsers.values():
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.warning(f"断开浏览器CDP连接出错: {str(e)}")
+        self._browsers.clear()
+
+        # 3.停止Playwright驱动
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+            logger.info("成功关闭: Playwright浏览器连接池")
+
+        # 4.清除缓存
+        get_playwright_browser_pool.cache_clear()
+
+    async def get_browser(self, cdp_url: str) -> Browser:
+        """获取cdp_url对应的共享浏览器连接, 未连接或已断开时重新连接"""
+        browser = self._browsers.get(cdp_url)
+        if browser is not None and browser.is_connected():
+            return browser
+
+        lock = self._connect_locks.setdefault(cdp_url, asyncio.Lock())
+        async with lock:
+            # 1.双重检查, 避免并发时重复连接
+            browser = self._browsers.get(cdp_url)
+            if browser is not None and browser.is_connected():
+                return browser
+
+            # 2.连接断开后之前的上下文全部失效, 清理对应的会话及预热上下文
+            if browser is not None:
+                self._warm.pop(cdp_url, None)
+                for session_id, entry in list(self._sessions.items()):
+                    if entry.cdp_url == cdp_url:
+                        del self._sessions[session_id]
+
+            # 3.驱动未启动时先启动, 然后建立CDP连接
+            if self._playwright is None:
+                await self.start()
+            browser = await self._playwright.chromium.connect_over_cdp(cdp_url)
+            self._browsers[cdp_url] = browser
+            self._reconnects += 1
+            return browser
+
+    async def lease_context(self, cdp_url: str, session_id: str) -> BrowserContext:
+        """为会话租用独占的浏览器上下文: 复用会话已有的上下文, 达到租用上限时换成新的上下文"""
+        self._leases += 1
+
+        # 1.会话已有可用的上下文且未达到租用上限则直接复用
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            if (
+                entry.cdp_url == cdp_url
+                and entry.uses < self._settings.browser_pool_max_context_uses
+                and self._is_usable(entry.context)
+            ):
+                entry.uses += 1
+                entry.last_used = time.monotonic()
+                return entry.context
+
+            # 2.达到租用上限或已不可用则回收
+            del self._sessions[session_id]
+            if entry.uses >= self._settings.browser_pool_max_context_uses:
+                self._recycled += 1
+            asyncio.create_task(self._close_context(entry.context))
+
+        # 3.优先取用预热的上下文, 没有则新建
+        context = self._take_warm_context(cdp_url)
+        if context is None:
+            browser = await self.get_browser(cdp_url)
+            context = await browser.new_context()
+        else:
+            self._warm_hits += 1
+
+        # 4.新建期间同一会话已并发租用到上下文时, 关闭多余的上下文并复用已有的
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            asyncio.create_task(self._close_context(context))
+            entry.uses += 1
+            return entry.context
+        entry = _SessionContext(cdp_url, context)
+        entry.uses = 1
+        self._sessions[session_id] = entry
+
+        # 5.后台补充预热上下文
+        self.prewarm(cdp_url)
+        return context
+
+    def release_context(self, session_id: str, recycle: bool = False) -> None:
+        """归还会话的上下文, 上下文继续保留给该会话使用, recycle=True时关闭上下文"""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return
+        entry.last_used = time.monotonic()
+        if recycle:
+            del self._sessions[session_id]
+            asyncio.create_task(self._close_context(entry.context))
+
+    async def close_session(self, session_id: str) -> None:
+        """会话结束时关闭其独占的上下文"""
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            await self._close_context(entry.context)
+
+    def prewarm(self, cdp_url: str) -> None:
+        """在后台为cdp_url预热上下文, 同一cdp_url同一时间只会有一个预热任务"""
+        if self._settings.browser_pool_prewarm_contexts <= 0:
+            return
+        task = self._warm_tasks.get(cdp_url)
+        if task is None or task.done():
+            self._warm_tasks[cdp_url] = asyncio.create_task(self._replenish(cdp_url))
+
+    def stats(self) -> dict[str, Any]:
+        """返回连接池的统计信息"""
+        return {
+            "browsers": len(self._browsers),
+            "sessions": len(self._sessions),
+            "warm_contexts": {url: len(warm) for url, warm in self._warm.items()},
+            "leases": self._leases,
+            "warm_hits": self._warm_hits,
+            "recycled": self._recycled,
+            "reconnects": self._reconnects,
+        }
+
+    @classmethod
+    def _is_usable(cls, context: BrowserContext) -> bool:
+        """判断上下文对应的浏览器连接是否仍然可用"""
+        browser = context.browser
+        return browser is None or browser.is_connected()
+
+    def _take_warm_context(self, cdp_url: str) -> BrowserContext | None:
+        """从预热队列中取出一个可用的上下文"""
+        warm = self._warm.get(cdp_url, [])
+        while warm:
+            context = warm.pop(0)
+            if self._is_usable(context):
+                return context
+        return None
+
+    async def _replenish(self, cdp_url: str) -> None:
+        """创建带空白页的上下文直到预热数量达到目标"""
+        try:
+            warm = self._warm.setdefault(cdp_url, [])
+            while len(warm) < self._settings.browser_pool_prewarm_contexts:
+                browser = await self.get_browser(cdp_url)
+                context = await browser.new_context()
+                await context.new_page()
+                warm = self._warm.setdefault(cdp_url, [])
+                warm.append(context)
+        except Exception as e:
+            logger.warning(f"预热浏览器上下文失败[{cdp_url}]: {str(e)}")
+
+    @classmethod
+    async def _close_context(cls, context: BrowserContext) -> None:
+        """关闭上下文(包含其所有页面), 出错时只记录日志"""
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning(f"关闭浏览器上下文出错: {str(e)}")
+
+    async def _reap_loop(self) -> None:
+        """后台循环: 关闭长时间没有租用的会话上下文"""
+        while True:
+            await asyncio.sleep(self._settings.browser_pool_reap_interval_seconds)
+            try:
+                now = time.monotonic()
+                for session_id, entry in list(self._sessions.items()):
+                    if now - entry.last_used > self._settings.browser_pool_idle_seconds:
+                        del self._sessions[session_id]
+                        await self._close_context(entry.context)
+            except Exception as e:
+                logger.error(f"浏览器连接池回收空闲上下文出错: {str(e)}")
+
+
+@lru_cache()
+def get_playwright_browser_pool() -> PlaywrightBrowserPool:
+    """使用lru_cache实现单例模式 获取Playwright浏览器连接池"""
+    return PlaywrightBrowserPool()
@@ -0,0 +1,10 @@
+from playwright.async_api import CDPSession, Page
+
+
+async def get_cdp_session(page: Page) -> CDPSession:
+    """获取页面的CDP会话, 不存在则创建并挂载到页面上, 同一页面的截图、元素提取等共享同一个会话"""
+    session = getattr(page, "cdp_session", None)
+    if session is None:
+        session = await page.context.new_cdp_session(page)
+        page.cdp_session = session
+    return session
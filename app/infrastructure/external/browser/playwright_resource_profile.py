@@ -0,0 +1,85 @@
+"""浏览器资源拦截配置的开发思路:
+1.Agent主要消费页面文本与可交互元素, 图片/视频/字体/第三方统计脚本只会拖慢页面加载并浪费带宽;
+2.定义full/no_media/text_only三种配置, 通过context.route按资源类型拦截, 配置可以按会话设置也可以在单次导航时覆盖;
+3.样式表不拦截, 因为可见内容与可交互元素的提取依赖计算样式(display/visibility/尺寸);
+4.域名黑名单(统计/广告等)单独使用正则路由, 只有命中黑名单的请求才会进入Python处理, 不影响其他请求;
+5.full配置下不安装按类型拦截的路由, 避免每个请求都要经过驱动往返;
+"""
+
+import re
+from enum import Enum
+
+from playwright.async_api import BrowserContext, Route
+
+
+class ResourceProfile(str, Enum):
+    """浏览器资源拦截配置类型枚举"""
+
+    FULL = "full"  # 加载所有资源
+    NO_MEDIA = "no_media"  # 不加载图片/音视频
+    TEXT_ONLY = "text_only"  # 只加载文档、样式、脚本及接口请求
+
+
+# 每种配置需要拦截的资源类型(Playwright的request.resource_type)
+BLOCKED_RESOURCE_TYPES: dict[ResourceProfile, frozenset[str]] = {
+    ResourceProfile.FULL: frozenset(),
+    ResourceProfile.NO_MEDIA: frozenset({"image", "media"}),
+    ResourceProfile.TEXT_ONLY: frozenset(
+        {"image", "media", "font", "texttrack", "manifest", "ping", "eventsource"}
+    ),
+}
+
+
+def build_blocked_domains_pattern(blocked_domains: list[str]) -> re.Pattern | None:
+    """将域名黑名单编译为匹配请求url的正则, 子域名同样会被拦截"""
+    domains = [domain.strip().lower() for domain in blocked_domains if domain.strip()]
+    if not domains:
+        return None
+    hosts = "|".join(re.escape(domain) for domain in domains)
+    return re.compile(rf"^[a-z][a-z0-9+.-]*://([^/?#@]*\.)?({hosts})(:\d+)?([/?#]|$)", re.I)
+
+
+async def apply_resource_profile(
+    context: BrowserContext,
+    profile: ResourceProfile,
+    blocked_domains: list[str],
+) -> None:
+    """为浏览器上下文应用资源拦截配置, 可重复调用
+
+    生效的配置记录在上下文上, 连接池中的上下文会被同一会话后续的浏览器实例复用
+    """
+    # 1.域名黑名单路由每个上下文只安装一次, 只有命中黑名单的请求才会进入处理函数
+    if not getattr(context, "blocked_domains_routed", False):
+        context.blocked_domains_routed = True
+        pattern = build_blocked_domains_pattern(blocked_domains)
+        if pattern is not None:
+            await context.route(pattern, _abort_route)
+
+    # 2.记录当前生效的配置, 按资源类型拦截的处理函数在每个请求时读取
+    context.resource_profile = profile
+    handler = getattr(context, "resource_type_handler", None)
+    if handler is None:
+
+        async def handler(route: Route) -> None:
+            blocked_types = BLOCKED_RESOURCE_TYPES[context.resource_profile]
+            if route.request.resource_type in blocked_types:
+                await route.abort("blockedbyclient")
+            else:
+                await route.fallback()
+
+        context.resource_type_handler = handler
+        context.resource_type_routed = False
+
+    # 3.full配置下移除按资源类型拦截的路由, 其他配置下按需安装
+    routed = context.resource_type_routed
+    if profile != ResourceProfile.FULL and not routed:
+        await context.route("**/*", handler)
+        context.resource_type_routed = True
+    elif profile == ResourceProfile.FULL and routed:
+        await context.unroute("**/*", handler)
+        context.resource_type_routed = False
+
+
+async def _abort_route(route: Route) -> None:
+    """以客户端拦截的原因终止请求"""
+    await route.abort("blockedbyclient")
@@ -0,0 +1,278 @@
+"""浏览器截图流水线的开发思路:
+1.原先截图为全分辨率PNG, 原始字节会随工具事件经过Redis传递, 单个事件可达数MB;
+2.通过CDP的Page.captureScreenshot截图, 由浏览器进程按配置的最大宽度缩放并编码为jpeg/webp(可配置质量), 不占用事件循环;
+3.正式截图前先截取一张极小的PNG缩略图, 在工作线程中解码并计算差异哈希(dHash), 与该页面上一帧的哈希足够接近时直接复用上一帧的地址;
+4.截图的base64解码同样放到工作线程, 然后异步上传到对象存储, 事件中只携带地址;
+5.记录每次截图的编码耗时、上传耗时、图片大小及去重次数, 便于观察单个事件的负载;
+"""
+
+import asyncio
+import base64
+import logging
+import struct
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Any
+
+from playwright.async_api import CDPSession, Page
+
+from app.domain.external.screenshot_store import ScreenshotStore
+from app.infrastructure.external.browser.playwright_cdp import get_cdp_session
+
+logger = logging.getLogger(__name__)
+
+# 计算差异哈希时缩略图的宽度(CSS像素缩放后的输出宽度)
+THUMBNAIL_WIDTH = 64
+
+CONTENT_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+@dataclass
+class ScreenshotResult:
+    """单次截图的结果"""
+
+    url: str  # 截图的访问地址(未配置存储时为data url)
+    size: int  # 图片字节数, 复用上一帧时为0
+    encode_ms: float  # 浏览器截图并编码的耗时
+    upload_ms: float  # 上传耗时
+    deduplicated: bool  # 是否复用了上一帧
+
+
+class _ScreenshotStats:
+    """截图流水线统计: 截图次数、去重次数、图片大小、编码与上传耗时"""
+
+    def __init__(self) -> None:
+        self.captures = 0
+        self.deduplicated = 0
+        self.total_bytes = 0
+        self.total_encode_ms = 0.0
+        self.total_upload_ms = 0.0
+
+    def record(self, result: ScreenshotResult) -> None:
+        self.captures += 1
+        if result.deduplicated:
+            self.deduplicated += 1
+            return
+        self.total_bytes += result.size
+        self.total_encode_ms += result.encode_ms
+        self.total_upload_ms += result.upload_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        encoded = self.captures - self.deduplicated
+        return {
+            "captures": self.captures,
+            "deduplicated": self.deduplicated,
+            "avg_bytes": round(self.total_bytes / encoded) if encoded else 0,
+            "avg_encode_ms": round(self.total_encode_ms / encoded, 2) if encoded else 0.0,
+            "avg_upload_ms": round(self.total_upload_ms / encoded, 2) if encoded else 0.0,
+        }
+
+
+def decode_png_grayscale(data: bytes) -> tuple[int, int, list[int]]:
+    """解码8位非隔行扫描的PNG, 返回宽、高及灰度像素列表(缩略图很小, 纯Python解码即可)"""
+    # 1.校验签名并读取所有数据块
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("不是PNG图片")
+    offset = 8
+    width = height = color_type = 0
+    idat = bytearray()
+    while offset < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset : offset + 8])
+        chunk = data[offset + 8 : offset + 8 + length]
+        offset += 12 + length
+        if chunk_type == b"IHDR":
+            width, height, bit_depth, color_type, _, _, interlace = struct.unpack(
+                ">IIBBBBB", chunk
+            )
+            if bit_depth != 8 or interlace != 0:
+                raise ValueError("只支持8位非隔行扫描的PNG")
+        elif chunk_type == b"IDAT":
+            idat.extend(chunk)
+        elif chunk_type == b"IEND":
+            break
+
+    # 2.根据颜色类型确定每个像素的字节数(灰度/RGB/灰度+透明/RGBA)
+    channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color_type)
+    if channels is None:
+        raise ValueError(f"不支持的PNG颜色类型: {color_type}")
+    stride = width * channels
+
+    # 3.解压后逐行还原过滤器
+    raw = zlib.decompress(bytes(idat))
+    previous = bytearray(stride)
+    pixels: list[int] = []
+    for row in range(height):
+        start = row * (stride + 1)
+        filter_type = raw[start]
+        line = bytearray(raw[start + 1 : start + 1 + stride])
+        for i in range(stride):
+            left = line[i - channels] if i >= channels else 0
+            up = previous[i]
+            if filter_type == 1:
+                line[i] = (line[i] + left) & 0xFF
+            elif filter_type == 2:
+                line[i] = (line[i] + up) & 0xFF
+            elif filter_type == 3:
+                line[i] = (line[i] + ((left + up) >> 1)) & 0xFF
+            elif filter_type == 4:
+                up_left = previous[i - channels] if i >= channels else 0
+                p = left + up - up_left
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+                predictor = left if pa <= pb and pa <= pc else (up if pb <= pc else up_left)
+                line[i] = (line[i] + predictor) & 0xFF
+
+        # 4.转换为灰度值
+        for x in range(0, stride, channels):
+            if channels >= 3:
+                pixels.append((line[x] * 299 + line[x + 1] * 587 + line[x + 2] * 114) // 1000)
+            else:
+                pixels.append(line[x])
+        previous = line
+    return width, height, pixels
+
+
+def difference_hash(data: bytes) -> int:
+    """计算PNG图片的64位差异哈希: 缩放为9x8灰度图后比较水平相邻像素的亮度"""
+    width, height, pixels = decode_png_grayscale(data)
+    bits = 0
+    for y in range(8):
+        y0, y1 = y * height // 8, max((y + 1) * height // 8, y * height // 8 + 1)
+        row = []
+        for x in range(9):
+            x0, x1 = x * width // 9, max((x + 1) * width // 9, x * width // 9 + 1)
+            block = [pixels[j * width + i] for j in range(y0, y1) for i in range(x0, x1)]
+            row.append(sum(block) / len(block))
+        for x in range(8):
+            bits = (bits << 1) | (1 if row[x] > row[x + 1] else 0)
+    return bits
+
+
+class ScreenshotPipeline:
+    """截图流水线: 浏览器内缩放编码 -> 差异哈希去重 -> 异步上传"""
+
+    def __init__(
+        self,
+        store: ScreenshotStore | None,  # 截图存储, 不传递时返回data url
+        image_format: str = "jpeg",  # 编码格式: png/jpeg/webp
+        quality: int = 70,  # jpeg/webp的编码质量
+        max_width: int = 1024,  # 截图的最大宽度, 超出时按比例缩放
+        dedupe_distance: int = 4,  # 与上一帧哈希的汉明距离不超过该值时复用上一帧, 小于0时不去重
+    ) -> None:
+        if image_format not in CONTENT_TYPES:
+            raise ValueError(f"不支持的截图格式: {image_format}")
+        self.store = store
+        self.image_format = image_format
+        self.quality = quality
+        self.max_width = max_width
+        self.dedupe_distance = dedupe_distance
+
+    async def capture(self, page: Page, full_page: bool = False) -> ScreenshotResult:
+        """截取页面并上传, 页面与上一帧几乎相同时直接复用上一帧的地址"""
+        session = await get_cdp_session(page)
+
+        # 1.获取视口(或整页)的区域
+        clip = await self._get_clip(session, full_page)
+
+        # 2.截取缩略图并在工作线程中计算差异哈希, 与上一帧足够接近时复用上一帧
+        frame_hash = None
+        last_frame = getattr(page, "last_screenshot", None)
+        if self.dedupe_distance >= 0:
+            try:
+                thumbnail = await session.send(
+                    "Page.captureScreenshot",
+                    {
+                        "format": "png",
+                        "clip": {**clip, "scale": THUMBNAIL_WIDTH / clip["width"]},
+                        "captureBeyondViewport": full_page,
+                    },
+                )
+                frame_hash = await asyncio.to_thread(
+                    lambda: difference_hash(base64.b64decode(thumbnail["data"]))
+                )
+            except Exception as e:
+                logger.warning(f"计算截图差异哈希失败, 本次不去重: {str(e)}")
+            if (
+                frame_hash is not None
+                and last_frame is not None
+                and last_frame[0] == full_page
+                and bin(last_frame[1] ^ frame_hash).count("1") <= self.dedupe_distance
+            ):
+                result = ScreenshotResult(
+                    url=last_frame[2], size=0, encode_ms=0.0, upload_ms=0.0, deduplicated=True
+                )
+                _screenshot_stats.record(result)
+                return result
+
+        # 3.由浏览器按最大宽度缩放并编码, 在工作线程中解码base64
+        start = time.perf_counter()
+        data = await self._encode(session, clip, full_page)
+        encode_ms = (time.perf_counter() - start) * 1000
+
+        # 4.上传到对象存储, 未配置存储时使用data url
+        content_type = CONTENT_TYPES[self.image_format]
+        start = time.perf_counter()
+        if self.store is not None:
+            url = await self.store.put(
+                f"{uuid.uuid4().hex}.{self.image_format}", data, content_type
+            )
+        else:
+            url = f"data:{content_type};base64,{base64.b64encode(data).decode()}"
+        upload_ms = (time.perf_counter() - start) * 1000
+
+        # 5.记录上一帧并更新统计
+        if frame_hash is not None:
+            page.last_screenshot = (full_page, frame_hash, url)
+        result = ScreenshotResult(
+            url=url, size=len(data), encode_ms=encode_ms, upload_ms=upload_ms, deduplicated=False
+        )
+        _screenshot_stats.record(result)
+        logger.debug(
+            f"截图完成: {len(data)}字节, 编码{encode_ms:.1f}ms, 上传{upload_ms:.1f}ms"
+        )
+        return result
+
+    async def encode(self, page: Page, full_page: bool = False) -> bytes:
+        """按配置的格式、质量及最大宽度截图并返回图片字节, 不去重也不上传"""
+        session = await get_cdp_session(page)
+        clip = await self._get_clip(session, full_page)
+        return await self._encode(session, clip, full_page)
+
+    @classmethod
+    async def _get_clip(cls, session: CDPSession, full_page: bool) -> dict[str, float]:
+        """获取截图区域(文档坐标): 整页截图为整个文档, 否则为当前视口"""
+        metrics = await session.send("Page.getLayoutMetrics")
+        if full_page:
+            content = metrics["cssContentSize"]
+            return {"x": 0, "y": 0, "width": content["width"], "height": content["height"]}
+        viewport = metrics["cssVisualViewport"]
+        return {
+            "x": viewport["pageX"],
+            "y": viewport["pageY"],
+            "width": viewport["clientWidth"],
+            "height": viewport["clientHeight"],
+        }
+
+    async def _encode(
+        self, session: CDPSession, clip: dict[str, float], full_page: bool
+    ) -> bytes:
+        """由浏览器按最大宽度缩放并按配置的格式编码, base64解码放到工作线程"""
+        params: dict[str, Any] = {
+            "format": self.image_format,
+            "clip": {**clip, "scale": min(1.0, self.max_width / clip["width"])},
+            "captureBeyondViewport": full_page,
+        }
+        if self.image_format != "png":
+            params["quality"] = self.quality
+        response = await session.send("Page.captureScreenshot", params)
+        return await asyncio.to_thread(base64.b64decode, response["data"])
+
+
+def screenshot_stats() -> dict[str, Any]:
+    """返回截图流水线的统计信息"""
+    return _screenshot_stats.to_dict()
+
+
+# 进程内共享的截图统计
+_screenshot_stats = _ScreenshotStats()
@@ -1,10 +1,11 @@
 import logging
 
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.external.health_checker import HealthChecker
 from app.domain.model.health_status import HealthStatus
+from app.infrastructure.storage.postgres import Postgres, get_postgres
+from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +13,38 @@ logger = logging.getLogger(__name__)
 class PostgresHealthChecker(HealthChecker):
     """Postgres健康检查器: 用于检查Postgres数据库服务是否正常"""
 
-    def __init__(self, db_session: AsyncSession) -> None:
-        """构造函数: 传递数据库会话完成服务初始化"""
-        self._db_session = db_session
+    name = "postgres"
+
+    def __init__(self, postgres: Postgres | None = None) -> None:
+        """构造函数: 传递Postgres实例完成服务初始化, 不传递时每次检查获取当前的全局实例, 每次检查使用独立的短会话"""
+        self._postgres = postgres
+        self._saturation_threshold = get_settings().postgres_pool_saturation_threshold
+
+    def _check_pool_saturation(self, pool_stats: dict) -> str:
+        """检查连接池使用率, 超过阈值或有请求在排队时返回提示信息"""
+        if not pool_stats:
+            return ""
+        if pool_stats["saturation"] >= self._saturation_threshold or pool_stats["waiting"]:
+            return (
+                f"连接池接近饱和: 使用{pool_stats['in_use']}/{pool_stats['max_connections']}, "
+                f"排队{pool_stats['waiting']}"
+            )
+        return ""
 
     async def check(self) -> HealthStatus:
         """执行一段简单的sql: 用于判断数据库服务是否正常"""
         try:
-            await self._db_session.execute(text("SELECT 1"))
-            return HealthStatus(service="postgres", status="ok")
+            # 1.执行SQL成功后附带连接池统计信息, 连接池饱和时在详情中提示
+            postgres = self._postgres or get_postgres()
+            async with postgres.session_factory() as session:
+                await session.execute(text("SELECT 1"))
+            pool_stats = postgres.pool_stats()
+            return HealthStatus(
+                service="postgres",
+                status="ok",
+                details=self._check_pool_saturation(pool_stats),
+                metrics={"pool": pool_stats},
+            )
         except Exception as e:
             logger.error(f"Postgres健康检查失败: {str(e)}")
             return HealthStatus(
@@ -9,7 +9,8 @@ import logging
 
 from app.domain.external.health_checker import HealthChecker
 from app.domain.model.health_status import HealthStatus
-from app.infrastructure.storage.redis import RedisClient
+from app.infrastructure.storage.redis import RedisClient, get_redis
+from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -17,13 +18,36 @@ logger = logging.getLogger(__name__)
 class RedisHealthChecker(HealthChecker):
     """Redis健康检查器: 用于检查Redis服务是否正常"""
 
-    def __init__(self, redis_client: RedisClient) -> None:
+    name = "redis"
+
+    def __init__(self, redis_client: RedisClient | None = None) -> None:
+        """构造函数: 传递Redis客户端完成初始化, 不传递时每次检查获取当前的全局实例"""
         self._redis_client = redis_client
+        self._saturation_threshold = get_settings().redis_pool_saturation_threshold
+
+    def _check_pool_saturation(self, pool_stats: dict) -> str:
+        """检查连接池使用率, 超过阈值或有请求在排队时返回提示信息"""
+        warnings = []
+        for name, stats in pool_stats.items():
+            if stats["saturation"] >= self._saturation_threshold or stats["waiting"]:
+                warnings.append(
+                    f"{name}连接池接近饱和: 使用{stats['in_use']}/{stats['max_connections']}, "
+                    f"排队{stats['waiting']}"
+                )
+        return "; ".join(warnings)
 
     async def check(self) -> HealthStatus:
         try:
-            if await self._redis_client.client.ping():
-                return HealthStatus(service="redis", status="ok")
+            # 1.ping成功后附带连接池统计信息, 连接池饱和时在详情中提示
+            redis_client = self._redis_client or get_redis()
+            if await redis_client.client.ping():
+                pool_stats = redis_client.pool_stats()
+                return HealthStatus(
+                    service="redis",
+                    status="ok",
+                    details=self._check_pool_saturation(pool_stats),
+                    metrics={"pools": pool_stats},
+                )
             else:
                 return HealthStatus(
                     service="redis", status="error", details="Redis服务Ping失败"
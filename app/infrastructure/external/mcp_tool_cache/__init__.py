@@ -0,0 +1,3 @@
+from .redis_mcp_tool_cache import RedisMCPToolCache
+
+__all__ = ["RedisMCPToolCache"]
@@ -0,0 +1,44 @@
+import json
+import logging
+
+from mcp import Tool
+
+from app.domain.external.mcp_tool_cache import MCPToolCache
+from app.infrastructure.storage.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class RedisMCPToolCache(MCPToolCache):
+    """基于Redis的MCP工具列表缓存, 缓存读写失败时只记录日志, 不影响MCP连接"""
+
+    def __init__(self, ttl_seconds: int = 3600, prefix: str = "mcp:tools") -> None:
+        """构造函数: 传递缓存过期时间+键前缀完成初始化"""
+        self._ttl_seconds = ttl_seconds
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    async def get(self, key: str) -> list[Tool] | None:
+        try:
+            data = await get_redis().client.get(self._key(key))
+            if data is None:
+                return None
+            return [Tool.model_validate(tool) for tool in json.loads(data)]
+        except Exception as e:
+            logger.warning(f"读取MCP工具列表缓存失败: {str(e)}")
+            return None
+
+    async def set(self, key: str, tools: list[Tool]) -> None:
+        try:
+            data = json.dumps([tool.model_dump(mode="json") for tool in tools])
+            await get_redis().client.set(self._key(key), data, ex=self._ttl_seconds)
+        except Exception as e:
+            logger.warning(f"写入MCP工具列表缓存失败: {str(e)}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await get_redis().client.delete(self._key(key))
+        except Exception as e:
+            logger.warning(f"删除MCP工具列表缓存失败: {str(e)}")
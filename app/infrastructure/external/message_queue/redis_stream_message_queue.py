@@ -3,12 +3,38 @@ import logging
 import uuid
 from typing import Any
 
-from app.domain.external.message_queue import MessageQueue
+from app.domain.external.message_queue import MessageQueue, MessageSubscription
+from app.infrastructure.external.message_queue.redis_stream_multiplexer import (
+    get_redis_stream_multiplexer,
+)
 from app.infrastructure.storage.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
 
+class DirectStreamSubscription:
+    """直接执行阻塞XREAD的订阅, 在多路复用器未启动时使用(每次阻塞都会占用一个连接)"""
+
+    def __init__(self, message_queue: "RedisStreamMessageQueue", start_id: str) -> None:
+        """构造函数: 传递消息队列+开始id(不包含)完成订阅初始化"""
+        self._message_queue = message_queue
+        self.last_id = start_id
+
+    async def get(
+        self, count: int = 100, block_ms: int | None = None
+    ) -> list[tuple[str, Any]]:
+        messages = await self._message_queue._read(self.last_id, count, block_ms or 0)
+        if messages:
+            self.last_id = messages[-1][0]
+        return messages
+
+    async def __aenter__(self) -> "DirectStreamSubscription":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        return None
+
+
 class RedisStreamMessageQueue(MessageQueue):
     """基于RedisStream的消息队列"""
 
@@ -73,39 +99,69 @@ class RedisStreamMessageQueue(MessageQueue):
 
         return await self._redis.client.xadd(self._stream_name, {"data": message})
 
+    async def _read(
+        self, start_id: str, count: int, block_ms: int | None
+    ) -> list[tuple[str, Any]]:
+        """使用一次XREAD批量读取start_id(不包含)之后的消息, block为None时不阻塞"""
+        # 1.从redis流中读取数据, 阻塞读取使用独立的连接池
+        client = self._redis.client if block_ms is None else self._redis.blocking_client
+        messages = await client.xread(
+            {self._stream_name: start_id},
+            count=count,
+            block=block_ms,
+        )
+
+        # 2.检查messages是否存在
+        if not messages or not messages[0][1]:
+            return []
+
+        # 3.提取每条消息的id和数据
+        return [
+            (message_id, message_data.get("data"))
+            for message_id, message_data in messages[0][1]
+        ]
+
     async def get(
         self, start_id: str | None = None, block_ms: int | None = None
     ) -> tuple[str, Any]:
         logger.debug(f"从消息队列[{self._stream_name}]中获取一条消息: {start_id}")
 
-        # 1.判断start_id是否为None
-        if start_id is None:
-            start_id = "0"
-
-        # 2.从redis流中获取一条数据
-        messages = await self._redis.client.xread(
-            {self._stream_name: start_id},
-            count=1,
-            block=block_ms if block_ms is not None else 0,
+        # 1.获取一条数据, 阻塞读取时会经过多路复用器而不是独占一个连接
+        messages = await self.get_batch(
+            start_id, count=1, block_ms=block_ms if block_ms is not None else 0
         )
 
-        # 3.检查messages是否存在
+        # 2.检查messages是否存在
         if not messages:
             return None, None
 
-        # 4.从消息列表中取出对应的消息数据
-        stream_messages = messages[0][1]
-        if not stream_messages:
-            return None, None
+        return messages[0]
 
-        # 5.提取id和数据
-        message_id, message_data = stream_messages[0]
+    async def get_batch(
+        self, start_id: str | None = None, count: int = 100, block_ms: int | None = None
+    ) -> list[tuple[str, Any]]:
+        logger.debug(f"从消息队列[{self._stream_name}]中批量获取消息: {start_id}")
 
-        try:
-            return message_id, message_data.get("data")
-        except Exception as e:
-            logger.error(f"从消息队列[{self._stream_name}]获取数据失败: {str(e)}")
-            return None, None
+        # 1.判断start_id是否为None
+        if start_id is None:
+            start_id = "0"
+
+        # 2.阻塞读取并且多路复用器已启动, 则通过多路复用器等待新消息
+        if block_ms is not None and get_redis_stream_multiplexer().running:
+            async with self.subscribe(start_id) as subscription:
+                return await subscription.get(count=count, block_ms=block_ms)
+
+        # 3.否则直接使用XREAD读取
+        return await self._read(start_id, count, block_ms)
+
+    def subscribe(self, start_id: str | None = None) -> MessageSubscription:
+        # 1.多路复用器已启动则共享其阻塞读取循环
+        multiplexer = get_redis_stream_multiplexer()
+        if multiplexer.running:
+            return multiplexer.subscribe(self._stream_name, start_id)
+
+        # 2.否则退化为每个订阅者直接阻塞读取
+        return DirectStreamSubscription(self, start_id or "0")
 
     async def pop(self) -> tuple[str, Any]:
         # 1.记录日志
@@ -0,0 +1,347 @@
+"""RedisStream多路复用器的设计思路:
+1.每个订阅者各自执行阻塞XREAD时, 阻塞期间会一直占用一个连接池连接, 1k订阅者就需要1k个连接;
+2.多路复用器在进程内只运行少量(readers个)阻塞XREAD循环, 每个循环负责一部分流(按键哈希分片),
+  一次XREAD同时监听该分片下的所有流, 读取到的消息再分发给本地的asyncio订阅者;
+3.每个订阅者持有一个有界缓冲区, 慢订阅者缓冲区满了之后不会阻塞其他订阅者,
+  而是标记为溢出, 等它消费完缓冲区后再使用XRANGE从自己的位置回填, 保证消息不丢失;
+4.订阅时先登记实时分发(期间的实时消息暂存), 再用XRANGE回填历史, 最后按id去重合并, 避免遗漏和重复;
+5.阻塞中的XREAD无法感知新加入的流, 所以每个读取循环额外监听一个唤醒流, 新增监听键时写入一条唤醒消息;
+6.最后一个订阅者退出后, 监听键会保留一段时间再移除, 避免短连接反复订阅导致频繁唤醒;
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+import zlib
+from collections import deque
+from functools import lru_cache
+from typing import Any
+
+from app.infrastructure.storage.redis import get_redis
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def parse_stream_id(stream_id: str) -> tuple[int, int]:
+    """将Redis Stream的消息id(毫秒时间戳-序号)解析为可比较的元组"""
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class RedisStreamSubscription:
+    """RedisStream订阅: 在本地有界缓冲区中接收多路复用器分发的消息"""
+
+    def __init__(
+        self,
+        multiplexer: "RedisStreamMultiplexer",
+        stream_name: str,
+        start_id: str,
+        max_buffer: int,
+    ) -> None:
+        """构造函数: 传递多路复用器+流名字+开始id(不包含)+缓冲区大小完成订阅初始化"""
+        self.stream_name = stream_name
+        self.last_id = start_id  # 最后一条被消费的消息id
+        self._multiplexer = multiplexer
+        self._max_buffer = max_buffer
+        self._buffer: deque[tuple[str, Any]] = deque()
+        self._ready = asyncio.Event()
+        self._enqueued_key = parse_stream_id(start_id)  # 最后一条进入缓冲区的消息id
+        self._pending: list[tuple[str, Any]] | None = None  # 回填期间暂存的实时消息
+        self._needs_backfill = True  # 新订阅或溢出后需要使用XRANGE回填
+
+        # 延迟统计信息
+        self.delivered = 0  # 已投递给消费者的消息条数
+        self.overflows = 0  # 缓冲区溢出次数
+
+    @property
+    def lag(self) -> int:
+        """只读属性: 已进入缓冲区但还未被消费的消息条数"""
+        return len(self._buffer)
+
+    @property
+    def lag_ms(self) -> int:
+        """只读属性: 缓冲区中最早一条消息距今的毫秒数, 用于识别慢订阅者"""
+        if not self._buffer:
+            return 0
+        return max(0, int(time.time() * 1000) - parse_stream_id(self._buffer[0][0])[0])
+
+    def _offer(self, message_id: str, data: Any) -> None:
+        """多路复用器调用: 将实时消息放入缓冲区, 缓冲区已满时标记溢出而不是阻塞"""
+        # 1.回填期间先暂存实时消息, 回填结束后再合并, 暂存区已满同样标记溢出
+        if self._pending is not None:
+            if len(self._pending) < self._max_buffer:
+                self._pending.append((message_id, data))
+            elif not self._needs_backfill:
+                self._needs_backfill = True
+                self.overflows += 1
+                logger.warning(
+                    f"订阅者消费过慢, 流[{self.stream_name}]缓冲区已满, 将在消费后回填"
+                )
+            return
+
+        # 2.已溢出的订阅者不再接收实时消息, 等待回填
+        if self._needs_backfill:
+            return
+
+        # 3.按消息id去重, 避免回填与实时分发重复投递
+        key = parse_stream_id(message_id)
+        if key <= self._enqueued_key:
+            return
+
+        # 4.缓冲区已满则标记溢出, 慢订阅者不会影响其他订阅者
+        if len(self._buffer) >= self._max_buffer:
+            self._needs_backfill = True
+            self.overflows += 1
+            logger.warning(
+                f"订阅者消费过慢, 流[{self.stream_name}]缓冲区已满, 将在消费后回填"
+            )
+            return
+
+        self._buffer.append((message_id, data))
+        self._enqueued_key = key
+        self._ready.set()
+
+    def _fill(self, messages: list[tuple[str, Any]]) -> None:
+        """将回填的消息写入缓冲区, 并合并回填期间暂存的实时消息"""
+        pending = self._pending or []
+        self._pending = None
+        for message_id, data in [*messages, *pending]:
+            key = parse_stream_id(message_id)
+            if key <= self._enqueued_key:
+                continue
+            self._buffer.append((message_id, data))
+            self._enqueued_key = key
+        if self._buffer:
+            self._ready.set()
+
+    async def get(
+        self, count: int = 100, block_ms: int | None = None
+    ) -> list[tuple[str, Any]]:
+        """获取最多count条消息, 没有消息时阻塞block_ms毫秒(0或None表示一直等待), 超时返回空列表"""
+        # 1.缓冲区为空且需要回填时, 先从Redis回填当前位置之后的消息
+        if not self._buffer and self._needs_backfill:
+            await self._multiplexer._backfill(self)
+
+        # 2.缓冲区仍为空则等待多路复用器分发新消息
+        if not self._buffer:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(
+                    self._ready.wait(), timeout=block_ms / 1000 if block_ms else None
+                )
+            except TimeoutError:
+                return []
+
+        # 3.一次性取出缓冲区中的多条消息
+        batch = []
+        while self._buffer and len(batch) < count:
+            batch.append(self._buffer.popleft())
+        if batch:
+            self.last_id = batch[-1][0]
+            self.delivered += len(batch)
+        return batch
+
+    async def __aenter__(self) -> "RedisStreamSubscription":
+        await self._multiplexer._register(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        self._multiplexer._unregister(self)
+
+
+class RedisStreamMultiplexer:
+    """RedisStream多路复用器: 使用少量阻塞XREAD循环为进程内所有订阅者读取消息"""
+
+    def __init__(self) -> None:
+        """构造函数: 完成多路复用器的配置读取与状态初始化"""
+        self._settings = get_settings()
+        self._redis = get_redis()
+        self._readers = max(1, self._settings.redis_stream_mux_readers)
+        self._block_ms = self._settings.redis_stream_mux_block_ms
+        self._batch_size = self._settings.redis_stream_mux_batch_size
+        self._max_buffer = self._settings.redis_stream_mux_buffer_size
+        self._linger_seconds = self._settings.redis_stream_mux_linger_seconds
+
+        # 每个读取循环的唤醒流, 用于打断阻塞中的XREAD
+        instance_id = uuid.uuid4().hex
+        self._wake_keys = [f"mux:wake:{instance_id}:{i}" for i in range(self._readers)]
+        self._wake_cursors = ["0-0"] * self._readers
+
+        self._cursors: dict[str, str] = {}  # 每个监听流已读取到的位置
+        self._subscribers: dict[str, set[RedisStreamSubscription]] = {}
+        self._idle_since: dict[str, float] = {}  # 无订阅者的流开始空闲的时间
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        """只读属性: 多路复用器是否正在运行"""
+        return bool(self._tasks)
+
+    def subscribe(
+        self, stream_name: str, start_id: str | None = None
+    ) -> RedisStreamSubscription:
+        """订阅指定流start_id(不包含)之后的消息, 需要配合async with使用"""
+        return RedisStreamSubscription(
+            self, stream_name, start_id or "0", self._max_buffer
+        )
+
+    def _shard(self, stream_name: str) -> int:
+        """根据流名字计算其所属的读取循环"""
+        return zlib.crc32(stream_name.encode()) % self._readers
+
+    async def _register(self, subscription: RedisStreamSubscription) -> None:
+        """登记订阅者, 如果流还未被监听则记录当前位置并唤醒对应读取循环, 登记失败时移除订阅者"""
+        stream_name = subscription.stream_name
+        subscription._pending = []
+        self._subscribers.setdefault(stream_name, set()).add(subscription)
+        self._idle_since.pop(stream_name, None)
+
+        try:
+            # 1.流第一次被监听时, 以当前最后一条消息的id作为读取游标
+            if stream_name not in self._cursors:
+                latest = await self._redis.client.xrevrange(stream_name, count=1)
+                self._cursors.setdefault(stream_name, latest[0][0] if latest else "0-0")
+                await self._redis.client.xadd(
+                    self._wake_keys[self._shard(stream_name)],
+                    {"stream": stream_name},
+                    maxlen=16,
+                )
+
+            # 2.回填订阅位置之后的历史消息
+            await self._backfill(subscription)
+        except BaseException:
+            # 3.__aenter__失败时不会执行__aexit__, 需要在这里移除订阅者
+            self._unregister(subscription)
+            raise
+
+    def _unregister(self, subscription: RedisStreamSubscription) -> None:
+        """移除订阅者, 流没有订阅者后开始计算空闲时间"""
+        subscribers = self._subscribers.get(subscription.stream_name)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            self._idle_since[subscription.stream_name] = time.monotonic()
+
+    async def _backfill(self, subscription: RedisStreamSubscription) -> None:
+        """使用XRANGE回填订阅者缓冲区, 单次最多回填一个缓冲区大小的消息"""
+        # 1.回填期间暂存实时消息
+        if subscription._pending is None:
+            subscription._pending = []
+        subscription._needs_backfill = False
+        last_id = "{}-{}".format(*subscription._enqueued_key)
+
+        try:
+            # 2.读取位置之后的消息
+            entries = await self._redis.client.xrange(
+                subscription.stream_name, min=f"({last_id}", count=self._max_buffer
+            )
+        except Exception:
+            subscription._pending = None
+            subscription._needs_backfill = True
+            raise
+
+        # 3.回填条数达到上限说明还有未读消息, 丢弃暂存消息并在下次消费后继续回填
+        messages = [(message_id, fields.get("data")) for message_id, fields in entries]
+        if len(messages) >= self._max_buffer:
+            subscription._pending = None
+            subscription._needs_backfill = True
+        subscription._fill(messages)
+
+    def _evict_idle_streams(self) -> None:
+        """移除空闲时间超过linger_seconds的监听流"""
+        now = time.monotonic()
+        for stream_name, idle_since in list(self._idle_since.items()):
+            if now - idle_since >= self._linger_seconds:
+                self._idle_since.pop(stream_name, None)
+                self._subscribers.pop(stream_name, None)
+                self._cursors.pop(stream_name, None)
+
+    async def _read_loop(self, index: int) -> None:
+        """单个读取循环: 阻塞读取所属分片的所有流并分发给订阅者"""
+        wake_key = self._wake_keys[index]
+        while True:
+            # 1.组装当前分片所有监听流的游标, 同时监听唤醒流
+            streams = {
+                stream_name: cursor
+                for stream_name, cursor in self._cursors.items()
+                if self._shard(stream_name) == index
+            }
+            streams[wake_key] = self._wake_cursors[index]
+
+            try:
+                # 2.一次阻塞XREAD读取分片下所有流的新消息
+                results = await self._redis.blocking_client.xread(
+                    streams, count=self._batch_size, block=self._block_ms
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"多路复用器读取循环[{index}]读取失败: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+
+            # 3.分发消息到对应流的所有订阅者
+            for stream_name, entries in results or []:
+                if not entries:
+                    continue
+                if stream_name == wake_key:
+                    self._wake_cursors[index] = entries[-1][0]
+                    continue
+                if stream_name not in self._cursors:
+                    continue
+                self._cursors[stream_name] = entries[-1][0]
+                subscribers = list(self._subscribers.get(stream_name, ()))
+                for message_id, fields in entries:
+                    data = fields.get("data")
+                    for subscription in subscribers:
+                        subscription._offer(message_id, data)
+
+            # 4.清理空闲的监听流
+            self._evict_idle_streams()
+
+    async def start(self) -> None:
+        """启动所有读取循环"""
+        if self.running:
+            logger.warning("RedisStream多路复用器已启动 无需重复操作")
+            return
+        self._tasks = [
+            asyncio.create_task(self._read_loop(i)) for i in range(self._readers)
+        ]
+        logger.info(f"RedisStream多路复用器启动成功, 读取循环数: {self._readers}")
+
+    async def shutdown(self) -> None:
+        """停止所有读取循环并清理唤醒流"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        try:
+            await self._redis.client.delete(*self._wake_keys)
+        except Exception as e:
+            logger.warning(f"清理多路复用器唤醒流失败: {str(e)}")
+        logger.info("RedisStream多路复用器成功关闭")
+
+        # 清除缓存
+        get_redis_stream_multiplexer.cache_clear()
+
+    def stats(self) -> dict[str, Any]:
+        """返回多路复用器的统计信息, 包含监听流数量、订阅者数量以及订阅者延迟"""
+        subscriptions = [s for subs in self._subscribers.values() for s in subs]
+        return {
+            "readers": self._readers,
+            "streams": len(self._cursors),
+            "subscribers": len(subscriptions),
+            "max_lag": max((s.lag for s in subscriptions), default=0),
+            "max_lag_ms": max((s.lag_ms for s in subscriptions), default=0),
+            "overflows": sum(s.overflows for s in subscriptions),
+        }
+
+
+@lru_cache()
+def get_redis_stream_multiplexer() -> RedisStreamMultiplexer:
+    """使用lru_cache实现单例模式 获取RedisStream多路复用器"""
+    return RedisStreamMultiplexer()
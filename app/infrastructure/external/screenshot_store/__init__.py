@@ -0,0 +1,3 @@
+from .cos_screenshot_store import CosScreenshotStore
+
+__all__ = ["CosScreenshotStore"]
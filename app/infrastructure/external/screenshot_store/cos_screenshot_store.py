@@ -0,0 +1,25 @@
+import asyncio
+
+from app.domain.external.screenshot_store import ScreenshotStore
+from app.infrastructure.storage.cos import get_cos
+from core.config import get_settings
+
+
+class CosScreenshotStore(ScreenshotStore):
+    """基于腾讯云Cos的截图存储, SDK为同步调用, 统一放到线程中执行避免阻塞事件循环"""
+
+    def __init__(self, prefix: str = "screenshots") -> None:
+        """构造函数: 传递对象键前缀完成初始化, 过期清理交给存储桶的生命周期规则"""
+        self._settings = get_settings()
+        self._prefix = prefix.strip("/")
+
+    async def put(self, key: str, data: bytes, content_type: str) -> str:
+        object_key = f"{self._prefix}/{key}"
+        await asyncio.to_thread(
+            get_cos().client.put_object,
+            Bucket=self._settings.cos_bucket,
+            Body=data,
+            Key=object_key,
+            ContentType=content_type,
+        )
+        return f"{self._settings.cos_scheme}://{self._settings.cos_domain}/{object_key}"
@@ -24,10 +24,9 @@ class RedisStreamTask(Task):
         self._execution_task: asyncio.Task | None = None  # 定义在后台执行的任务
 
         input_stream_name = f"task:input:{self._id}"
-        output_stream_name = f"task:output:{self._id}"
 
         self._input_stream = RedisStreamMessageQueue(input_stream_name)
-        self._output_stream = RedisStreamMessageQueue(output_stream_name)
+        self._output_stream = RedisStreamTask.get_output_stream(self._id)
 
         # 将当前类实例注册到全局变量中
         RedisStreamTask._task_registry[self._id] = self
@@ -98,9 +97,13 @@ class RedisStreamTask(Task):
         return self._execution_task.done()
 
     @classmethod
-    def get(cls, task_id: str) -> "Task" | None:
+    def get(cls, task_id: str) -> "Task | None":
         return RedisStreamTask._task_registry.get(task_id)
 
+    @classmethod
+    def get_output_stream(cls, task_id: str) -> MessageQueue:
+        return RedisStreamMessageQueue(f"task:output:{task_id}")
+
     @classmethod
     def create(cls, task_runner: TaskRunner) -> "Task":
         return cls(task_runner)
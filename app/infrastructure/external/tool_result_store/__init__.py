@@ -0,0 +1,3 @@
+from .cos_tool_result_store import CosToolResultStore
+
+__all__ = ["CosToolResultStore"]
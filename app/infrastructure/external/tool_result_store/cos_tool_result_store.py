@@ -0,0 +1,44 @@
+import asyncio
+import logging
+
+from app.domain.external.tool_result_store import ToolResultStore
+from app.infrastructure.storage.cos import get_cos
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class CosToolResultStore(ToolResultStore):
+    """基于腾讯云Cos的工具结果存储, SDK为同步调用, 统一放到线程中执行避免阻塞事件循环"""
+
+    def __init__(self, prefix: str = "tool-results") -> None:
+        """构造函数: 传递对象键前缀完成初始化, 过期清理交给存储桶的生命周期规则"""
+        self._settings = get_settings()
+        self._prefix = prefix.strip("/")
+
+    def _key(self, handle: str) -> str:
+        return f"{self._prefix}/{handle}.txt"
+
+    async def put(self, handle: str, content: str) -> None:
+        await asyncio.to_thread(
+            get_cos().client.put_object,
+            Bucket=self._settings.cos_bucket,
+            Body=content.encode("utf-8"),
+            Key=self._key(handle),
+            ContentType="text/plain; charset=utf-8",
+        )
+
+    async def get(self, handle: str) -> str | None:
+        def _read() -> bytes:
+            response = get_cos().client.get_object(
+                Bucket=self._settings.cos_bucket,
+                Key=self._key(handle),
+            )
+            return response["Body"].get_raw_stream().read()
+
+        try:
+            data = await asyncio.to_thread(_read)
+        except Exception as e:
+            logger.warning(f"读取工具结果[{handle}]失败: {str(e)}")
+            return None
+        return data.decode("utf-8")
@@ -0,0 +1,3 @@
+from .html_parser import html_to_markdown, resolve_html_parser
+
+__all__ = ["html_to_markdown", "resolve_html_parser"]
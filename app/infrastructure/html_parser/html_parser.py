@@ -0,0 +1,23 @@
+import importlib.util
+import logging
+from functools import lru_cache
+
+from markdownify import markdownify
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def resolve_html_parser(name: str = "auto") -> str:
+    """解析BeautifulSoup使用的解析器: auto时安装了lxml则使用lxml, 否则使用内置的html.parser"""
+    if name == "auto":
+        return "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+    if name == "lxml" and importlib.util.find_spec("lxml") is None:
+        logger.warning("未安装lxml, HTML解析回退为html.parser")
+        return "html.parser"
+    return name
+
+
+def html_to_markdown(html: str, parser: str = "html.parser") -> str:
+    """使用markdownify将html文档转换为markdown, 模块级函数便于提交到线程池/进程池执行"""
+    return markdownify(html, bs4_options=parser)
@@ -1,3 +1,6 @@
 from .base import Base
+from .session import SessionModel
+from .session_event import SessionEventModel
+from .session_message import SessionMessageModel
 
-__all__ = ["Base"]
+__all__ = ["Base", "SessionModel", "SessionEventModel", "SessionMessageModel"]
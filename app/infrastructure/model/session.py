@@ -0,0 +1,59 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String, Text, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.domain.model.session import Session, SessionStatus
+
+from .base import Base
+
+
+class SessionModel(Base):
+    """会话ORM模型"""
+
+    __tablename__ = "sessions"
+    __table_args__ = (
+        # 会话列表按更新时间倒序分页查询
+        Index("ix_sessions_updated_at", text("updated_at DESC")),
+    )
+
+    id: Mapped[str] = mapped_column(
+        String(255), primary_key=True, server_default=text("uuid_generate_v4()")
+    )
+    task_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    title: Mapped[str] = mapped_column(String(255), server_default=text("''"))
+    latest_message: Mapped[str] = mapped_column(Text, server_default=text("''"))
+    status: Mapped[str] = mapped_column(String(20), server_default=text("'pending'"))
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=text("CURRENT_TIMESTAMP(0)")
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=text("CURRENT_TIMESTAMP(0)"),
+        onupdate=datetime.now,
+    )
+
+    @classmethod
+    def from_domain(cls, session: Session) -> "SessionModel":
+        """将会话Domain模型转换为ORM模型"""
+        return cls(
+            id=session.id,
+            task_id=session.task_id,
+            title=session.title,
+            latest_message=session.latest_message,
+            status=session.status.value,
+            created_at=session.created_at,
+            updated_at=session.updated_at,
+        )
+
+    def to_domain(self) -> Session:
+        """将ORM模型转换为会话Domain模型"""
+        return Session(
+            id=self.id,
+            task_id=self.task_id,
+            title=self.title,
+            latest_message=self.latest_message,
+            status=SessionStatus(self.status),
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
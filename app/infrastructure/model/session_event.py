@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import BigInteger, DateTime, Identity, Index, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class SessionEventModel(Base):
+    """会话事件ORM模型: id为全局自增序号, 用于按序号增量拉取事件"""
+
+    __tablename__ = "session_events"
+    __table_args__ = (
+        # 按会话拉取某个序号之后的事件
+        Index("ix_session_events_session_id_id", "session_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    session_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    event_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    data: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        primary_key=True,  # 启用按时间分区时分区键必须包含在主键中
+        server_default=text("CURRENT_TIMESTAMP(0)"),
+    )
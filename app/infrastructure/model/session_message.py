@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class SessionMessageModel(Base):
+    """会话消息ORM模型: 记录用户与Agent之间的对话消息"""
+
+    __tablename__ = "session_messages"
+    __table_args__ = (
+        Index("ix_session_messages_session_id_created_at", "session_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(
+        String(255), primary_key=True, server_default=text("uuid_generate_v4()")
+    )
+    session_id: Mapped[str] = mapped_column(
+        String(255), ForeignKey("sessions.id", ondelete="CASCADE"), nullable=False
+    )
+    role: Mapped[str] = mapped_column(String(20), nullable=False)
+    message: Mapped[str] = mapped_column(Text, server_default=text("''"))
+    attachments: Mapped[list[str]] = mapped_column(
+        JSONB, server_default=text("'[]'::jsonb")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=text("CURRENT_TIMESTAMP(0)")
+    )
@@ -0,0 +1,125 @@
+import logging
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.model.event import Event
+from app.domain.model.message import Message
+from app.domain.model.session import Session
+from app.domain.repository.session_repository import SessionRepository
+from app.infrastructure.model import (
+    SessionEventModel,
+    SessionMessageModel,
+    SessionModel,
+)
+from app.infrastructure.repository.event_batch_writer import EventBatchWriter
+
+logger = logging.getLogger(__name__)
+
+# 事件是联合类型, 使用TypeAdapter根据type字段还原为具体的事件类
+_event_adapter = TypeAdapter(Event)
+
+
+class DBSessionRepository(SessionRepository):
+    """基于Postgres的会话数据仓库, 事件写入交给批量写入器异步完成"""
+
+    def __init__(self, db_session: AsyncSession, event_writer: EventBatchWriter) -> None:
+        """构造函数: 传递数据库会话与事件批量写入器完成初始化"""
+        self.db_session = db_session
+        self.event_writer = event_writer
+
+    async def save(self, session: Session) -> None:
+        """新增或更新会话(按主键合并)"""
+        await self.db_session.merge(SessionModel.from_domain(session))
+
+    async def get_by_id(self, session_id: str) -> Session | None:
+        """根据id获取会话, 不存在时返回None"""
+        record = await self.db_session.get(SessionModel, session_id)
+        return record.to_domain() if record else None
+
+    async def get_all(self, limit: int = 50, offset: int = 0) -> list[Session]:
+        """按更新时间倒序分页获取会话列表, 命中ix_sessions_updated_at索引"""
+        stmt = (
+            select(SessionModel)
+            .order_by(SessionModel.updated_at.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        result = await self.db_session.execute(stmt)
+        return [record.to_domain() for record in result.scalars().all()]
+
+    async def delete_by_id(self, session_id: str) -> None:
+        """删除会话, 消息通过外键级联删除, 事件表未建外键需要手动删除"""
+        await self.event_writer.flush()
+        await self.db_session.execute(
+            delete(SessionEventModel).where(SessionEventModel.session_id == session_id)
+        )
+        await self.db_session.execute(
+            delete(SessionModel).where(SessionModel.id == session_id)
+        )
+
+    async def add_event(self, session_id: str, event: Event) -> None:
+        """将事件放入批量写入队列, 不在当前请求内单独执行INSERT"""
+        await self.event_writer.put(
+            {
+                "session_id": session_id,
+                "event_id": event.id,
+                "type": event.type,
+                "data": event.model_dump(mode="json"),
+                "created_at": event.created_at,
+            }
+        )
+
+    async def get_events(
+        self, session_id: str, after_id: int = 0, limit: int = 100
+    ) -> list[tuple[int, Event]]:
+        """获取会话中序号大于after_id的事件, 命中(session_id, id)联合索引"""
+        # 1.存在未落库的事件时先等待写入完成, 保证读到最新数据
+        if self.event_writer.has_pending():
+            await self.event_writer.flush()
+
+        # 2.按序号增量查询
+        stmt = (
+            select(SessionEventModel.id, SessionEventModel.data)
+            .where(
+                SessionEventModel.session_id == session_id,
+                SessionEventModel.id > after_id,
+            )
+            .order_by(SessionEventModel.id)
+            .limit(limit)
+        )
+        result = await self.db_session.execute(stmt)
+        return [(row.id, _event_adapter.validate_python(row.data)) for row in result]
+
+    async def add_message(
+        self, session_id: str, message: Message, role: str = "user"
+    ) -> None:
+        """往会话中追加一条消息"""
+        self.db_session.add(
+            SessionMessageModel(
+                session_id=session_id,
+                role=role,
+                message=message.message,
+                attachments=message.attachments,
+            )
+        )
+
+    async def get_messages(
+        self, session_id: str, limit: int = 100
+    ) -> list[tuple[str, Message]]:
+        """按时间顺序获取会话消息"""
+        stmt = (
+            select(SessionMessageModel)
+            .where(SessionMessageModel.session_id == session_id)
+            .order_by(SessionMessageModel.created_at)
+            .limit(limit)
+        )
+        result = await self.db_session.execute(stmt)
+        return [
+            (
+                record.role,
+                Message(message=record.message, attachments=record.attachments),
+            )
+            for record in result.scalars().all()
+        ]
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import func, insert, text, update
+
+from app.infrastructure.model import SessionEventModel, SessionModel
+from app.infrastructure.storage.postgres import get_postgres
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventBatchWriter:
+    """会话事件批量写入器: 事件先进入有界队列, 由后台任务按条数/时间攒批后一次性多行写入"""
+
+    MAX_RETRIES = 3  # 单批写入失败后的最大尝试次数
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval_ms: int = 200,
+        queue_size: int = 10000,
+    ) -> None:
+        """构造函数: 传递单批条数、最长攒批时间、队列长度完成初始化"""
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=queue_size)
+        self._task: asyncio.Task | None = None
+        self._written = 0  # 成功写入的事件数
+        self._dropped = 0  # 重试后依旧写入失败被丢弃的事件数
+        self._batches = 0  # 成功写入的批次数
+        self._pending = 0  # 已入队但尚未处理完成的事件数
+
+    async def start(self) -> None:
+        """启动后台写入任务, 开启分区时提前创建本月与下月的分区"""
+        if self._task is not None:
+            logger.warning("会话事件批量写入器已启动 无需重复操作")
+            return
+        if get_settings().postgres_partition_events:
+            try:
+                await self.ensure_event_partitions()
+            except Exception as e:
+                # 分区创建失败时事件会落入默认分区, 不影响服务启动
+                logger.warning(f"创建会话事件分区失败: {str(e)}")
+        self._task = asyncio.create_task(self._run(), name="session-event-writer")
+        logger.info("会话事件批量写入器启动成功")
+
+    async def shutdown(self) -> None:
+        """写完队列中剩余的事件后停止后台任务"""
+        if self._task is not None:
+            await self.flush()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("会话事件批量写入器成功关闭")
+
+        get_event_batch_writer.cache_clear()
+
+    async def put(self, row: dict[str, Any]) -> None:
+        """将一条事件放入待写入队列, 队列已满时等待(背压), 写入器未启动时直接写入"""
+        if self._task is None:
+            await self._write([row])
+            return
+        self._pending += 1
+        await self._queue.put(row)
+
+    async def flush(self) -> None:
+        """等待当前队列中的所有事件落库, 用于读取前保证读到自己刚写入的事件"""
+        if self._task is not None:
+            await self._queue.join()
+
+    def has_pending(self) -> bool:
+        """是否存在尚未落库的事件"""
+        return self._pending > 0
+
+    def stats(self) -> dict[str, Any]:
+        """返回写入器的统计信息"""
+        return {
+            "pending": self._pending,
+            "written": self._written,
+            "batches": self._batches,
+            "dropped": self._dropped,
+        }
+
+    async def _run(self) -> None:
+        """后台循环: 攒满一批或者到达最长等待时间后写入"""
+        while True:
+            # 1.阻塞等待第一条事件, 之后在攒批窗口内尽量多取
+            batch = [await self._queue.get()]
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # 2.写入数据库, 无论成功与否都标记队列任务完成, 避免flush永久阻塞
+            try:
+                await self._write(batch)
+            finally:
+                self._pending -= len(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, rows: list[dict[str, Any]]) -> None:
+        """在一个事务内多行插入事件并更新会话的更新时间, 失败时退避重试"""
+        session_ids = {row["session_id"] for row in rows}
+        for attempt in range(1, self.MAX_RETRIES + 1):
+            try:
+                async with get_postgres().session_factory() as session:
+                    async with session.begin():
+                        # 1.传递参数列表时SQLAlchemy会使用insertmanyvalues合并为多行INSERT
+                        await session.execute(insert(SessionEventModel), rows)
+
+                        # 2.同一事务内刷新会话更新时间, 保证会话列表排序与事件一致
+                        await session.execute(
+                            update(SessionModel)
+                            .where(SessionModel.id.in_(session_ids))
+                            .values(updated_at=func.now())
+                        )
+                self._written += len(rows)
+                self._batches += 1
+                return
+            except Exception as e:
+                if attempt == self.MAX_RETRIES:
+                    self._dropped += len(rows)
+                    logger.error(f"会话事件批量写入失败, 丢弃{len(rows)}条事件: {str(e)}")
+                    return
+                logger.warning(f"会话事件批量写入失败, 第{attempt}次重试: {str(e)}")
+                await asyncio.sleep(0.1 * 2**attempt)
+
+    async def ensure_event_partitions(self, months: int = 2) -> None:
+        """从本月开始按月创建会话事件表分区, 已存在时跳过"""
+        start = date.today().replace(day=1)
+        async with get_postgres().session_factory() as session:
+            async with session.begin():
+                for _ in range(months):
+                    end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+                    await session.execute(
+                        text(
+                            f"CREATE TABLE IF NOT EXISTS "
+                            f"session_events_{start:%Y%m} PARTITION OF session_events "
+                            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                        )
+                    )
+                    start = end
+        logger.info(f"会话事件分区检查完毕, 已确保最近{months}个月的分区存在")
+
+
+@lru_cache()
+def get_event_batch_writer() -> EventBatchWriter:
+    """使用lru_cache实现单例模式 获取会话事件批量写入器"""
+    settings = get_settings()
+    return EventBatchWriter(
+        batch_size=settings.postgres_event_batch_size,
+        flush_interval_ms=settings.postgres_event_flush_interval_ms,
+        queue_size=settings.postgres_event_queue_size,
+    )
@@ -1,10 +1,16 @@
+import asyncio
 import logging
+import os
+import tempfile
 from pathlib import Path
 
 import yaml
 from filelock import FileLock
 
-from app.application.error.exception import ServerRequestsError
+from app.application.error.exception import (
+    PreconditionFailedError,
+    ServerRequestsError,
+)
 from app.domain.model.app_config import AgentConfig, AppConfig, LLMConfig, MCPConfig
 from app.domain.repository.app_config_repository import AppConfigRepository
 
@@ -24,43 +30,116 @@ class FileAppConfigRepository(AppConfigRepository):
         self._config_path.parent.mkdir(parents=True, exist_ok=True)
         self._lock_file = self._config_path.with_suffix(".lock")  # 文件锁
 
-    def _create_default_app_config_if_not_exists(self):
-        """如果配置文件不存在，则使用默认配置并写入到本地文件"""
+        # 3.内存缓存, 通过文件的修改时间/大小/inode判断是否失效
+        self._cache: AppConfig | None = None
+        self._cache_key: tuple[int, int, int] | None = None
+        self._save_lock = asyncio.Lock()  # 进程内的写入串行化
+
+    def _stat_key(self) -> tuple[int, int, int] | None:
+        """获取配置文件的(修改时间, 大小, inode)作为缓存校验键, 文件不存在时返回None"""
+        try:
+            stat = os.stat(self._config_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _read_file(self) -> tuple[AppConfig | None, tuple[int, int, int] | None]:
+        """同步读取并校验配置文件, 文件不存在时写入默认配置(在线程池中执行)"""
+        # 1.创建默认配置确保文件存在
         if not self._config_path.exists():
-            default_app_config = AppConfig(
-                llm_config=LLMConfig(),
-                agent_config=AgentConfig(),
-                mcp_config=MCPConfig(),
+            self._write_file(
+                AppConfig(
+                    llm_config=LLMConfig(),
+                    agent_config=AgentConfig(),
+                    mcp_config=MCPConfig(),
+                )
             )
-            self.save(default_app_config)
 
-    def load(self) -> AppConfig | None:
-        """从本地yaml文件中加载应用配置"""
-        # 1.创建默认配置确保文件存在
-        self._create_default_app_config_if_not_exists()
+        # 2.先记录校验键再读取, 读取期间文件被修改时下次load会重新加载
+        stat_key = self._stat_key()
+        with open(self._config_path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        return (AppConfig.model_validate(data) if data else None), stat_key
+
+    def _current_version(self) -> int:
+        """获取磁盘上配置文件的版本号, 文件未变化时直接使用缓存, 文件不存在时为0"""
+        stat_key = self._stat_key()
+        if stat_key is None:
+            return 0
+        if self._cache is not None and self._cache_key == stat_key:
+            return self._cache.version
+        with open(self._config_path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        return int(data.get("version", 0))
+
+    def _write_file(
+        self, app_config: AppConfig, expected_version: int | None = None
+    ) -> tuple[int, int, int] | None:
+        """同步写入配置文件(在线程池中执行): 先写临时文件再原子替换, 读取方不会读到半份yaml"""
+        # 1.写入之前先上锁, 避免多进程同时写入
+        with FileLock(self._lock_file, timeout=5):
+            # 2.在锁内比较版本号(CAS), 不一致说明配置已被其他请求修改
+            current_version = self._current_version()
+            if expected_version is not None and expected_version != current_version:
+                raise PreconditionFailedError(
+                    f"应用配置版本已变更(当前版本{current_version})，请刷新后重试"
+                )
+            app_config.version = current_version + 1
+
+            # 3.将app_config转换成json并写入同目录下的临时文件
+            data_to_dump = app_config.model_dump(mode="json")
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self._config_path.parent, prefix=f".{self._config_path.name}."
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    yaml.dump(data_to_dump, f, allow_unicode=True, sort_keys=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                # 4.mkstemp创建的文件权限为0600, 沿用原文件权限后原子替换正式配置文件
+                mode = (
+                    self._config_path.stat().st_mode
+                    if self._config_path.exists()
+                    else 0o644
+                )
+                os.chmod(tmp_path, mode & 0o777)
+                os.replace(tmp_path, self._config_path)
+            except BaseException:
+                Path(tmp_path).unlink(missing_ok=True)
+                raise
+            return self._stat_key()
+
+    async def load(self) -> AppConfig | None:
+        """加载应用配置: 文件未变化时直接返回内存缓存, 否则在线程池中重新读取"""
+        # 1.文件校验键未变化时返回缓存的副本, 避免调用方修改影响缓存
+        if self._cache is not None and self._cache_key == self._stat_key():
+            return self._cache.model_copy(deep=True)
 
         try:
-            # 2.打开配置文件并加载为AppConfig
-            with open(self._config_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                return AppConfig.model_validate(data) if data else None
+            # 2.文件已变化或尚未缓存, 在线程池中读取并校验
+            app_config, stat_key = await asyncio.to_thread(self._read_file)
         except Exception as e:
             logger.error(f"读取应用配置失败: {str(e)}")
             raise ServerRequestsError("读取应用配置失败，请稍后尝试")
 
-    def save(self, app_config: AppConfig) -> None:
-        """将app_config存储到本地yaml配置"""
-        # 1.写入之前先上锁
-        lock = FileLock(self._lock_file, timeout=5)
+        # 3.更新缓存
+        self._cache, self._cache_key = app_config, stat_key
+        return app_config.model_copy(deep=True) if app_config else None
 
-        try:
-            with lock:
-                # 2.将app_config转换成json
-                data_to_dump = app_config.model_dump(mode="json")
+    async def save(
+        self, app_config: AppConfig, expected_version: int | None = None
+    ) -> int:
+        """将app_config存储到本地yaml配置并返回新版本号, 写入成功后同步更新内存缓存"""
+        async with self._save_lock:
+            try:
+                stat_key = await asyncio.to_thread(
+                    self._write_file, app_config, expected_version
+                )
+            except TimeoutError:
+                logger.error("无法获取配置文件")
+                raise ServerRequestsError("写入配置文件失败，请稍后尝试")
 
-                # 3.打开yaml文件并写入
-                with open(self._config_path, "w", encoding="utf-8") as f:
-                    yaml.dump(data_to_dump, f, allow_unicode=True, sort_keys=False)
-        except TimeoutError:
-            logger.error("无法获取配置文件")
-            raise ServerRequestsError("写入配置文件失败，请稍后尝试")
+            # 写入方直接刷新缓存, 无需等待下次load重新解析
+            self._cache, self._cache_key = app_config.model_copy(deep=True), stat_key
+            return app_config.version
@@ -8,10 +8,139 @@ from bs4 import BeautifulSoup
 from app.domain.external.search import SearchEngine
 from app.domain.model.search import SearchResultItem, SearchResults
 from app.domain.model.tool_result import ToolResult
+from app.infrastructure.executor import get_cpu_executor
+from app.infrastructure.html_parser import resolve_html_parser
+from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+def parse_search_results(
+    html: str, parser: str = "html.parser"
+) -> tuple[list[SearchResultItem], int]:
+    """解析bing搜索结果页面, 返回搜索结果列表与结果总数, 模块级函数便于提交到线程池/进程池执行"""
+    # 1.使用bs4解析html内容
+    soup = BeautifulSoup(html, parser)
+
+    # 2.定义搜索结果并解析li.b_algo对应的dom元素
+    search_results = []
+    result_items = soup.find_all("li", class_="b_algo")
+
+    # 3.循环遍历所有匹配的dom
+    for item in result_items:
+        try:
+            # 4.定义变量存储数据
+            title, url = ("", "")
+
+            # 5.解析搜索结果中的标题与URL链接
+            title_tag = item.find("h2")
+            if title_tag:
+                a_tag = title_tag.find("a")
+                if a_tag:
+                    title = a_tag.get_text(strip=True)
+                    url = a_tag.get("href", "")
+
+            # 6.判断标题如果不存在提取该dom下的a标签
+            if not title:
+                a_tags = item.find_all("a")
+                for a_tag in a_tags:
+                    # 7.提取标签中的文本并判断文本的长度是否超过10+不以http为开头
+                    text = a_tag.get_text(strip=True)
+                    if len(text) > 10 and not text.startswith("http"):
+                        title = text
+                        url = a_tag.get("href", "")
+                        break
+
+            # 8.如果两种查询方式都找不到title则跳过这次数据
+            if not title:
+                continue
+
+            # 9.提取检索数据的摘要信息
+            snippet = ""
+            snippet_items = item.find_all(
+                ["p", "div"],
+                class_=re.compile(r"b_lineclamp|b_descript|b_caption"),
+            )
+            if snippet_items:
+                snippet = snippet_items[0].get_text(strip=True)
+
+            # 10.如果未找到摘要则查询所有p标签(段落标签)
+            if not snippet:
+                p_tags = item.find_all("p")
+                for p in p_tags:
+                    text = p.get_text(strip=True)
+                    if len(text) > 20:
+                        snippet = text
+                        break
+
+            # 11.如果还找不到摘要数据，则提取选项中的所有文本并使用常见的分隔符分割
+            if not snippet:
+                all_text = item.get_text(strip=True)
+                # 12.将所有文本分割成对应的句子，并循环遍历取出长度>20的句子
+                sentences = re.split(r"[.!?\n。！]", all_text)
+                for sentence in sentences:
+                    clean_sentence = sentence.strip()
+                    if len(clean_sentence) > 20 and clean_sentence != title:
+                        snippet = clean_sentence
+                        break
+
+            # 13.补全相对路径的url链接与缺失协议的部分
+            if url and not url.startswith("http"):
+                if url.startswith("//"):
+                    url = "https:" + url
+                elif url.startswith("/"):
+                    url = "https://www.bing.com" + url
+
+            # 14.如果标题和链接都存在则添加数据
+            search_results.append(
+                SearchResultItem(
+                    title=title,
+                    url=url,
+                    snippet=snippet,
+                )
+            )
+
+        except Exception as e:
+            # 15.记录错误信息并继续解析
+            logger.warning(f"Bing搜索结果解析失败: {str(e)}")
+            continue
+
+    # 16.提取整个页面的内容并查找`results`对应的文本
+    total_results = 0
+    result_stats = soup.find_all(string=re.compile(r"\d+[,\d+]\s*results"))
+    if result_stats:
+        for stat in result_stats:
+            # 17.匹配出对应的数字分组
+            match = re.search(r"([\d,]+)\s*results", stat)
+            if match:
+                try:
+                    # 18.取出匹配的分组内容，去除逗号转换为整型
+                    total_results = int(match.group(1).replace(",", ""))
+                    break
+                except Exception:
+                    continue
+
+    # 19.如果使用正则匹配找不到results(有可能是页面结构不一致)则使用新逻辑
+    if total_results == 0:
+        # 20.使用类元素查找器
+        count_elements = soup.find_all(
+            ["span", "div", "p"],
+            class_=re.compile(r"sb_count|b_focusTextMedium"),
+        )
+        for element in count_elements:
+            # 21.提取dom的文本并获取数字
+            text = element.get_text(strip=True)
+            match = re.search(r"([\d,]+)\s*results", text)
+            if match:
+                try:
+                    total_results = int(match.group(1).replace(",", ""))
+                    break
+                except Exception:
+                    continue
+
+    return search_results, total_results
+
+
 class BingSearchEngine(SearchEngine):
     """bing搜索引擎"""
 
@@ -68,126 +197,14 @@ class BingSearchEngine(SearchEngine):
                 # 8.更新cookie信息
                 self.cookies.update(response.cookies)
 
-                # 9.使用bs4解析html内容
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # 10.定义搜索结果并解析li.b_algo对应的dom元素
-                search_results = []
-                result_items = soup.find_all("li", class_="b_algo")
-
-                # 11.循环遍历所有匹配的dom
-                for item in result_items:
-                    try:
-                        # 12.定义变量存储数据
-                        title, url = ("", "")
-
-                        # 13.解析搜索结果中的标题与URL链接
-                        title_tag = item.find("h2")
-                        if title_tag:
-                            a_tag = title_tag.find("a")
-                            if a_tag:
-                                title = a_tag.get_text(strip=True)
-                                url = a_tag.get("href", "")
-
-                        # 14.判断标题如果不存在提取该dom下的a标签
-                        if not title:
-                            a_tags = item.find_all("a")
-                            for a_tag in a_tags:
-                                # 15.提取标签中的文本并判断文本的长度是否超过10+不以http为开头
-                                text = a_tag.get_text(strip=True)
-                                if len(text) > 10 and not text.startswith("http"):
-                                    title = text
-                                    url = a_tag.get("href", "")
-                                    break
-
-                        # 16.如果两种查询方式都找不到title则跳过这次数据
-                        if not title:
-                            continue
-
-                        # 17.提取检索数据的摘要信息
-                        snippet = ""
-                        snippet_items = item.find_all(
-                            ["p", "div"],
-                            class_=re.compile(r"b_lineclamp|b_descript|b_caption"),
-                        )
-                        if snippet_items:
-                            snippet = snippet_items[0].get_text(strip=True)
-
-                        # 18.如果未找到摘要则查询所有p标签(段落标签)
-                        if not snippet:
-                            p_tags = item.find_all("p")
-                            for p in p_tags:
-                                text = p.get_text(strip=True)
-                                if len(text) > 20:
-                                    snippet = text
-                                    break
-
-                        # 19.如果还找不到摘要数据，则提取选项中的所有文本并使用常见的分隔符分割
-                        if not snippet:
-                            all_text = item.get_text(strip=True)
-                            # 20.将所有文本分割成对应的句子，并循环遍历取出长度>20的句子
-                            sentences = re.split(r"[.!?\n。！]", all_text)
-                            for sentence in sentences:
-                                clean_sentence = sentence.strip()
-                                if len(clean_sentence) > 20 and clean_sentence != title:
-                                    snippet = clean_sentence
-                                    break
-
-                        # 21.补全相对路径的url链接与缺失协议的部分
-                        if url and not url.startswith("http"):
-                            if url.startswith("//"):
-                                url = "https:" + url
-                            elif url.startswith("/"):
-                                url = "https://www.bing.com" + url
-
-                        # 22.如果标题和链接都存在则添加数据
-                        search_results.append(
-                            SearchResultItem(
-                                title=title,
-                                url=url,
-                                snippet=snippet,
-                            )
-                        )
-
-                    except Exception as e:
-                        # 23.记录错误信息并继续解析
-                        logger.warning(f"Bing搜索结果解析失败: {str(e)}")
-                        continue
-
-                # 24.提取整个页面的内容并查找`results`对应的文本
-                total_results = 0
-                result_stats = soup.find_all(string=re.compile(r"\d+[,\d+]\s*results"))
-                if result_stats:
-                    for stat in result_stats:
-                        # 25.匹配出对应的数字分组
-                        match = re.search(r"([\d,]+)\s*results", stat)
-                        if match:
-                            try:
-                                # 26.取出匹配的分组内容，去除逗号转换为整型
-                                total_results = int(match.group(1).replace(",", ""))
-                                break
-                            except Exception:
-                                continue
-
-                # 27.如果使用正则匹配找不到results(有可能是页面结构不一致)则使用新逻辑
-                if total_results == 0:
-                    # 28.使用类元素查找器
-                    count_elements = soup.find_all(
-                        ["span", "div", "p"],
-                        class_=re.compile(r"sb_count|b_focusTextMedium"),
-                    )
-                    for element in count_elements:
-                        # 29.提取dom的文本并获取数字
-                        text = element.get_text(strip=True)
-                        match = re.search(r"([\d,]+)\s*results", text)
-                        if match:
-                            try:
-                                total_results = int(match.group(1).replace(",", ""))
-                                break
-                            except Exception:
-                                continue
-
-                # 30.返回搜索结果
+                # 9.使用bs4解析html内容, 解析为CPU密集操作, 放到执行器中避免阻塞事件循环
+                search_results, total_results = await get_cpu_executor().run(
+                    parse_search_results,
+                    response.text,
+                    resolve_html_parser(get_settings().html_parser),
+                )
+
+                # 10.返回搜索结果
                 results = SearchResults(
                     query=query,
                     date_range=date_range,
@@ -196,7 +213,7 @@ class BingSearchEngine(SearchEngine):
                 )
                 return ToolResult(success=True, data=results)
         except Exception as e:
-            # 31.记录日志并返回错误工具调用结果
+            # 11.记录日志并返回错误工具调用结果
             logger.error(f"Bing搜索出错: {str(e)}")
             error_results = SearchResults(
                 query=query,
@@ -1,18 +1,72 @@
 import logging
+import logging.handlers
+import queue
+import random
+import time
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import text
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
+sql_logger = logging.getLogger(f"{__name__}.sql")
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """带统计信息的异步连接池: 记录取出连接的等待耗时、超时次数及排队数"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """构造函数: 参数与AsyncAdaptedQueuePool保持一致, 保证recreate()可用"""
+        super().__init__(*args, **kwargs)
+        self._waiting = 0  # 正在等待连接的请求数
+        self._checkouts = 0  # 获取连接总次数
+        self._timeouts = 0  # 等待连接超时次数
+        self._total_wait_seconds = 0.0  # 获取连接累计耗时
+        self._max_wait_seconds = 0.0  # 获取连接最大耗时
+
+    def connect(self):
+        """取出连接并记录耗时(包含排队、新建连接及pre_ping的时间)"""
+        start = time.perf_counter()
+        self._waiting += 1
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            self._waiting -= 1
+            elapsed = time.perf_counter() - start
+            self._checkouts += 1
+            self._total_wait_seconds += elapsed
+            self._max_wait_seconds = max(self._max_wait_seconds, elapsed)
+
+    def stats(self) -> dict[str, Any]:
+        """返回连接池的使用情况统计"""
+        max_connections = self.size() + max(self._max_overflow, 0)
+        in_use = self.checkedout()
+        return {
+            "max_connections": max_connections,
+            "in_use": in_use,
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": self._waiting,
+            "saturation": round(in_use / max(max_connections, 1), 3),
+            "checkouts": self._checkouts,
+            "timeouts": self._timeouts,
+            "avg_wait_ms": round(
+                self._total_wait_seconds * 1000 / max(self._checkouts, 1), 3
+            ),
+            "max_wait_ms": round(self._max_wait_seconds * 1000, 3),
+        }
 
 
 class Postgres:
@@ -22,8 +76,32 @@ class Postgres:
         """构造函数: 创建postgres数据库引擎 会话工厂 并获取配置信息"""
         self._engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[async_sessionmaker] = None
+        self._sql_log_listener: Optional[logging.handlers.QueueListener] = None
         self._settings = get_settings()
 
+    def _setup_sql_logging(self) -> None:
+        """按采样率打印SQL, 日志经队列交给后台线程输出, 避免同步I/O阻塞事件循环"""
+        # 1.仅开发环境且采样率大于0时开启
+        sample_rate = self._settings.postgres_echo_sample_rate
+        if self._settings.env != "development" or sample_rate <= 0:
+            return
+
+        # 2.SQL日志写入内存队列, 由QueueListener线程交给根日志处理器输出
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        sql_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        sql_logger.setLevel(logging.INFO)
+        sql_logger.propagate = False
+        self._sql_log_listener = logging.handlers.QueueListener(
+            log_queue, *logging.getLogger().handlers, respect_handler_level=True
+        )
+        self._sql_log_listener.start()
+
+        # 3.执行语句前按采样率记录SQL及参数
+        @event.listens_for(self._engine.sync_engine, "before_cursor_execute")
+        def _log_sql(conn, cursor, statement, parameters, context, executemany):
+            if random.random() < sample_rate:
+                sql_logger.info(f"{statement} | {parameters}")
+
     async def init(self) -> None:
         """手动初始化 postgres连接"""
         # 1.判断是否已经创建好引擎 如果连上了则中断程序
@@ -36,8 +114,20 @@ class Postgres:
             logger.info("正在初始化Postgres连接...")
             self._engine = create_async_engine(
                 self._settings.sqlalchemy_database_uri,
-                echo=True if self._settings.env == "development" else False,
+                poolclass=InstrumentedAsyncQueuePool,
+                pool_size=self._settings.postgres_pool_size,
+                max_overflow=self._settings.postgres_max_overflow,
+                pool_timeout=self._settings.postgres_pool_timeout,
+                pool_pre_ping=self._settings.postgres_pool_pre_ping,
+                pool_recycle=self._settings.postgres_pool_recycle,
+                connect_args={
+                    "prepared_statement_cache_size": self._settings.postgres_statement_cache_size,
+                    "server_settings": {
+                        "jit": "on" if self._settings.postgres_jit else "off"
+                    },
+                },
             )
+            self._setup_sql_logging()
 
             # 3.创建会话工厂
             self._session_factory = async_sessionmaker(
@@ -65,10 +155,20 @@ class Postgres:
             self._engine = None
             self._session_factory = None
             logger.info("成功关闭 Postgres连接")
+        if self._sql_log_listener is not None:
+            self._sql_log_listener.stop()
+            self._sql_log_listener = None
+            sql_logger.handlers.clear()
 
         # 清除缓存
         get_postgres.cache_clear()
 
+    def pool_stats(self) -> dict[str, Any]:
+        """返回连接池的统计信息, 未初始化时返回空字典"""
+        if self._engine is None:
+            return {}
+        return self._engine.pool.stats()
+
     @property
     def session_factory(self) -> async_sessionmaker[AsyncSession]:
         """只读属性: 返回已初始化的会话工厂"""
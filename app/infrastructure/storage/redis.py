@@ -1,21 +1,98 @@
+import asyncio
 import logging
+import time
 from functools import lru_cache
+from typing import Any
 
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError
 
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """带统计信息的阻塞连接池: 连接耗尽时排队等待而不是无限创建, 同时记录等待耗时"""
+
+    def __init__(self, name: str, **kwargs) -> None:
+        """构造函数: 传递连接池名字及连接池参数完成初始化"""
+        super().__init__(**kwargs)
+        self.name = name
+        self._waiting = 0  # 正在等待连接的请求数
+        self._checkouts = 0  # 获取连接总次数
+        self._timeouts = 0  # 连接池耗尽、等待空闲连接超时的次数
+        self._errors = 0  # 建立连接失败(拒绝连接、DNS解析失败等)的次数
+        self._total_wait_seconds = 0.0  # 获取连接累计耗时
+        self._max_wait_seconds = 0.0  # 获取连接最大耗时
+
+    async def get_connection(self, command_name=None, *keys, **options):
+        """获取连接并记录等待耗时"""
+        start = time.perf_counter()
+        self._waiting += 1
+        try:
+            return await super().get_connection()
+        except ConnectionError as e:
+            # 连接池耗尽时父类将等待超时包装为ConnectionError抛出, 其余为建立连接失败
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                self._timeouts += 1
+            else:
+                self._errors += 1
+            raise
+        finally:
+            self._waiting -= 1
+            elapsed = time.perf_counter() - start
+            self._checkouts += 1
+            self._total_wait_seconds += elapsed
+            self._max_wait_seconds = max(self._max_wait_seconds, elapsed)
+
+    def stats(self) -> dict[str, Any]:
+        """返回连接池的使用情况统计"""
+        in_use = len(self._in_use_connections)
+        return {
+            "max_connections": self.max_connections,
+            "in_use": in_use,
+            "idle": len(self._available_connections),
+            "waiting": self._waiting,
+            "saturation": round(in_use / self.max_connections, 3),
+            "checkouts": self._checkouts,
+            "timeouts": self._timeouts,
+            "errors": self._errors,
+            "avg_wait_ms": round(
+                self._total_wait_seconds * 1000 / max(self._checkouts, 1), 3
+            ),
+            "max_wait_ms": round(self._max_wait_seconds * 1000, 3),
+        }
+
+
 class RedisClient:
     """Redis客户端: 用于完成Redis缓存连接&使用操作"""
 
     def __init__(self):
         """构造函数: 创建Redis客户端 获取配置信息"""
         self._client: Redis | None = None
+        self._blocking_client: Redis | None = None
         self._settings = get_settings()
 
+    def _create_pool(
+        self, name: str, max_connections: int, socket_timeout: float | None
+    ) -> InstrumentedConnectionPool:
+        """根据名字+最大连接数+读写超时创建连接池, 其余参数均从配置中读取"""
+        return InstrumentedConnectionPool(
+            name=name,
+            max_connections=max_connections,
+            timeout=self._settings.redis_pool_timeout,
+            host=self._settings.redis_host,
+            port=self._settings.redis_port,
+            db=self._settings.redis_db,
+            password=self._settings.redis_password,
+            socket_timeout=socket_timeout,
+            socket_connect_timeout=self._settings.redis_socket_connect_timeout,
+            socket_keepalive=self._settings.redis_socket_keepalive,
+            health_check_interval=self._settings.redis_health_check_interval,
+            decode_responses=True,
+        )
+
     async def init(self) -> None:
         """手动调用: 完成Redis客户端的初始化"""
         # 1.判断客户端是否存在，如果存在则表示已连接上，无需重复连接
@@ -24,16 +101,26 @@ class RedisClient:
             return
 
         try:
-            # 2.创建Redis客户端并连接
+            # 2.创建普通命令使用的Redis客户端
             self._client = Redis(
-                host=self._settings.redis_host,
-                port=self._settings.redis_port,
-                db=self._settings.redis_db,
-                password=self._settings.redis_password,
-                decode_responses=True,
+                connection_pool=self._create_pool(
+                    "command",
+                    self._settings.redis_max_connections,
+                    self._settings.redis_socket_timeout,
+                )
+            )
+
+            # 3.阻塞读取(XREAD BLOCK)使用独立连接池, 避免长时间占用连接影响普通命令,
+            # 阻塞时长由命令本身控制, 所以不设置读写超时
+            self._blocking_client = Redis(
+                connection_pool=self._create_pool(
+                    "blocking",
+                    self._settings.redis_blocking_max_connections,
+                    None,
+                )
             )
 
-            # 3.测试连接redis缓存
+            # 4.测试连接redis缓存
             await self._client.ping()
             logger.info("Redis客户端初始化成功")
         except Exception as e:
@@ -42,15 +129,27 @@ class RedisClient:
 
     async def shutdown(self) -> None:
         """关闭Redis时执行的操作"""
-        # 1.客户端存在则关闭客户端并提示
+        # 1.客户端存在则关闭客户端及其连接池并提示
         if self._client is not None:
-            await self._client.aclose()
+            await self._client.aclose(close_connection_pool=True)
             self._client = None
             logger.info("Redis客户端成功关闭")
+        if self._blocking_client is not None:
+            await self._blocking_client.aclose(close_connection_pool=True)
+            self._blocking_client = None
 
         # 2.清除缓存
         get_redis.cache_clear()
 
+    def pool_stats(self) -> dict[str, dict[str, Any]]:
+        """返回普通命令连接池与阻塞读取连接池的统计信息"""
+        stats = {}
+        for client in (self._client, self._blocking_client):
+            if client is not None:
+                pool = client.connection_pool
+                stats[pool.name] = pool.stats()
+        return stats
+
     @property
     def client(self) -> Redis:
         """只读属性: 返回Redis客户端"""
@@ -58,6 +157,13 @@ class RedisClient:
             raise RuntimeError("Redis客户端未初始化 获取客户端失败")
         return self._client
 
+    @property
+    def blocking_client(self) -> Redis:
+        """只读属性: 返回阻塞读取专用的Redis客户端"""
+        if self._blocking_client is None:
+            raise RuntimeError("Redis客户端未初始化 获取阻塞读取客户端失败")
+        return self._blocking_client
+
 
 @lru_cache()
 def get_redis() -> RedisClient:
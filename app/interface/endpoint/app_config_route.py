@@ -1,7 +1,10 @@
 import logging
+import re
 
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Header
+from fastapi import Response as HTTPResponse
 
+from app.application.error.exception import BadRequestError
 from app.application.service.app_config_service import AppConfigService
 from app.domain.model.app_config import AgentConfig, LLMConfig, MCPConfig
 from app.interface.schema import Response
@@ -12,6 +15,34 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/app-config", tags=["应用配置模块"])
 
+# ETag格式: "v{版本号}", 兼容弱校验前缀W/
+_ETAG_PATTERN = re.compile(r'^(?:W/)?"v(\d+)"$')
+
+
+def _etag(version: int) -> str:
+    """根据配置版本号生成ETag"""
+    return f'"v{version}"'
+
+
+def _parse_if_match(if_match: str | None) -> int | None:
+    """解析If-Match请求头为期望的版本号, 未传递或为*时返回None(不校验版本)"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    match = _ETAG_PATTERN.match(if_match.strip())
+    if not match:
+        raise BadRequestError(f"If-Match格式错误: {if_match}")
+    return int(match.group(1))
+
+
+def _not_modified(if_none_match: str | None, version: int) -> HTTPResponse | None:
+    """If-None-Match命中当前版本时返回304响应, 否则返回None"""
+    if if_none_match is None:
+        return None
+    etags = {etag.strip() for etag in if_none_match.split(",")}
+    if "*" in etags or _etag(version) in etags or f"W/{_etag(version)}" in etags:
+        return HTTPResponse(status_code=304, headers={"ETag": _etag(version)})
+    return None
+
 
 @router.get(
     path="/llm",
@@ -20,11 +51,16 @@ router = APIRouter(prefix="/app-config", tags=["应用配置模块"])
     description="包含LLM提供商的base_url, temperature, model_name, max_tokens",
 )
 async def get_llm_config(
+    response: HTTPResponse,
+    if_none_match: str | None = Header(default=None),
     app_config_service: AppConfigService = Depends(get_app_config_service),
 ) -> Response[LLMConfig]:
-    """获取LLM配置信息"""
-    llm_config = await app_config_service.get_llm_config()
-    return Response.success(data=llm_config.model_dump(exclude={"api_key"}))
+    """获取LLM配置信息, 携带ETag, If-None-Match命中时返回304"""
+    app_config = await app_config_service.get_app_config()
+    if not_modified := _not_modified(if_none_match, app_config.version):
+        return not_modified
+    response.headers["ETag"] = _etag(app_config.version)
+    return Response.success(data=app_config.llm_config.model_dump(exclude={"api_key"}))
 
 
 @router.post(
@@ -35,13 +71,18 @@ async def get_llm_config(
 )
 async def update_llm_config(
     new_llm_config: LLMConfig,
+    response: HTTPResponse,
+    if_match: str | None = Header(default=None),
     app_config_service: AppConfigService = Depends(get_app_config_service),
 ) -> Response[LLMConfig]:
-    """更新LLM配置信息"""
-    updated_llm_config = await app_config_service.update_llm_config(new_llm_config)
+    """更新LLM配置信息, 携带If-Match时版本不一致返回412"""
+    app_config = await app_config_service.update_llm_config(
+        new_llm_config, _parse_if_match(if_match)
+    )
+    response.headers["ETag"] = _etag(app_config.version)
     return Response.success(
         msg="更新LLM信息配置成功",
-        data=updated_llm_config.model_dump(exclude={"api_key"}),
+        data=app_config.llm_config.model_dump(exclude={"api_key"}),
     )
 
 
@@ -52,11 +93,16 @@ async def update_llm_config(
     description="包含最大迭代次数、最大重试次数、最大搜索结果数",
 )
 async def get_agent_config(
+    response: HTTPResponse,
+    if_none_match: str | None = Header(default=None),
     app_config_service: AppConfigService = Depends(get_app_config_service),
 ) -> Response[AgentConfig]:
-    """获取Agent通用配置信息"""
-    agent_config = await app_config_service.get_agent_config()
-    return Response.success(data=agent_config.model_dump())
+    """获取Agent通用配置信息, 携带ETag, If-None-Match命中时返回304"""
+    app_config = await app_config_service.get_app_config()
+    if not_modified := _not_modified(if_none_match, app_config.version):
+        return not_modified
+    response.headers["ETag"] = _etag(app_config.version)
+    return Response.success(data=app_config.agent_config.model_dump())
 
 
 @router.post(
@@ -67,14 +113,17 @@ async def get_agent_config(
 )
 async def update_agent_config(
     new_agent_config: AgentConfig,
+    response: HTTPResponse,
+    if_match: str | None = Header(default=None),
     app_config_service: AppConfigService = Depends(get_app_config_service),
 ) -> Response[AgentConfig]:
-    """更新Agent配置信息"""
-    updated_agent_config = await app_config_service.update_agent_config(
-        new_agent_config
+    """更新Agent配置信息, 携带If-Match时版本不一致返回412"""
+    app_config = await app_config_service.update_agent_config(
+        new_agent_config, _parse_if_match(if_match)
     )
+    response.headers["ETag"] = _etag(app_config.version)
     return Response.success(
-        msg="更新Agent信息配置成功", data=updated_agent_config.model_dump()
+        msg="更新Agent信息配置成功", data=app_config.agent_config.model_dump()
     )
 
 
@@ -102,10 +151,15 @@ async def get_mcp_servers(
 )
 async def create_mcp_servers(
     mcp_config: MCPConfig,
+    response: HTTPResponse,
+    if_match: str | None = Header(default=None),
     app_config_service: AppConfigService = Depends(get_app_config_service),
 ) -> Response[dict | None]:
     """根据传递的配置信息创建mcp服务"""
-    await app_config_service.update_and_create_mcp_servers(mcp_config)
+    app_config = await app_config_service.update_and_create_mcp_servers(
+        mcp_config, _parse_if_match(if_match)
+    )
+    response.headers["ETag"] = _etag(app_config.version)
     return Response.success(msg="新增MCP服务配置成功")
 
 
@@ -117,10 +171,15 @@ async def create_mcp_servers(
 )
 async def delete_mcp_server(
     server_name: str,
+    response: HTTPResponse,
+    if_match: str | None = Header(default=None),
     app_config_service: AppConfigService = Depends(get_app_config_service),
 ) -> Response[dict | None]:
     """根据服务名字删除MCP服务器"""
-    await app_config_service.delete_mcp_server(server_name)
+    app_config = await app_config_service.delete_mcp_server(
+        server_name, _parse_if_match(if_match)
+    )
+    response.headers["ETag"] = _etag(app_config.version)
     return Response.success(msg="删除MCP服务配置成功")
 
 
@@ -132,9 +191,14 @@ async def delete_mcp_server(
 )
 async def set_mcp_server_enabled(
     server_name: str,
+    response: HTTPResponse,
     enabled: bool = Body(...),
+    if_match: str | None = Header(default=None),
     app_config_service: AppConfigService = Depends(get_app_config_service),
 ) -> Response[dict | None]:
     """根据传递的server_name+enabled更新服务的启用状态"""
-    await app_config_service.set_mcp_server_enabled(server_name, enabled)
+    app_config = await app_config_service.set_mcp_server_enabled(
+        server_name, enabled, _parse_if_match(if_match)
+    )
+    response.headers["ETag"] = _etag(app_config.version)
     return Response.success(msg="更新MCP服务启用状态成功")
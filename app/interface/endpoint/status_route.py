@@ -2,6 +2,7 @@ import logging
 from typing import List
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 
 from app.application.service.status_service import StatusService
 from app.domain.model.health_status import HealthStatus
@@ -22,10 +23,43 @@ router = APIRouter(prefix="/status", tags=["状态模块"])
 async def get_status(
     status_service: StatusService = Depends(get_status_service),
 ) -> Response:
-    """系统健康检查: 检查postgres/redis/fastapi/cos等服务"""
+    """系统健康检查: 返回后台定时检查的postgres/redis等服务状态快照"""
     health_statuses = await status_service.check_all()
 
     if any(item.status == "error" for item in health_statuses):
         return Response.fail(503, "系统存在服务异常", health_statuses)
 
     return Response.success(msg="系统健康检查成功", data=health_statuses)
+
+
+@router.get(
+    path="/live",
+    response_model=Response,
+    summary="存活探针",
+    description="进程与事件循环正常即返回成功, 不检查外部依赖, 供编排系统判断是否需要重启。",
+)
+async def get_liveness() -> Response:
+    """存活探针: 能响应即表示存活"""
+    return Response.success(msg="服务存活")
+
+
+@router.get(
+    path="/ready",
+    response_model=Response[List[HealthStatus]],
+    summary="就绪探针",
+    description="依赖服务的最新检查结果均正常且未过期时返回成功, 否则返回503, 供编排系统判断是否接入流量。",
+)
+async def get_readiness(
+    status_service: StatusService = Depends(get_status_service),
+) -> Response | JSONResponse:
+    """就绪探针: 只读取缓存快照, 不会实时请求依赖服务"""
+    health_statuses = status_service.snapshots()
+    if not status_service.is_ready():
+        return JSONResponse(
+            status_code=503,
+            content=Response.fail(503, "服务未就绪", health_statuses).model_dump(
+                mode="json"
+            ),
+        )
+
+    return Response.success(msg="服务已就绪", data=health_statuses)
@@ -0,0 +1,85 @@
+import logging
+import re
+from typing import Any, AsyncGenerator
+
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
+
+from app.application.error.exception import BadRequestError
+from app.application.service.task_service import TaskService
+from app.domain.model.event import ErrorEvent
+from app.interface.service_dependency import get_task_service
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+router = APIRouter(prefix="/tasks", tags=["任务模块"])
+
+# Redis Stream的消息id格式: 毫秒时间戳-序号
+_STREAM_ID_PATTERN = re.compile(r"^\d+(-\d+)?$")
+
+# 心跳使用SSE注释行, 客户端会忽略该内容但可以保持连接活跃
+_HEARTBEAT_FRAME = b": ping\n\n"
+
+
+def _encode_event(event_id: str, event_type: str, data: Any) -> str:
+    """将单条事件编码为SSE帧, 事件已经是json字符串时直接透传避免二次序列化"""
+    data = data if isinstance(data, str) else str(data)
+    if "\n" in data:
+        data = data.replace("\n", "\ndata: ")
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+def _encode_error_event(error: str) -> str:
+    """将读取事件流失败编码为error事件帧, 不携带id, 客户端重连时仍从最后一条已接收的事件续传"""
+    return f"event: error\ndata: {ErrorEvent(error=error).model_dump_json()}\n\n"
+
+
+@router.get(
+    path="/{task_id}/events",
+    summary="订阅任务事件流(SSE)",
+    description="以Server-Sent Events推送任务输出流中的事件, 支持通过Last-Event-ID请求头断线续传",
+)
+async def stream_task_events(
+    task_id: str,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+    task_service: TaskService = Depends(get_task_service),
+) -> StreamingResponse:
+    """订阅任务输出事件, 每批事件合并为一次写入, 空闲时发送心跳"""
+    # 1.校验Last-Event-ID是否为合法的Redis Stream id
+    if last_event_id is not None and not _STREAM_ID_PATTERN.match(last_event_id):
+        raise BadRequestError(f"Last-Event-ID格式错误: {last_event_id}")
+
+    # 2.获取事件批次生成器(任务不存在时在这里抛出404)
+    events = await task_service.stream_events(task_id, last_event_id)
+
+    async def event_generator() -> AsyncGenerator[bytes, None]:
+        """逐批拉取并编码事件, 客户端未消费完之前不会继续读取Redis, 实现慢客户端背压"""
+        # 3.告知客户端断线重连间隔
+        yield f"retry: {settings.sse_retry_ms}\n\n".encode()
+
+        # 4.空批次发送心跳, 非空批次编码后一次性写出
+        try:
+            async for batch in events:
+                if not batch:
+                    yield _HEARTBEAT_FRAME
+                    continue
+                yield "".join(
+                    _encode_event(event_id, event_type, data)
+                    for event_id, event_type, data in batch
+                ).encode()
+        except Exception as e:
+            # 5.读取输出流失败(Redis/多路复用器异常)时发送error事件后关闭事件流, 而不是直接中断响应
+            logger.error(f"读取任务[{task_id}]事件流失败: {str(e)}")
+            yield _encode_error_event(f"读取任务事件流失败, 请稍后重连: {str(e)}").encode()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # 关闭nginx缓冲, 保证事件实时到达
+        },
+    )
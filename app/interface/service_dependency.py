@@ -1,26 +1,55 @@
 import logging
 from functools import lru_cache
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-
 from app.application.service.app_config_service import AppConfigService
 from app.application.service.status_service import StatusService
+from app.application.service.task_service import TaskService
+from app.domain.service.tool.mcp_pool import MCPClientPool
+from app.domain.service.tool.spool import ToolResultSpooler
 from app.infrastructure.external.health_checker import (
     PostgresHealthChecker,
     RedisHealthChecker,
 )
+from app.infrastructure.external.mcp_tool_cache import RedisMCPToolCache
+from app.infrastructure.external.task.redis_stream_task import RedisStreamTask
+from app.infrastructure.external.tool_result_store import CosToolResultStore
 from app.infrastructure.repository.file_app_config_repository import (
     FileAppConfigRepository,
 )
-from app.infrastructure.storage.postgres import get_db_session
-from app.infrastructure.storage.redis import RedisClient, get_redis
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
+@lru_cache()
+def get_mcp_client_pool() -> MCPClientPool:
+    """获取进程级共享的MCP连接池"""
+    logger.info("加载获取MCPClientPool")
+    return MCPClientPool(
+        idle_seconds=settings.mcp_pool_idle_seconds,
+        reap_interval_seconds=settings.mcp_pool_reap_interval_seconds,
+        connect_timeout=settings.mcp_connect_timeout_seconds,
+        list_tools_timeout=settings.mcp_list_tools_timeout_seconds,
+        tool_cache=RedisMCPToolCache(ttl_seconds=settings.mcp_tool_cache_ttl_seconds),
+        tools_ttl_seconds=settings.mcp_tool_cache_ttl_seconds,
+        stdio_warm_pool_size=settings.mcp_stdio_warm_pool_size,
+        stdio_max_rss_mb=settings.mcp_stdio_max_rss_mb,
+    )
+
+
+@lru_cache()
+def get_tool_result_spooler() -> ToolResultSpooler:
+    """获取进程级共享的工具结果转存器, 创建Agent时传递给tool_result_spooler"""
+    logger.info("加载获取ToolResultSpooler")
+    return ToolResultSpooler(
+        store=CosToolResultStore(prefix=settings.tool_result_spool_prefix),
+        threshold_chars=settings.tool_result_spool_threshold_chars,
+        preview_chars=settings.tool_result_preview_chars,
+        page_chars=settings.tool_result_page_chars,
+    )
+
+
 @lru_cache()
 def get_app_config_service() -> AppConfigService:
     """获取应用配置服务"""
@@ -29,19 +58,36 @@ def get_app_config_service() -> AppConfigService:
     file_app_config_repository = FileAppConfigRepository(settings.app_config_filepath)
 
     # 2.实例化AppConfigService
-    return AppConfigService(app_config_repository=file_app_config_repository)
+    return AppConfigService(
+        app_config_repository=file_app_config_repository,
+        mcp_client_pool=get_mcp_client_pool(),
+    )
 
 
 @lru_cache()
-def get_status_service(
-    db_session: AsyncSession = Depends(get_db_session),
-    redis_client: RedisClient = Depends(get_redis),
-) -> StatusService:
-    """获取状态服务"""
-    # 1.初始化postgres和redis健康检查
-    postgres_checker = PostgresHealthChecker(db_session)
-    redis_checker = RedisHealthChecker(redis_client)
+def get_status_service() -> StatusService:
+    """获取状态服务, 检查器每次检查时获取当前的全局Postgres/Redis实例, 不依赖单个请求的数据库会话"""
+    # 1.初始化postgres和redis健康检查, 不持有实例, 避免关闭后重建的实例与缓存的服务不一致
+    postgres_checker = PostgresHealthChecker()
+    redis_checker = RedisHealthChecker()
 
     # 2.创建服务并返回
     logger.info("加载获取StatusService")
-    return StatusService(checkers=[postgres_checker, redis_checker])
+    return StatusService(
+        checkers=[postgres_checker, redis_checker],
+        interval=settings.status_probe_interval_seconds,
+        timeout=settings.status_probe_timeout_seconds,
+        latency_window=settings.status_latency_window,
+        stale_seconds=settings.status_stale_seconds,
+    )
+
+
+@lru_cache()
+def get_task_service() -> TaskService:
+    """获取任务服务"""
+    logger.info("加载获取TaskService")
+    return TaskService(
+        task_cls=RedisStreamTask,
+        batch_size=settings.sse_batch_size,
+        block_ms=settings.sse_heartbeat_seconds * 1000,
+    )
@@ -4,12 +4,25 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.infrastructure.executor import get_cpu_executor
+from app.infrastructure.external.browser.playwright_browser_pool import (
+    get_playwright_browser_pool,
+)
+from app.infrastructure.external.message_queue.redis_stream_multiplexer import (
+    get_redis_stream_multiplexer,
+)
 from app.infrastructure.logging import setup_logging
+from app.infrastructure.repository.event_batch_writer import get_event_batch_writer
 from app.infrastructure.storage.cos import get_cos
 from app.infrastructure.storage.postgres import get_postgres
 from app.infrastructure.storage.redis import get_redis
 from app.interface.endpoint.route import router
 from app.interface.error.exception_handler import register_exception_handler
+from app.interface.service_dependency import (
+    get_app_config_service,
+    get_mcp_client_pool,
+    get_status_service,
+)
 from core.config import get_settings
 
 # 1.加载配置信息
@@ -39,11 +52,34 @@ async def lifespan(app: FastAPI):
     await get_postgres().init()
     await get_cos().init()
 
+    # 3.启动RedisStream多路复用器(所有阻塞读取共享少量XREAD循环)和会话事件批量写入器
+    await get_redis_stream_multiplexer().start()
+    await get_event_batch_writer().start()
+
+    # 4.启动后台健康检查(状态接口直接返回缓存快照)、MCP连接池空闲回收、Playwright浏览器连接池和CPU密集任务执行器
+    await get_status_service().start()
+    await get_mcp_client_pool().start()
+    await get_playwright_browser_pool().start()
+    await get_cpu_executor().start()
+
+    # 5.为已启用的stdio MCP服务在后台启动预热进程, 读取配置失败不影响应用启动
+    try:
+        app_config = await get_app_config_service().get_app_config()
+        get_mcp_client_pool().prewarm(app_config.mcp_config)
+    except Exception as e:
+        logger.warning(f"预热stdio MCP服务失败: {str(e)}")
+
     try:
-        # 3.lifespan分界点
+        # 6.lifespan分界点
         yield
     finally:
-        # 4.应用关闭时执行 关闭 所有数据库连接
+        # 7.应用关闭时执行 停止健康检查、关闭MCP连接、关闭浏览器连接池、关闭CPU任务执行器、关闭多路复用器、写完剩余事件并关闭所有数据库连接
+        await get_status_service().shutdown()
+        await get_mcp_client_pool().shutdown()
+        await get_playwright_browser_pool().shutdown()
+        await get_cpu_executor().shutdown()
+        await get_redis_stream_multiplexer().shutdown()
+        await get_event_batch_writer().shutdown()
         await get_redis().shutdown()
         await get_postgres().shutdown()
         await get_cos().shutdown()
@@ -0,0 +1,94 @@
+"""浏览器页面快照压测: 对比view_page原先的多次evaluate(readyState+可交互元素+可见内容)与一次快照脚本的耗时
+
+前置条件: 已执行 playwright install chromium (或通过--executable-path指定本地Chromium)
+执行命令: uv run -m benchmark.browser_snapshot --rounds 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from playwright.async_api import Page, async_playwright
+
+from app.infrastructure.external.browser.playwright_browser_function import (
+    GET_INTERACTIVE_ELEMENTS_FUNCTION,
+    GET_PAGE_SNAPSHOT_FUNCTION,
+)
+from benchmark.visible_content import LEGACY_VISIBLE_CONTENT_FUNCTION
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+async def legacy_view(page: Page) -> tuple[str, list]:
+    """原先的实现: readyState、可交互元素、可见内容分别执行一次evaluate"""
+    await page.evaluate("""() => document.readyState === 'complete'""")
+    elements = await page.evaluate(GET_INTERACTIVE_ELEMENTS_FUNCTION)
+    content = await page.evaluate(LEGACY_VISIBLE_CONTENT_FUNCTION)
+    return content, elements
+
+
+async def snapshot_view(page: Page) -> tuple[str, list]:
+    """快照实现: 一次evaluate同时返回可见内容与可交互元素"""
+    snapshot = await page.evaluate(GET_PAGE_SNAPSHOT_FUNCTION)
+    return snapshot["content"], snapshot["interactiveElements"]
+
+
+async def measure(page: Page, fn, rounds: int) -> tuple[list[float], tuple[str, list]]:
+    """预热一次后执行rounds次, 返回每次耗时(毫秒)与最后一次的结果"""
+    result = await fn(page)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = await fn(page)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="浏览器页面快照压测")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--executable-path", default=None)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=True, executable_path=args.executable_path
+        )
+        page = await browser.new_page(
+            viewport={"width": args.width, "height": args.height}
+        )
+
+        print(
+            f"{'fixture':<12}{'legacy p50(ms)':>16}{'snapshot p50(ms)':>18}"
+            f"{'speedup':>10}{'elements':>16}{'content(chars)':>16}"
+        )
+        for fixture in sorted(FIXTURES_DIR.glob("*.html")):
+            # 1.加载本地保存的页面, 外部资源加载失败不影响DOM结构
+            await page.goto(fixture.as_uri(), wait_until="load")
+
+            # 2.分别测量两种实现的耗时
+            legacy_timings, (_, legacy_elements) = await measure(
+                page, legacy_view, args.rounds
+            )
+            snapshot_timings, (content, elements) = await measure(
+                page, snapshot_view, args.rounds
+            )
+
+            # 3.输出中位数耗时与加速比
+            legacy_p50 = statistics.median(legacy_timings)
+            snapshot_p50 = statistics.median(snapshot_timings)
+            print(
+                f"{fixture.stem:<12}{legacy_p50:>16.2f}{snapshot_p50:>18.2f}"
+                f"{legacy_p50 / snapshot_p50:>9.2f}x"
+                f"{f'{len(legacy_elements)}/{len(elements)}':>16}{len(content):>16}"
+            )
+
+        await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
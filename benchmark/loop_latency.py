@@ -0,0 +1,97 @@
+"""事件循环延迟压测: 对比HTML转markdown在事件循环中直接执行与放到线程池/进程池执行时的循环延迟
+
+后台计时任务每隔1ms醒来一次, 记录实际醒来时间比预期晚了多少(即事件循环被阻塞的时长),
+同时有多个并发任务对fixtures中的页面执行HTML转markdown, 安装了lxml时额外对比lxml解析器
+
+执行命令: uv run -m benchmark.loop_latency --rounds 3 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import statistics
+import time
+from pathlib import Path
+
+from app.infrastructure.executor import CPUExecutor
+from app.infrastructure.html_parser import html_to_markdown
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+TICK_SECONDS = 0.001
+
+
+async def ticker(stop: asyncio.Event, lags: list[float]) -> None:
+    """每隔1ms醒来一次, 记录醒来时间相对预期的延迟(毫秒)"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((time.perf_counter() - start - TICK_SECONDS) * 1000)
+
+
+async def run_mode(
+    mode: str, parser: str, pages: list[str], rounds: int, concurrency: int
+) -> tuple[float, list[float]]:
+    """按指定模式转换所有页面, 返回总耗时(毫秒)与循环延迟样本"""
+    executor = None if mode == "inline" else CPUExecutor(kind=mode, max_workers=concurrency)
+    if executor is not None:
+        # 预热执行器, 进程池首次提交需要启动子进程并导入模块
+        await executor.start()
+        await asyncio.gather(
+            *(executor.run(html_to_markdown, "<p>warm</p>", parser) for _ in range(concurrency))
+        )
+
+    async def convert(html: str) -> str:
+        if executor is None:
+            return html_to_markdown(html, parser)
+        return await executor.run(html_to_markdown, html, parser)
+
+    async def worker(jobs: list[str]) -> None:
+        for html in jobs:
+            await convert(html)
+
+    # 1.启动计时任务后并发转换
+    jobs = pages * rounds
+    lags: list[float] = []
+    stop = asyncio.Event()
+    tick_task = asyncio.create_task(ticker(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(jobs[i::concurrency]) for i in range(concurrency)))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    # 2.停止计时任务并关闭执行器
+    stop.set()
+    await tick_task
+    if executor is not None:
+        await executor.shutdown()
+    return elapsed, lags
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="事件循环延迟压测")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    pages = [fixture.read_text(encoding="utf-8") for fixture in sorted(FIXTURES_DIR.glob("*.html"))]
+    parsers = ["html.parser"]
+    if importlib.util.find_spec("lxml") is not None:
+        parsers.append("lxml")
+
+    print(
+        f"{'mode':<10}{'parser':<14}{'total(ms)':>12}{'lag p50(ms)':>14}"
+        f"{'lag p99(ms)':>14}{'lag max(ms)':>14}"
+    )
+    for html_parser in parsers:
+        for mode in ("inline", "thread", "process"):
+            elapsed, lags = await run_mode(mode, html_parser, pages, args.rounds, args.concurrency)
+            lags.sort()
+            p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0
+            print(
+                f"{mode:<10}{html_parser:<14}{elapsed:>12.1f}"
+                f"{statistics.median(lags) if lags else 0.0:>14.2f}"
+                f"{p99:>14.2f}{lags[-1] if lags else 0.0:>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+"""浏览器资源拦截压测: 对比不拦截与full/no_media/text_only配置下本地页面的加载耗时与传输字节数
+
+本地HTTP服务提供fixtures中的页面, 并在页面中注入字体、统计脚本(tracker.localhost)等资源,
+图片/字体/统计脚本均返回合成数据并带有固定延迟, 模拟真实站点中静态资源的加载开销
+
+前置条件: 已执行 playwright install chromium (或通过--executable-path指定本地Chromium)
+执行命令: uv run -m benchmark.resource_profile --rounds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from playwright.async_api import Browser, async_playwright
+
+from app.infrastructure.external.browser.playwright_resource_profile import (
+    ResourceProfile,
+    apply_resource_profile,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+TRACKER_HOST = "tracker.localhost"
+
+# 合成资源: 路径前缀 -> (Content-Type, 字节数)
+SYNTHETIC_RESOURCES = {
+    "/img/": ("image/png", 80 * 1024),
+    "/p/": ("image/jpeg", 40 * 1024),
+    "/static/font.woff2": ("font/woff2", 120 * 1024),
+    "/static/font.css": ("text/css", 0),
+    "/t.js": ("application/javascript", 30 * 1024),
+}
+FONT_CSS = (
+    b"@font-face{font-family:Bench;src:url(/static/font.woff2) format('woff2')}"
+    b"body{font-family:Bench,sans-serif}"
+)
+
+
+class _Counter:
+    """线程安全的传输字节计数器"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.requests = 0
+
+    def add(self, size: int) -> None:
+        with self._lock:
+            self.bytes += size
+            self.requests += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.bytes = 0
+            self.requests = 0
+
+
+def make_handler(counter: _Counter, port: int, delay: float):
+    """构建请求处理类: 页面注入额外资源, 合成资源带固定延迟"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args) -> None:
+            pass
+
+        def _send(self, content_type: str, body: bytes) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+            counter.add(len(body))
+
+        def do_GET(self) -> None:
+            path = self.path.split("?", 1)[0]
+
+            # 1.页面: 在head中注入字体样式与统计脚本
+            if path.startswith("/page/"):
+                fixture = FIXTURES_DIR / f"{path.removeprefix('/page/')}.html"
+                if not fixture.is_file():
+                    self.send_error(404)
+                    return
+                html = fixture.read_text(encoding="utf-8")
+                inject = (
+                    '<link rel="stylesheet" href="/static/font.css">'
+                    f'<script async src="http://{TRACKER_HOST}:{port}/t.js"></script>'
+                )
+                html = html.replace("</head>", inject + "</head>", 1)
+                self._send("text/html; charset=utf-8", html.encode("utf-8"))
+                return
+
+            # 2.合成资源
+            for prefix, (content_type, size) in SYNTHETIC_RESOURCES.items():
+                if path.startswith(prefix):
+                    if path == "/static/font.css":
+                        self._send(content_type, FONT_CSS)
+                        return
+                    time.sleep(delay)
+                    self._send(content_type, b"\0" * size)
+                    return
+            self.send_error(404)
+
+    return Handler
+
+
+async def load_once(
+    browser: Browser,
+    url: str,
+    profile: ResourceProfile | None,
+    counter: _Counter,
+) -> tuple[float, int, int]:
+    """在新的上下文中加载一次页面, 返回load耗时(毫秒)、传输字节数与请求数"""
+    context = await browser.new_context()
+    try:
+        if profile is not None:
+            await apply_resource_profile(context, profile, [TRACKER_HOST])
+        page = await context.new_page()
+        counter.reset()
+        start = time.perf_counter()
+        await page.goto(url, wait_until="load")
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, counter.bytes, counter.requests
+    finally:
+        await context.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="浏览器资源拦截压测")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delay-ms", type=int, default=50, help="合成资源的响应延迟")
+    parser.add_argument("--executable-path", default=None)
+    args = parser.parse_args()
+
+    # 1.启动本地HTTP服务
+    counter = _Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    port = server.server_address[1]
+    server.RequestHandlerClass = make_handler(counter, port, args.delay_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # 2.不安装任何路由作为基线, 再依次测量各个配置
+    profiles: list[tuple[str, ResourceProfile | None]] = [("baseline", None)]
+    profiles.extend((profile.value, profile) for profile in ResourceProfile)
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=True, executable_path=args.executable_path
+        )
+        print(
+            f"{'fixture':<12}{'profile':<12}{'load p50(ms)':>14}"
+            f"{'bytes(KB)':>12}{'requests':>10}"
+        )
+        for fixture in sorted(FIXTURES_DIR.glob("*.html")):
+            url = f"http://127.0.0.1:{port}/page/{fixture.stem}"
+            for name, profile in profiles:
+                results = [
+                    await load_once(browser, url, profile, counter)
+                    for _ in range(args.rounds)
+                ]
+                load_p50 = statistics.median(result[0] for result in results)
+                print(
+                    f"{fixture.stem:<12}{name:<12}{load_p50:>14.1f}"
+                    f"{results[-1][1] / 1024:>12.1f}{results[-1][2]:>10}"
+                )
+        await browser.close()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
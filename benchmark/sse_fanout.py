@@ -0,0 +1,97 @@
+"""SSE任务事件流压测: 向任务输出流写入事件, 同时启动多个订阅者, 统计端到端延迟和吞吐
+
+前置条件: 本地已启动Redis与MoocManus后端(默认 http://127.0.0.1:8000)
+执行命令: uv run -m benchmark.sse_fanout --subscribers 500 --events 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+from redis.asyncio import Redis
+
+
+async def produce(redis: Redis, stream_name: str, events: int, interval: float) -> None:
+    """按固定间隔往任务输出流中写入消息事件, 最后写入done事件"""
+    for i in range(events):
+        data = json.dumps(
+            {"id": str(uuid.uuid4()), "type": "message", "message": f"{i}", "ts": time.time()}
+        )
+        await redis.xadd(stream_name, {"data": data})
+        await asyncio.sleep(interval)
+    await redis.xadd(stream_name, {"data": json.dumps({"id": "end", "type": "done"})})
+
+
+async def subscribe(client: httpx.AsyncClient, url: str, latencies: list[float]) -> int:
+    """订阅SSE事件流直到收到done事件, 返回收到的事件条数"""
+    received = 0
+    async with client.stream("GET", url) as response:
+        async for line in response.aiter_lines():
+            # 1.只处理data行, 忽略心跳/id/event等字段
+            if not line.startswith("data: "):
+                continue
+            payload = json.loads(line[6:])
+            if payload.get("type") == "done":
+                break
+
+            # 2.记录从写入Redis到客户端收到的延迟
+            received += 1
+            latencies.append(time.time() - payload["ts"])
+    return received
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="SSE任务事件流压测")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    # 1.构造一个任务id并先写入一条事件, 保证接口可以识别该任务
+    task_id = str(uuid.uuid4())
+    stream_name = f"task:output:{task_id}"
+    redis = Redis.from_url(args.redis_url, decode_responses=True)
+    await redis.xadd(
+        stream_name, {"data": json.dumps({"id": "start", "type": "title", "title": "bench"})}
+    )
+
+    # 2.启动所有订阅者, 等待连接建立后再开始生产事件
+    latencies: list[float] = []
+    url = f"{args.base_url}/api/tasks/{task_id}/events"
+    limits = httpx.Limits(max_connections=args.subscribers + 10)
+    async with httpx.AsyncClient(timeout=None, limits=limits) as client:
+        subscribers = [
+            asyncio.create_task(subscribe(client, url, latencies))
+            for _ in range(args.subscribers)
+        ]
+        await asyncio.sleep(1)
+
+        start = time.perf_counter()
+        await produce(redis, stream_name, args.events, args.interval)
+        counts = await asyncio.gather(*subscribers)
+        elapsed = time.perf_counter() - start
+
+    # 3.输出统计信息并清理测试数据
+    await redis.delete(stream_name)
+    await redis.aclose()
+
+    latencies.sort()
+    total = sum(counts)
+    print(f"订阅者: {args.subscribers} 事件: {args.events} 投递总数: {total}")
+    print(f"总耗时: {elapsed:.2f}s 投递吞吐: {total / elapsed:.0f} events/s")
+    if latencies:
+        print(
+            f"延迟 p50={statistics.median(latencies) * 1000:.1f}ms "
+            f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms "
+            f"max={latencies[-1] * 1000:.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+"""浏览器可见内容提取回归压测: 对比原先基于outerHTML的提取脚本与TreeWalker提取器的输出大小及耗时
+
+原先的脚本对每个可见元素都输出outerHTML, 嵌套的可见元素会被重复输出, 页面越深输出膨胀越严重;
+TreeWalker提取器每个文本节点只输出一次, 该压测用于确认输出大小与提取耗时不会回退
+
+前置条件: 已执行 playwright install chromium (或通过--executable-path指定本地Chromium)
+执行命令: uv run -m benchmark.visible_content --rounds 10 --url https://en.wikipedia.org/wiki/Python_(programming_language)
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from markdownify import markdownify
+from playwright.async_api import Page, async_playwright
+
+from app.infrastructure.external.browser.playwright_browser_function import (
+    GET_VISIBLE_CONTENT_FUNCTION,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# 原先基于outerHTML的可见内容提取脚本, 仅用于对比
+LEGACY_VISIBLE_CONTENT_FUNCTION = """() => {
+    // 1.定义变量存储所有可视元素+视口宽高
+    const visibleElements = [];
+    const viewportHeight = window.innerHeight;
+    const viewportWeight = window.innerWidth;
+
+    // 2.获取页面上所有元素
+    const elements = document.querySelectorAll("body *");
+
+    // 3.循环遍历所有元素逐个处理
+    for (let i = 0; i < elements.length; i++) {
+        // 4.获取元素的尺寸与位置
+        const element = elements[i];
+        const rect = element.getBoundingClientRect();
+
+        // 5.判断元素的宽高，如果没有大小则跳过
+        if (rect.height === 0 || rect.width === 0) continue;
+
+        // 6.排除完全在当前屏幕可视区域之外的元素(上方、下方、左侧、右侧)的元素
+        if (
+            rect.bottom < 0 ||
+            rect.top > viewportHeight ||
+            rect.right < 0 ||
+            rect.left > viewportWeight
+        ) continue;
+
+        // 7.通用样式判断当前元素是否隐藏
+        const style = window.getComputedStyle(element);
+        if (
+            style.display === 'none' || // 块隐藏
+            style.visibility === 'hidden' || // 隐藏不可见
+            style.opacity === '0' // 透明度为0
+        ) continue;
+
+        // 8.如果element是文本节点或有意义的元素, 请将其添加到结果中
+        if (
+            element.innerText ||
+            element.tagName === "IMG" ||
+            element.tagName === "INPUT" ||
+            element.tagName === "BUTTON"
+        ) visibleElements.push(element.outerHTML)
+    }
+
+    // 9.将所有内容使用空格拼接后包裹在div内返回
+    return '<div>' + visibleElements.join(' ') + '</div>'
+}"""
+
+
+async def measure(page: Page, script: str, rounds: int) -> tuple[float, str]:
+    """预热一次后执行rounds次, 返回耗时中位数(毫秒)与提取结果"""
+    content = await page.evaluate(script)
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        content = await page.evaluate(script)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), content
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="浏览器可见内容提取回归压测")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--url", action="append", default=[], help="额外测试的真实页面, 可传递多次")
+    parser.add_argument("--executable-path", default=None)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=1080)
+    args = parser.parse_args()
+
+    # 1.本地保存的页面+命令行传递的真实页面
+    targets = [(path.stem, path.as_uri()) for path in sorted(FIXTURES_DIR.glob("*.html"))]
+    targets.extend((url, url) for url in args.url)
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=True, executable_path=args.executable_path
+        )
+        page = await browser.new_page(
+            viewport={"width": args.width, "height": args.height}
+        )
+
+        print(
+            f"{'page':<40}{'legacy html':>13}{'walker html':>13}{'legacy md':>11}"
+            f"{'walker md':>11}{'legacy ms':>11}{'walker ms':>11}"
+        )
+        for name, url in targets:
+            # 2.加载页面并分别测量两种脚本的输出大小与耗时
+            await page.goto(url, wait_until="load")
+            legacy_ms, legacy_html = await measure(
+                page, LEGACY_VISIBLE_CONTENT_FUNCTION, args.rounds
+            )
+            walker_ms, walker_html = await measure(
+                page, GET_VISIBLE_CONTENT_FUNCTION, args.rounds
+            )
+
+            # 3.输出html大小、markdown大小(实际交给LLM的内容)及耗时
+            print(
+                f"{name[:39]:<40}{len(legacy_html):>13}{len(walker_html):>13}"
+                f"{len(markdownify(legacy_html)):>11}{len(markdownify(walker_html)):>11}"
+                f"{legacy_ms:>11.2f}{walker_ms:>11.2f}"
+            )
+
+        await browser.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
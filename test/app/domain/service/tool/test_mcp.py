@@ -0,0 +1,70 @@
+import asyncio
+
+from mcp import Tool
+
+from app.domain.model.app_config import MCPConfig, MCPServerConfig
+from app.domain.service.tool.mcp import MCPTool
+
+
+class FakeConnection:
+    """模拟的MCP连接: 建立后携带固定的工具列表"""
+
+    def __init__(self, server_name: str, server_config: MCPServerConfig) -> None:
+        self.server_name = server_name
+        self.server_config = server_config
+        self.tools = [Tool(name="echo", description="回显", inputSchema={"type": "object"})]
+        self.tools_version = 1
+        self.connect_latency_ms = 1.0
+        self.alive = True
+
+
+class FakePool:
+    """模拟的MCP连接池: 工具缓存未命中(或命中), 建立连接需要一段时间"""
+
+    def __init__(self, cached_tools: list[Tool] | None, connect_delay: float) -> None:
+        self.cached_tools = cached_tools
+        self.connect_delay = connect_delay
+
+    async def get_cached_tools(self, server_config: MCPServerConfig) -> list[Tool] | None:
+        return self.cached_tools
+
+    async def acquire(self, server_name: str, server_config: MCPServerConfig) -> FakeConnection:
+        await asyncio.sleep(self.connect_delay)
+        return FakeConnection(server_name, server_config)
+
+    def release(self, conn: FakeConnection) -> None:
+        pass
+
+
+def _mcp_config() -> MCPConfig:
+    return MCPConfig(mcpServers={"demo": MCPServerConfig(url="http://localhost:9/mcp")})
+
+
+def test_mcp_tool_cold_cache_waits_for_connection() -> None:
+    """测试: 工具缓存未命中时, 初始化后立即获取工具列表仍然包含该服务的工具声明"""
+
+    async def run() -> list[str]:
+        mcp_tool = MCPTool(pool=FakePool(cached_tools=None, connect_delay=0.05))
+        await mcp_tool.initialize(_mcp_config())
+        try:
+            return [tool["function"]["name"] for tool in mcp_tool.get_tools()]
+        finally:
+            await mcp_tool.cleanup()
+
+    assert asyncio.run(run()) == ["mcp_demo_echo"]
+
+
+def test_mcp_tool_warm_cache_does_not_wait_for_connection() -> None:
+    """测试: 工具缓存命中时, 初始化不等待连接完成, 直接使用缓存的工具声明"""
+
+    async def run() -> tuple[list[str], bool]:
+        cached_tools = [Tool(name="echo", description="回显", inputSchema={"type": "object"})]
+        mcp_tool = MCPTool(pool=FakePool(cached_tools=cached_tools, connect_delay=10))
+        await mcp_tool.initialize(_mcp_config())
+        try:
+            names = [tool["function"]["name"] for tool in mcp_tool.get_tools()]
+            return names, mcp_tool.has_tool("mcp_demo_echo")
+        finally:
+            await mcp_tool.cleanup()
+
+    assert asyncio.run(run()) == (["mcp_demo_echo"], True)
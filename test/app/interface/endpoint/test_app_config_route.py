@@ -0,0 +1,67 @@
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from pytest import fixture
+
+from app.application.service.app_config_service import AppConfigService
+from app.infrastructure.repository.file_app_config_repository import (
+    FileAppConfigRepository,
+)
+from app.interface.service_dependency import get_app_config_service, get_mcp_client_pool
+from app.main import app
+
+
+@fixture()
+def temp_app_config(tmp_path: Path) -> Path:
+    """将应用配置服务指向临时配置文件, 避免测试改写工作目录中的app_config.yaml"""
+    config_path = tmp_path / "app_config.yaml"
+    app_config_service = AppConfigService(
+        app_config_repository=FileAppConfigRepository(str(config_path)),
+        mcp_client_pool=get_mcp_client_pool(),
+    )
+    app.dependency_overrides[get_app_config_service] = lambda: app_config_service
+    yield config_path
+    app.dependency_overrides.pop(get_app_config_service, None)
+
+
+def test_get_agent_config_etag(client: TestClient, temp_app_config: Path) -> None:
+    """测试: 获取Agent配置携带ETag, 携带相同的If-None-Match时返回304"""
+
+    # 1.首次请求获取ETag
+    response = client.get("/api/app-config/agent")
+    etag = response.headers.get("ETag")
+
+    # 2.断言状态码与ETag
+    assert response.status_code == 200
+    assert etag is not None
+
+    # 3.携带If-None-Match再次请求, 断言配置未变化时返回304
+    response = client.get("/api/app-config/agent", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_update_agent_config_version_conflict(
+    client: TestClient, temp_app_config: Path
+) -> None:
+    """测试: 携带过期的If-Match更新Agent配置返回412, 且配置文件未被改写"""
+
+    # 1.获取当前Agent配置及版本号
+    response = client.get("/api/app-config/agent")
+    agent_config = response.json().get("data")
+    version = int(response.headers["ETag"].strip('"').lstrip("v"))
+
+    # 2.使用格式错误的版本号更新配置, 断言返回400
+    response = client.post(
+        "/api/app-config/agent", json=agent_config, headers={"If-Match": '"v-1"'}
+    )
+    assert response.status_code == 400
+
+    # 3.使用与当前版本不一致的版本号更新配置, 断言返回412且配置文件未变化
+    content = temp_app_config.read_text(encoding="utf-8")
+    response = client.post(
+        "/api/app-config/agent",
+        json=agent_config,
+        headers={"If-Match": f'"v{version + 1}"'},
+    )
+    assert response.status_code == 412
+    assert temp_app_config.read_text(encoding="utf-8") == content
@@ -11,3 +11,15 @@ def test_get_status(client: TestClient) -> None:
     # 2.断言状态码和业务状态码
     assert response.status_code == 200
     assert data.get("code") == 200
+
+
+def test_get_liveness(client: TestClient) -> None:
+    """测试: 存活探针不依赖外部服务, 始终返回200"""
+
+    # 1.使用客户端请求存活探针
+    response = client.get("/api/status/live")
+    data = response.json()
+
+    # 2.断言状态码和业务状态码
+    assert response.status_code == 200
+    assert data.get("code") == 200
@@ -0,0 +1,52 @@
+from fastapi.testclient import TestClient
+
+from app.interface.service_dependency import get_task_service
+from app.main import app
+
+
+def test_stream_task_events_not_found(client: TestClient) -> None:
+    """测试: 订阅不存在任务的事件流返回404"""
+
+    # 1.使用客户端请求一个不存在的任务事件流
+    response = client.get("/api/tasks/not-exists-task/events")
+    data = response.json()
+
+    # 2.断言状态码和业务状态码
+    assert response.status_code == 404
+    assert data.get("code") == 404
+
+
+def test_stream_task_events_invalid_last_event_id(client: TestClient) -> None:
+    """测试: Last-Event-ID格式错误时返回400"""
+
+    # 1.携带非法的Last-Event-ID请求事件流
+    response = client.get(
+        "/api/tasks/not-exists-task/events", headers={"Last-Event-ID": "invalid"}
+    )
+
+    # 2.断言状态码
+    assert response.status_code == 400
+
+
+def test_stream_task_events_read_error(client: TestClient) -> None:
+    """测试: 读取输出流失败时发送error事件后关闭事件流, 而不是中断响应"""
+
+    class BrokenTaskService:
+        async def stream_events(self, task_id: str, last_event_id: str | None):
+            async def events():
+                yield [("1-0", "message", '{"type": "message"}')]
+                raise ConnectionError("XREAD失败")
+
+            return events()
+
+    # 1.替换任务服务, 推送一批事件后读取失败
+    app.dependency_overrides[get_task_service] = lambda: BrokenTaskService()
+    try:
+        response = client.get("/api/tasks/broken-task/events")
+    finally:
+        app.dependency_overrides.pop(get_task_service, None)
+
+    # 2.断言已推送的事件正常返回, 最后一帧为不携带id的error事件
+    assert response.status_code == 200
+    assert "id: 1-0\nevent: message" in response.text
+    assert response.text.rstrip().split("\n\n")[-1].startswith("event: error\n")